@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        from .signals import connect_signals
+
+        # Сброс кэша главной страницы при правке проектов и отчетов
+        connect_signals()
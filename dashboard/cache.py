@@ -0,0 +1,119 @@
+"""
+Кэш главной страницы.
+
+Контекст главной собирается из двух фрагментов: проекты (счетчики по
+статусам и последние проекты) и отчеты (время за день/неделю/месяц, последние
+и сегодняшние отчеты). Ключ фрагмента содержит номера поколений моделей, от
+которых он зависит, а фрагмент отчетов - еще и дату. Сохранение или удаление
+Project и WorkReport, а также пакетные изменения сводок времени увеличивают
+номер поколения: следующий запрос строит фрагмент заново, а старые записи
+истекают сами по TTL кэша 'dashboard'.
+"""
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q
+
+from projects.models import Project
+from reports.models import WorkReport
+from reports.stats import time_stats
+
+
+PROJECTS, REPORTS = 'projects', 'reports'
+RECENT_PROJECTS_LIMIT = 5
+RECENT_REPORTS_LIMIT = 10
+
+
+def _cache():
+    return caches['dashboard']
+
+
+def _generation_key(name):
+    return f'dashboard:generation:{name}'
+
+
+def _new_generation():
+    # Не с нуля: если счетчик вытеснен из кэша, старые фрагменты не должны совпасть по ключу
+    return int(time.time() * 1000)
+
+
+def get_generations():
+    cache = _cache()
+    keys = {name: _generation_key(name) for name in (PROJECTS, REPORTS)}
+    found = cache.get_many(keys.values())
+    generations = {}
+    for name, key in keys.items():
+        if key not in found:
+            cache.add(key, _new_generation(), timeout=None)
+            found[key] = cache.get(key)
+        generations[name] = found[key]
+    return generations
+
+
+def bump_generation(name):
+    """Новое поколение фрагментов name - после фиксации транзакции, чтобы не закэшировать старые данные"""
+    def bump():
+        cache = _cache()
+        try:
+            cache.incr(_generation_key(name))
+        except ValueError:
+            cache.set(_generation_key(name), _new_generation(), timeout=None)
+    transaction.on_commit(bump)
+
+
+def _projects_fragment():
+    # Все счетчики - одним запросом с условной агрегацией
+    stats = Project.objects.aggregate(
+        total=Count('id'),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        ready=Count('id', filter=Q(status='ready')),
+        archive=Count('id', filter=Q(status='archive')),
+    )
+    return {
+        'projects_stats': stats,
+        'recent_projects': list(
+            Project.objects.filter(status__in=['in_progress', 'ready']).order_by('-created_at')[:RECENT_PROJECTS_LIMIT]
+        ),
+    }
+
+
+def _reports_fragment(today):
+    reports = WorkReport.objects.select_related('project')
+    return {
+        'reports_stats': time_stats(today),
+        'recent_reports': list(reports.order_by('-date', '-created_at')[:RECENT_REPORTS_LIMIT]),
+        'today_reports': list(reports.filter(date=today).order_by('-created_at')),
+    }
+
+
+def get_dashboard_context(today):
+    """Контекст главной: из кэша или заново (по одному запросу на счетчики и списки)"""
+    cache = _cache()
+    generations = get_generations()
+    # Названия проектов в отчетах берутся из проектов - фрагмент отчетов зависит от обоих поколений
+    keys = {
+        PROJECTS: f'dashboard:projects:{generations[PROJECTS]}',
+        REPORTS: f'dashboard:reports:{today.isoformat()}:{generations[REPORTS]}:{generations[PROJECTS]}',
+    }
+    found = cache.get_many(keys.values())
+
+    builders = {PROJECTS: _projects_fragment, REPORTS: lambda: _reports_fragment(today)}
+    context = {}
+    missing = {}
+    for name, key in keys.items():
+        fragment = found.get(key)
+        if fragment is None:
+            fragment = missing[key] = builders[name]()
+        context.update(fragment)
+    if missing:
+        cache.set_many(missing)
+    return context
+
+
+def invalidate_projects(*args, **kwargs):
+    bump_generation(PROJECTS)
+
+
+def invalidate_reports(*args, **kwargs):
+    bump_generation(REPORTS)
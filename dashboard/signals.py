@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+
+from projects.models import Project
+from reports.models import WorkReport
+from reports.rollups import rollups_changed
+
+from .cache import invalidate_projects, invalidate_reports
+
+
+def connect_signals():
+    # Фрагменты главной устаревают при любой правке проектов и отчетов
+    for model, handler in ((Project, invalidate_projects), (WorkReport, invalidate_reports)):
+        post_save.connect(handler, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+        post_delete.connect(handler, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
+    # Импорт и пересчет сводок сигналов моделей не посылают
+    rollups_changed.connect(invalidate_reports, dispatch_uid='dashboard_cache_rollups')
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import MonitoredSite, UptimeRollup
+
+
+@admin.register(MonitoredSite)
+class MonitoredSiteAdmin(admin.ModelAdmin):
+    list_display = ['name', 'url', 'website', 'project', 'is_active', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = ['name', 'url']
+    list_editable = ['is_active']
+    ordering = ['name']
+
+
+@admin.register(UptimeRollup)
+class UptimeRollupAdmin(admin.ModelAdmin):
+    list_display = ['site', 'resolution', 'bucket', 'checks', 'failures', 'uptime_percent', 'latency_avg']
+    list_filter = ['resolution', 'site']
+    ordering = ['-bucket']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('site')
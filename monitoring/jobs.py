@@ -0,0 +1,13 @@
+from scheduler.registry import register
+
+from .monitor import UptimeMonitor
+
+
+@register('monitoring.check_sites', every=60, jitter=5, lock_timeout=10 * 60)
+def check_sites():
+    """Проверка доступности сайтов и обновление агрегатов"""
+    result = UptimeMonitor().run_cycle()
+    return (
+        f'Проверено: {result["checked"]}, агрегатов обновлено: {result["rolled"]}, '
+        f'удалено старых записей: {result["deleted"]}'
+    )
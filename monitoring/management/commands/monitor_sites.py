@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from monitoring.monitor import UptimeMonitor
+
+
+class Command(BaseCommand):
+    help = 'Проверяет доступность сайтов и обновляет агрегаты мониторинга'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Повторять проверку каждые N секунд (0 - выполнить один раз)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=20,
+            help='Количество параллельных проверок',
+        )
+
+    def handle(self, *args, **options):
+        monitor = UptimeMonitor(max_workers=options['workers'])
+        interval = options['interval']
+        
+        while True:
+            started = time.monotonic()
+            result = monitor.run_cycle()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Проверено сайтов: {result["checked"]}, новых: {result["added"]}, '
+                    f'агрегатов обновлено: {result["rolled"]}, удалено старых записей: {result["deleted"]}'
+                )
+            )
+            
+            if not interval:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
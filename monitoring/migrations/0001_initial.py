@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0004_projectcontent_file_and_more'),
+        ('tools', '0008_translitresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonitoredSite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True, verbose_name='URL')),
+                ('name', models.CharField(max_length=200, verbose_name='Название')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monitors', to='projects.project', verbose_name='Проект')),
+                ('website', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monitors', to='tools.website', verbose_name='Сайт')),
+            ],
+            options={
+                'verbose_name': 'Сайт под мониторингом',
+                'verbose_name_plural': 'Сайты под мониторингом',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UptimeSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ts', models.PositiveIntegerField(verbose_name='Время (unix)')),
+                ('status_code', models.PositiveSmallIntegerField(default=0, verbose_name='HTTP статус')),
+                ('latency_ms', models.PositiveIntegerField(default=0, verbose_name='Задержка (мс)')),
+                ('is_up', models.BooleanField(default=False, verbose_name='Доступен')),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='monitoring.monitoredsite', verbose_name='Сайт')),
+            ],
+            options={
+                'verbose_name': 'Проверка доступности',
+                'verbose_name_plural': 'Проверки доступности',
+                'indexes': [models.Index(fields=['ts', 'site'], name='monitoring__ts_c43bbc_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UptimeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.PositiveIntegerField(choices=[(60, '1 минута'), (3600, '1 час'), (86400, '1 день')], verbose_name='Шаг')),
+                ('bucket', models.PositiveIntegerField(verbose_name='Начало интервала (unix)')),
+                ('checks', models.PositiveIntegerField(default=0, verbose_name='Проверок')),
+                ('failures', models.PositiveIntegerField(default=0, verbose_name='Сбоев')),
+                ('latency_sum', models.PositiveBigIntegerField(default=0, verbose_name='Сумма задержек (мс)')),
+                ('latency_min', models.PositiveIntegerField(blank=True, null=True, verbose_name='Мин. задержка (мс)')),
+                ('latency_max', models.PositiveIntegerField(blank=True, null=True, verbose_name='Макс. задержка (мс)')),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='monitoring.monitoredsite', verbose_name='Сайт')),
+            ],
+            options={
+                'verbose_name': 'Агрегат доступности',
+                'verbose_name_plural': 'Агрегаты доступности',
+                'ordering': ['resolution', 'bucket'],
+                'indexes': [models.Index(fields=['resolution', 'bucket'], name='monitoring__resolut_11be42_idx')],
+                'unique_together': {('site', 'resolution', 'bucket')},
+            },
+        ),
+    ]
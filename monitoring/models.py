@@ -0,0 +1,95 @@
+from django.db import models
+from django.urls import reverse
+
+
+RESOLUTION_MINUTE = 60
+RESOLUTION_HOUR = 3600
+RESOLUTION_DAY = 86400
+
+
+class MonitoredSite(models.Model):
+    """Сайт под мониторингом доступности"""
+    url = models.URLField(unique=True, verbose_name="URL")
+    name = models.CharField(max_length=200, verbose_name="Название")
+    website = models.ForeignKey('tools.Website', on_delete=models.SET_NULL, null=True, blank=True, related_name='monitors', verbose_name="Сайт")
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='monitors', verbose_name="Проект")
+    is_active = models.BooleanField(default=True, verbose_name="Активен")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    
+    class Meta:
+        verbose_name = "Сайт под мониторингом"
+        verbose_name_plural = "Сайты под мониторингом"
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name or self.url
+    
+    def get_absolute_url(self):
+        return reverse('monitoring:site_detail', kwargs={'pk': self.pk})
+
+
+class UptimeSample(models.Model):
+    """Сырая проверка доступности (хранится недолго, далее только агрегаты)"""
+    site = models.ForeignKey(MonitoredSite, on_delete=models.CASCADE, related_name='samples', verbose_name="Сайт")
+    ts = models.PositiveIntegerField(verbose_name="Время (unix)")
+    status_code = models.PositiveSmallIntegerField(default=0, verbose_name="HTTP статус")
+    latency_ms = models.PositiveIntegerField(default=0, verbose_name="Задержка (мс)")
+    is_up = models.BooleanField(default=False, verbose_name="Доступен")
+    
+    class Meta:
+        verbose_name = "Проверка доступности"
+        verbose_name_plural = "Проверки доступности"
+        indexes = [
+            models.Index(fields=['ts', 'site']),
+        ]
+    
+    def __str__(self):
+        return f"{self.site} @ {self.ts}: {self.status_code}"
+
+
+class UptimeRollup(models.Model):
+    """Агрегат проверок за минуту, час или сутки"""
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_MINUTE, '1 минута'),
+        (RESOLUTION_HOUR, '1 час'),
+        (RESOLUTION_DAY, '1 день'),
+    ]
+    
+    site = models.ForeignKey(MonitoredSite, on_delete=models.CASCADE, related_name='rollups', verbose_name="Сайт")
+    resolution = models.PositiveIntegerField(choices=RESOLUTION_CHOICES, verbose_name="Шаг")
+    bucket = models.PositiveIntegerField(verbose_name="Начало интервала (unix)")
+    checks = models.PositiveIntegerField(default=0, verbose_name="Проверок")
+    failures = models.PositiveIntegerField(default=0, verbose_name="Сбоев")
+    latency_sum = models.PositiveBigIntegerField(default=0, verbose_name="Сумма задержек (мс)")
+    latency_min = models.PositiveIntegerField(null=True, blank=True, verbose_name="Мин. задержка (мс)")
+    latency_max = models.PositiveIntegerField(null=True, blank=True, verbose_name="Макс. задержка (мс)")
+    
+    class Meta:
+        verbose_name = "Агрегат доступности"
+        verbose_name_plural = "Агрегаты доступности"
+        ordering = ['resolution', 'bucket']
+        unique_together = ['site', 'resolution', 'bucket']
+        indexes = [
+            models.Index(fields=['resolution', 'bucket']),
+        ]
+    
+    def __str__(self):
+        return f"{self.site} [{self.get_resolution_display()}] @ {self.bucket}"
+    
+    @property
+    def successes(self):
+        return self.checks - self.failures
+    
+    @property
+    def uptime_percent(self):
+        """Доля успешных проверок в процентах"""
+        if not self.checks:
+            return None
+        return round(100 * self.successes / self.checks, 2)
+    
+    @property
+    def latency_avg(self):
+        """Средняя задержка успешных проверок"""
+        if not self.successes:
+            return None
+        return round(self.latency_sum / self.successes)
@@ -0,0 +1,168 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Mod
+
+from projects.models import Project
+from tools.models import Website
+from .models import (
+    MonitoredSite, UptimeSample, UptimeRollup,
+    RESOLUTION_MINUTE, RESOLUTION_HOUR, RESOLUTION_DAY,
+)
+
+
+# Сколько хранить каждый уровень (в секундах); None - хранить всегда
+RETENTION = {
+    'samples': 2 * RESOLUTION_DAY,
+    RESOLUTION_MINUTE: 7 * RESOLUTION_DAY,
+    RESOLUTION_HOUR: 180 * RESOLUTION_DAY,
+    RESOLUTION_DAY: None,
+}
+
+# Из какого уровня собирается каждый агрегат
+ROLLUP_SOURCES = [
+    (RESOLUTION_MINUTE, None),
+    (RESOLUTION_HOUR, RESOLUTION_MINUTE),
+    (RESOLUTION_DAY, RESOLUTION_HOUR),
+]
+
+
+class UptimeMonitor:
+    """Проверка доступности сайтов и свертка результатов в агрегаты"""
+
+    def __init__(self, timeout=10, max_workers=20):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def sync_targets(self):
+        """Добавляет в мониторинг URL из Website и Project"""
+        targets = {}
+        for website in Website.objects.only('id', 'url', 'name'):
+            targets.setdefault(website.url, MonitoredSite(url=website.url, name=website.name or website.url, website=website))
+        for project in Project.objects.exclude(project_url='').exclude(status='archive').only('id', 'name', 'project_url'):
+            targets.setdefault(project.project_url, MonitoredSite(url=project.project_url, name=project.name, project=project))
+
+        existing = set(MonitoredSite.objects.filter(url__in=targets).values_list('url', flat=True))
+        new_sites = [site for url, site in targets.items() if url not in existing]
+        MonitoredSite.objects.bulk_create(new_sites, ignore_conflicts=True)
+        return len(new_sites)
+
+    def probe(self, url):
+        """Одна проверка: (HTTP статус, задержка в мс, доступен ли сайт)"""
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=True, allow_redirects=True)
+            response.close()
+            latency_ms = int(response.elapsed.total_seconds() * 1000)
+            return response.status_code, latency_ms, response.status_code < 400
+        except requests.exceptions.RequestException:
+            return 0, 0, False
+
+    def probe_all(self):
+        """Проверяет все активные сайты параллельно и сохраняет сырые проверки"""
+        sites = list(MonitoredSite.objects.filter(is_active=True).only('id', 'url'))
+        if not sites:
+            return 0
+
+        ts = int(time.time())
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sites))) as executor:
+            results = executor.map(lambda site: self.probe(site.url), sites)
+            samples = [
+                UptimeSample(site_id=site.id, ts=ts, status_code=status_code, latency_ms=latency_ms, is_up=is_up)
+                for site, (status_code, latency_ms, is_up) in zip(sites, results)
+            ]
+
+        UptimeSample.objects.bulk_create(samples, batch_size=500)
+        return len(samples)
+
+    def rollup(self, now=None):
+        """Пересчитывает агрегаты начиная с последнего (возможно, неполного) интервала"""
+        now = int(now or time.time())
+        updated = 0
+
+        for resolution, source_resolution in ROLLUP_SOURCES:
+            start = UptimeRollup.objects.filter(resolution=resolution).aggregate(last=Max('bucket'))['last'] or 0
+
+            if source_resolution is None:
+                source = UptimeSample.objects.filter(ts__gte=start, ts__lte=now)
+                time_field = 'ts'
+                aggregates = {
+                    'checks': Count('id'),
+                    'failures': Count('id', filter=Q(is_up=False)),
+                    'latency_sum': Sum('latency_ms', filter=Q(is_up=True)),
+                    'latency_min': Min('latency_ms', filter=Q(is_up=True)),
+                    'latency_max': Max('latency_ms', filter=Q(is_up=True)),
+                }
+            else:
+                source = UptimeRollup.objects.filter(resolution=source_resolution, bucket__gte=start, bucket__lte=now)
+                time_field = 'bucket'
+                aggregates = {
+                    'checks': Sum('checks'),
+                    'failures': Sum('failures'),
+                    'latency_sum': Sum('latency_sum'),
+                    'latency_min': Min('latency_min'),
+                    'latency_max': Max('latency_max'),
+                }
+
+            rows = (
+                source.order_by()
+                .annotate(target_bucket=F(time_field) - Mod(time_field, resolution))
+                .values('site_id', 'target_bucket')
+                .annotate(**aggregates)
+            )
+            rollups = [
+                UptimeRollup(
+                    site_id=row['site_id'],
+                    resolution=resolution,
+                    bucket=row['target_bucket'],
+                    checks=row['checks'] or 0,
+                    failures=row['failures'] or 0,
+                    latency_sum=row['latency_sum'] or 0,
+                    latency_min=row['latency_min'],
+                    latency_max=row['latency_max'],
+                )
+                for row in rows
+            ]
+            UptimeRollup.objects.bulk_create(
+                rollups,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['site', 'resolution', 'bucket'],
+                update_fields=['checks', 'failures', 'latency_sum', 'latency_min', 'latency_max'],
+            )
+            updated += len(rollups)
+
+        return updated
+
+    def apply_retention(self, now=None):
+        """Удаляет сырые проверки и агрегаты старше срока хранения"""
+        now = int(now or time.time())
+        deleted, _ = UptimeSample.objects.filter(ts__lt=now - RETENTION['samples']).delete()
+        for resolution, _source in ROLLUP_SOURCES:
+            keep = RETENTION[resolution]
+            if keep is None:
+                continue
+            count, _ = UptimeRollup.objects.filter(resolution=resolution, bucket__lt=now - keep).delete()
+            deleted += count
+        return deleted
+
+    def run_cycle(self):
+        """Полный цикл: синхронизация, проверка, свертка, очистка"""
+        added = self.sync_targets()
+        checked = self.probe_all()
+        rolled = self.rollup()
+        deleted = self.apply_retention()
+        return {
+            'added': added,
+            'checked': checked,
+            'rolled': rolled,
+            'deleted': deleted,
+        }
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('', views.SiteStatusListView.as_view(), name='site_list'),
+    path('<int:pk>/', views.SiteStatusDetailView.as_view(), name='site_detail'),
+]
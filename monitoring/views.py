@@ -0,0 +1,88 @@
+import time
+from datetime import datetime
+
+from django.db.models import Sum
+from django.utils import timezone
+from django.views.generic import ListView, DetailView
+from .models import MonitoredSite, UptimeRollup, RESOLUTION_MINUTE, RESOLUTION_HOUR, RESOLUTION_DAY
+
+
+def summarize_rollups(resolution, since):
+    """Суммарные проверки/сбои/задержки по сайтам из агрегатов одного уровня"""
+    rows = (
+        UptimeRollup.objects
+        .filter(resolution=resolution, bucket__gte=since)
+        .order_by()
+        .values('site_id')
+        .annotate(checks=Sum('checks'), failures=Sum('failures'), latency_sum=Sum('latency_sum'))
+    )
+    summary = {}
+    for row in rows:
+        successes = row['checks'] - row['failures']
+        summary[row['site_id']] = {
+            'checks': row['checks'],
+            'failures': row['failures'],
+            'uptime': round(100 * successes / row['checks'], 2) if row['checks'] else None,
+            'latency_avg': round(row['latency_sum'] / successes) if successes else None,
+        }
+    return summary
+
+
+class SiteStatusListView(ListView):
+    """Сводка доступности всех сайтов (читает только агрегаты)"""
+    model = MonitoredSite
+    template_name = 'monitoring/site_list.html'
+    context_object_name = 'sites'
+
+    def get_queryset(self):
+        return MonitoredSite.objects.filter(is_active=True).order_by('name')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        now = int(time.time())
+
+        current = summarize_rollups(RESOLUTION_MINUTE, now - 5 * 60)
+        day = summarize_rollups(RESOLUTION_HOUR, now - RESOLUTION_DAY)
+        month = summarize_rollups(RESOLUTION_DAY, now - 30 * RESOLUTION_DAY)
+
+        rows = []
+        for site in context['sites']:
+            last = current.get(site.id)
+            rows.append({
+                'site': site,
+                'is_down': bool(last and last['failures']),
+                'has_data': last is not None,
+                'day': day.get(site.id),
+                'month': month.get(site.id),
+            })
+        context['rows'] = rows
+        context['stats'] = {
+            'total_sites': len(rows),
+            'down_sites': sum(1 for row in rows if row['is_down']),
+        }
+        return context
+
+
+class SiteStatusDetailView(DetailView):
+    """История доступности сайта по часам и по дням"""
+    model = MonitoredSite
+    template_name = 'monitoring/site_detail.html'
+    context_object_name = 'site'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        now = int(time.time())
+
+        hourly = list(self.object.rollups.filter(
+            resolution=RESOLUTION_HOUR, bucket__gte=now - 2 * RESOLUTION_DAY
+        ).order_by('-bucket'))
+        daily = list(self.object.rollups.filter(
+            resolution=RESOLUTION_DAY, bucket__gte=now - 90 * RESOLUTION_DAY
+        ).order_by('-bucket'))
+
+        for rollup in hourly + daily:
+            rollup.started_at = datetime.fromtimestamp(rollup.bucket, tz=timezone.get_current_timezone())
+
+        context['hourly'] = hourly
+        context['daily'] = daily
+        return context
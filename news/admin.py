@@ -1,18 +1,32 @@
 from django.contrib import admin
-from .models import NewsSource, News
+from .models import NewsSource, News, NewsCluster, ArchivedNews
 
 
 @admin.register(NewsSource)
 class NewsSourceAdmin(admin.ModelAdmin):
-    list_display = ['name', 'url', 'is_active', 'created_at']
-    list_filter = ['is_active', 'created_at']
-    search_fields = ['name', 'url']
+    list_display = ['name', 'url', 'adapter', 'is_active', 'last_fetched_at', 'last_status']
+    list_filter = ['is_active', 'adapter', 'created_at']
+    search_fields = ['name', 'url', 'feed_url']
     ordering = ['name']
+    readonly_fields = ['etag', 'last_modified', 'last_fetched_at', 'last_status']
+    
+    fieldsets = (
+        ('Основная информация', {
+            'fields': ('name', 'url', 'is_active')
+        }),
+        ('Сбор новостей', {
+            'fields': ('adapter', 'feed_url', 'html_selector', 'timeout')
+        }),
+        ('Состояние', {
+            'fields': ('etag', 'last_modified', 'last_fetched_at', 'last_status'),
+            'classes': ('collapse',)
+        }),
+    )
 
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
-    list_display = ['title', 'source', 'published_date', 'is_featured', 'is_archived', 'created_at']
+    list_display = ['title', 'source', 'published_date', 'is_featured', 'is_archived', 'is_primary', 'created_at']
     list_filter = ['source', 'is_featured', 'is_archived', 'published_date', 'created_at']
     search_fields = ['title', 'description']
     list_editable = ['is_featured', 'is_archived']
@@ -27,10 +41,43 @@ class NewsAdmin(admin.ModelAdmin):
             'fields': ('published_date',)
         }),
         ('Настройки', {
-            'fields': ('is_featured', 'is_archived'),
+            'fields': ('is_featured', 'is_archived', 'cluster', 'is_primary'),
             'classes': ('collapse',)
         }),
     )
     
+    raw_id_fields = ['cluster']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('source')
+
+
+class ClusterNewsInline(admin.TabularInline):
+    model = News
+    fields = ['title', 'source', 'published_date', 'is_primary']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(NewsCluster)
+class NewsClusterAdmin(admin.ModelAdmin):
+    list_display = ['title', 'created_at']
+    search_fields = ['title']
+    inlines = [ClusterNewsInline]
+
+
+@admin.register(ArchivedNews)
+class ArchivedNewsAdmin(admin.ModelAdmin):
+    list_display = ['title', 'source', 'published_date', 'archived_at']
+    list_filter = ['source', 'published_date']
+    date_hierarchy = 'published_date'
+    ordering = ['-published_date']
+    fields = ['title', 'description', 'url', 'source', 'published_date', 'archived_at', 'original_id']
+    readonly_fields = fields
+    
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('source')
\ No newline at end of file
+        return super().get_queryset(request).select_related('source')
+    
+    def has_add_permission(self, request):
+        return False
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .compression import register_sqlite_functions
+        from .signals import connect_signals
+
+        # Сжатие текста архивных новостей как SQL-функции в каждом новом соединении SQLite
+        connection_created.connect(register_sqlite_functions, dispatch_uid='news_sqlite_functions')
+
+        # Сброс кэша страницы новостей при правке через модели
+        connect_signals()
@@ -0,0 +1,137 @@
+"""
+Перенос старых новостей в архив.
+
+Новости старше days дней (и отмеченные "Архивная" вручную) переносятся из
+горячей таблицы News в ArchivedNews порциями по batch_size: каждая порция -
+один INSERT ... SELECT со сжатием заголовка и описания внутри SQLite и один
+DELETE в общей транзакции. Удаляются только новости, которые действительно
+попали в архив: строка, пропущенная из-за конфликта (та же ссылка того же
+источника уже в архиве), остается в News. После переноса база оптимизируется (PRAGMA
+optimize), а при большом объеме - сжимается VACUUM, чтобы горячая таблица
+оставалась маленькой и помещалась в кэш страниц.
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import invalidate_news_cache
+from .compression import DecompressText, compress_text
+from .models import ArchivedNews, News, NewsCluster
+
+
+RETENTION_DAYS = 30
+ARCHIVE_BATCH_SIZE = 900
+# После переноса такого числа строк свободное место возвращается VACUUM
+VACUUM_THRESHOLD = 5000
+
+
+def _move_sqlite(ids, archived_at):
+    news_table = News._meta.db_table
+    archive_table = ArchivedNews._meta.db_table
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR IGNORE INTO {archive_table} '
+            f'(original_id, url, source_id, published_date, title_z, description_z, archived_at) '
+            f'SELECT id, url, source_id, published_date, COMPRESS_TEXT(title), COMPRESS_TEXT(description), %s '
+            f'FROM {news_table} WHERE id IN ({placeholders})',
+            [archived_at, *ids],
+        )
+
+
+def _move_python(ids, archived_at):
+    rows = News.objects.filter(id__in=ids).values_list('id', 'url', 'source_id', 'published_date', 'title', 'description')
+    ArchivedNews.objects.bulk_create(
+        [
+            ArchivedNews(
+                original_id=news_id, url=url, source_id=source_id, published_date=published_date,
+                title_z=compress_text(title), description_z=compress_text(description), archived_at=archived_at,
+            )
+            for news_id, url, source_id, published_date, title, description in rows
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _delete_news(ids):
+    # DELETE напрямую: через ORM на каждую строку сработал бы сигнал post_delete
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {News._meta.db_table} WHERE id IN ({placeholders})', ids)
+
+
+def _repair_clusters(cluster_ids):
+    """Сюжеты, потерявшие основную новость, получают новую основную; пустые сюжеты удаляются"""
+    with_primary = set(
+        News.objects.filter(cluster_id__in=cluster_ids, is_primary=True).values_list('cluster_id', flat=True)
+    )
+    promote = {}
+    rows = (
+        News.objects.filter(cluster_id__in=cluster_ids - with_primary)
+        .order_by('published_date')
+        .values_list('cluster_id', 'id')
+    )
+    for cluster_id, news_id in rows:
+        promote.setdefault(cluster_id, news_id)
+    if promote:
+        News.objects.filter(id__in=promote.values()).update(is_primary=True)
+    NewsCluster.objects.filter(id__in=cluster_ids - with_primary - set(promote)).delete()
+
+
+def optimize_database(vacuum=False):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        # VACUUM невозможен внутри транзакции
+        if vacuum and not connection.in_atomic_block:
+            cursor.execute('VACUUM')
+        cursor.execute('PRAGMA optimize')
+
+
+def archive_old_news(days=RETENTION_DAYS, batch_size=ARCHIVE_BATCH_SIZE, vacuum=None):
+    """
+    Переносит старые новости в архив; возвращает число перенесенных.
+    vacuum=None - VACUUM только если перенесено больше VACUUM_THRESHOLD строк.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    candidates = News.objects.filter(Q(published_date__lt=cutoff) | Q(is_archived=True)).order_by('id')
+    move = _move_sqlite if connection.vendor == 'sqlite' else _move_python
+
+    moved = 0
+    touched_clusters = set()
+    last_id = 0
+    while True:
+        rows = list(candidates.filter(id__gt=last_id).values_list('id', 'cluster_id')[:batch_size])
+        if not rows:
+            break
+        ids = [news_id for news_id, _ in rows]
+        last_id = ids[-1]
+        touched_clusters.update(cluster_id for _, cluster_id in rows if cluster_id)
+        with transaction.atomic():
+            move(ids, timezone.now())
+            archived = list(ArchivedNews.objects.filter(original_id__in=ids).values_list('original_id', flat=True))
+            if archived:
+                _delete_news(archived)
+        moved += len(archived)
+
+    if touched_clusters:
+        _repair_clusters(touched_clusters)
+    if moved:
+        invalidate_news_cache()
+    optimize_database(vacuum=moved > VACUUM_THRESHOLD if vacuum is None else vacuum)
+    return moved
+
+
+def search_archive(query=''):
+    """Архивные новости с распакованными заголовком и описанием; поиск по ним - внутри базы"""
+    queryset = ArchivedNews.objects.select_related('source').annotate(
+        title_text=DecompressText('title_z'),
+        description_text=DecompressText('description_z'),
+    ).defer('title_z', 'description_z')
+    if query:
+        queryset = queryset.filter(
+            Q(title_text__icontains=query) | Q(description_text__icontains=query) | Q(source__name__icontains=query)
+        )
+    return queryset
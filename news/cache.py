@@ -0,0 +1,59 @@
+"""
+Кэш агрегатов страницы новостей.
+
+Статистика, список источников и рекомендуемые новости одинаковы для всех
+посетителей и меняются только при сборе, архивировании и ручной правке,
+поэтому считаются один раз и хранятся в кэше 'news' (на диске, общий для
+веб-процессов и планировщика). Кэш сбрасывается сигналами при сохранении
+через модели и явно после пакетных операций (bulk_create/update сигналов
+не посылают); TTL кэша страхует счетчик "за неделю", который устаревает сам.
+"""
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import News, NewsSource
+
+
+LIST_CACHE_KEY = 'news-list:aggregates:v2'
+RECENT_DAYS = 7
+FEATURED_LIMIT = 6
+
+
+def _build_aggregates():
+    week_ago = timezone.now() - timedelta(days=RECENT_DAYS)
+    # Все счетчики - одним проходом по таблице
+    stats = News.objects.filter(is_archived=False).aggregate(
+        total_news=Count('id'),
+        recent_news=Count('id', filter=Q(published_date__gte=week_ago)),
+        featured_news=Count('id', filter=Q(is_featured=True)),
+        primary_news=Count('id', filter=Q(is_primary=True)),
+    )
+    return {
+        # Время сборки - признак изменений для ETag страницы новостей
+        'built_at': timezone.now(),
+        'stats': stats,
+        'sources': list(NewsSource.objects.filter(is_active=True).only('id', 'name')),
+        'featured_news': list(
+            News.objects.filter(is_featured=True, is_archived=False)
+            .select_related('source')
+            .order_by('-published_date')[:FEATURED_LIMIT]
+        ),
+    }
+
+
+def get_list_aggregates():
+    """Статистика, активные источники и рекомендуемые новости: из кэша или тремя запросами"""
+    cache = caches['news']
+    aggregates = cache.get(LIST_CACHE_KEY)
+    if aggregates is None:
+        aggregates = _build_aggregates()
+        cache.set(LIST_CACHE_KEY, aggregates)
+    return aggregates
+
+
+def invalidate_news_cache(*args, **kwargs):
+    """Сбрасывает агрегаты; подходит и как обработчик сигнала"""
+    caches['news'].delete(LIST_CACHE_KEY)
@@ -0,0 +1,204 @@
+"""
+Склейка одной и той же истории из разных источников.
+
+Для заголовка и начала описания считается 64-битный simhash. Близкие
+отпечатки (расстояние Хэмминга не больше MAX_DISTANCE = 6) ищутся через
+индекс: отпечаток делится на 8 блоков по 8 бит, и при расхождении не более
+чем в 6 битах хотя бы 2 блока из 8 совпадают целиком. Ключ индекса - пара
+блоков (16 бит, 28 пар на отпечаток), поэтому в корзине в среднем N/65536
+новостей и число сравниваемых кандидатов почти не растет с числом новостей.
+Кандидаты берутся из окна CLUSTER_WINDOW вокруг даты публикации.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from datetime import timedelta
+from itertools import combinations
+
+from django.db import transaction
+
+from .cache import invalidate_news_cache
+from .models import News, NewsCluster
+
+
+FINGERPRINT_BITS = 64
+BLOCKS = 8
+BLOCK_BITS = FINGERPRINT_BITS // BLOCKS
+BLOCK_MASK = (1 << BLOCK_BITS) - 1
+MAX_DISTANCE = 6
+# Блоков, совпадающих у любых двух отпечатков на расстоянии не больше MAX_DISTANCE
+MATCHING_BLOCKS = BLOCKS - MAX_DISTANCE
+BLOCK_PAIRS = list(combinations(range(BLOCKS), MATCHING_BLOCKS))
+CLUSTER_WINDOW = timedelta(days=3)
+LEAD_LENGTH = 300
+# Окончания слов отбрасываются: "обновление" и "обновления" дают один признак
+STEM_LENGTH = 6
+
+WORD_RE = re.compile(r'[0-9a-zа-яё]+')
+STOP_WORDS = {
+    'и', 'в', 'во', 'на', 'с', 'со', 'по', 'для', 'от', 'до', 'из', 'за', 'о', 'об', 'не', 'что', 'как',
+    'а', 'но', 'к', 'у', 'the', 'a', 'an', 'of', 'to', 'in', 'on', 'for', 'and', 'is', 'with',
+}
+
+
+def _features(title, lead=''):
+    """Основы слов и пары соседних слов; признаки заголовка весят вдвое больше"""
+    features = defaultdict(int)
+    for text, weight in ((title, 2), (lead[:LEAD_LENGTH], 1)):
+        words = [word[:STEM_LENGTH] for word in WORD_RE.findall(text.lower().replace('ё', 'е')) if word not in STOP_WORDS]
+        for word in words:
+            features[word] += weight
+        for first, second in zip(words, words[1:]):
+            features[f'{first} {second}'] += weight
+    return features
+
+
+def _hash64(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(title, lead=''):
+    """64-битный отпечаток в виде знакового целого (помещается в BigIntegerField)"""
+    features = _features(title, lead)
+    if not features:
+        return None
+
+    # Бит отпечатка равен 1, если у взвешенного большинства признаков этот бит хеша равен 1.
+    # Хеши записываются строками из 0/1 (признак с весом w - w раз), столбцы считаются через zip и count
+    rows = []
+    for feature, weight in features.items():
+        rows.extend([format(_hash64(feature), '064b')] * weight)
+    half = len(rows) / 2
+    bits = ''.join('1' if column.count('1') > half else '0' for column in zip(*rows))
+
+    fingerprint = int(bits, 2)
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def hamming_distance(first, second):
+    return ((first ^ second) & ((1 << 64) - 1)).bit_count()
+
+
+def bands(fingerprint):
+    """Ключи индекса: номер сочетания блоков и их значения"""
+    unsigned = fingerprint & ((1 << 64) - 1)
+    blocks = [unsigned >> (block * BLOCK_BITS) & BLOCK_MASK for block in range(BLOCKS)]
+    return [(number, *(blocks[block] for block in pair)) for number, pair in enumerate(BLOCK_PAIRS)]
+
+
+class _Entry:
+    """Новость в индексе: cluster - id кластера или еще не сохраненный NewsCluster"""
+    __slots__ = ('id', 'fingerprint', 'published_date', 'cluster', 'news')
+
+    def __init__(self, news_id, fingerprint, published_date, cluster, news=None):
+        self.id = news_id
+        self.fingerprint = fingerprint
+        self.published_date = published_date
+        self.cluster = cluster
+        self.news = news
+
+
+def _cluster_id(cluster):
+    return cluster.pk if isinstance(cluster, NewsCluster) else cluster
+
+
+def cluster_news(news_ids, window=CLUSTER_WINDOW, chunk_size=900):
+    """
+    Считает отпечатки новых новостей и склеивает их с похожими за окно window.
+
+    Новость, к которой нашлась пара, попадает в ее кластер и не показывается
+    отдельной карточкой (is_primary=False); первая новость кластера остается
+    основной. Возвращает число склеенных новостей.
+    """
+    news_ids = list(news_ids)
+    new_news = []
+    for start in range(0, len(news_ids), chunk_size):
+        new_news.extend(
+            News.objects.filter(id__in=news_ids[start:start + chunk_size])
+            .only('id', 'title', 'description', 'published_date', 'cluster_id', 'is_primary', 'fingerprint')
+        )
+    if not new_news:
+        return 0
+
+    # Отпечатки обычно посчитаны при вставке; недостающие (старые новости) считаем здесь
+    missing_fingerprint = [news for news in new_news if news.fingerprint is None]
+    for news in missing_fingerprint:
+        news.fingerprint = simhash(news.title, news.description)
+    new_news.sort(key=lambda news: news.published_date)
+
+    # Уже сохраненные отпечатки из окна - одним запросом
+    new_ids = {news.id for news in new_news}
+    index = defaultdict(list)
+    recent = (
+        News.objects
+        .filter(
+            fingerprint__isnull=False,
+            published_date__gte=new_news[0].published_date - window,
+            published_date__lte=new_news[-1].published_date + window,
+        )
+        .values_list('id', 'fingerprint', 'published_date', 'cluster_id')
+    )
+    for news_id, fingerprint, published_date, cluster_id in recent:
+        if news_id not in new_ids:
+            entry = _Entry(news_id, fingerprint, published_date, cluster_id)
+            for key in bands(fingerprint):
+                index[key].append(entry)
+
+    new_clusters = []
+    # Уже сохраненные новости, которые стали основой нового кластера
+    new_primaries = []
+    entries = []
+    for news in new_news:
+        entry = _Entry(news.id, news.fingerprint, news.published_date, news.cluster_id, news)
+        entries.append(entry)
+        if news.fingerprint is None:
+            continue
+
+        best = None
+        keys = bands(news.fingerprint)
+        seen = set()
+        for key in keys:
+            for candidate in index[key]:
+                # Близкий отпечаток совпадает сразу по нескольким ключам - сравниваем его один раз
+                if candidate.id in seen or abs(candidate.published_date - news.published_date) > window:
+                    continue
+                seen.add(candidate.id)
+                distance = hamming_distance(candidate.fingerprint, news.fingerprint)
+                if distance <= MAX_DISTANCE and (best is None or distance < best[0]):
+                    best = (distance, candidate)
+
+        if best:
+            match = best[1]
+            if match.cluster is None:
+                match.cluster = NewsCluster(title=(match.news or news).title[:500])
+                new_clusters.append(match.cluster)
+                if match.news is None:
+                    new_primaries.append(match)
+            entry.cluster = match.cluster
+            news.is_primary = False
+
+        for key in keys:
+            index[key].append(entry)
+
+    with transaction.atomic():
+        NewsCluster.objects.bulk_create(new_clusters)
+        if new_primaries:
+            News.objects.bulk_update(
+                [News(pk=entry.id, cluster_id=entry.cluster.pk) for entry in new_primaries], ['cluster'], batch_size=500
+            )
+        if missing_fingerprint:
+            News.objects.bulk_update(missing_fingerprint, ['fingerprint'], batch_size=500)
+
+        # Пишем только новости, у которых изменился сюжет
+        changed = []
+        for entry in entries:
+            cluster_id = _cluster_id(entry.cluster)
+            if cluster_id != entry.news.cluster_id:
+                entry.news.cluster_id = cluster_id
+                changed.append(entry.news)
+        News.objects.bulk_update(changed, ['cluster', 'is_primary'], batch_size=500)
+
+    if changed:
+        # Изменилось число основных карточек
+        invalidate_news_cache()
+    return sum(1 for news in new_news if not news.is_primary)
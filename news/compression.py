@@ -0,0 +1,41 @@
+"""
+Сжатие текста архивных новостей.
+
+Те же функции регистрируются в SQLite как COMPRESS_TEXT(text) и
+DECOMPRESS_TEXT(blob), поэтому перенос в архив выполняется одним
+INSERT ... SELECT внутри базы, а поиск по архиву - одним запросом.
+"""
+import zlib
+
+from django.db.models import Func, TextField
+
+from tools.functions import SQLiteFunctionMixin
+
+
+COMPRESSION_LEVEL = 9
+
+
+def compress_text(text):
+    if text is None:
+        return None
+    return zlib.compress(str(text).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decompress_text(data):
+    if data is None:
+        return None
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """Обработчик connection_created: регистрирует функции сжатия в новом соединении SQLite"""
+    if connection.vendor != 'sqlite':
+        return
+    connection.connection.create_function('COMPRESS_TEXT', 1, compress_text, deterministic=True)
+    connection.connection.create_function('DECOMPRESS_TEXT', 1, decompress_text, deterministic=True)
+
+
+class DecompressText(SQLiteFunctionMixin, Func):
+    """Распакованный текст в запросе: annotate(title=DecompressText('title_z'))"""
+    function = 'DECOMPRESS_TEXT'
+    output_field = TextField()
@@ -0,0 +1,149 @@
+"""
+Описания новостей со страниц статей.
+
+После сохранения новые новости без описания скачиваются параллельно (не больше
+per_host одновременных запросов к одному сайту), из страницы берется og:/meta
+description или первый содержательный абзац. Найденные описания (и пустые
+результаты) кладутся в файловый кэш 'pages', поэтому повторный сбор
+страницы не скачивает.
+"""
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from django.core.cache import caches
+from django.utils import timezone
+
+from .cache import invalidate_news_cache
+from .clustering import simhash
+from .fetchers import FetchTimeout, fetch_with_deadline, make_session
+from .models import News
+
+
+LEAD_MAX_LENGTH = 1000
+MIN_PARAGRAPH_LENGTH = 80
+META_DESCRIPTIONS = [
+    {'property': 'og:description'},
+    {'name': 'description'},
+    {'name': 'twitter:description'},
+]
+# Неудачные загрузки запоминаются ненадолго, чтобы повторить их при следующем сборе
+EMPTY_LEAD_TIMEOUT = 6 * 3600
+
+
+def extract_lead(html):
+    """og:/meta description или первый абзац статьи длиннее MIN_PARAGRAPH_LENGTH символов"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for attrs in META_DESCRIPTIONS:
+        meta = soup.find('meta', attrs=attrs)
+        content = ' '.join((meta.get('content') or '').split()) if meta else ''
+        if content:
+            return content[:LEAD_MAX_LENGTH]
+
+    container = soup.find('article') or soup.find('main') or soup
+    for paragraph in container.find_all('p'):
+        text = ' '.join(paragraph.get_text(' ', strip=True).split())
+        if len(text) >= MIN_PARAGRAPH_LENGTH:
+            return text[:LEAD_MAX_LENGTH]
+    return ''
+
+
+def _cache_key(url):
+    return 'news-lead:' + hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class LeadExtractor:
+    """Параллельная загрузка описаний статей с ограничением на хост"""
+
+    def __init__(self, max_workers=16, per_host=2, timeout=10):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = make_session(max_workers)
+        self.cache = caches['pages']
+
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            return self._host_limits[host]
+
+    def fetch_lead(self, url):
+        """Описание одной статьи; None, если страницу получить не удалось"""
+        try:
+            with self._host_semaphore(url):
+                response = fetch_with_deadline(self.session, url, self.timeout)
+            response.raise_for_status()
+        except (requests.exceptions.RequestException, FetchTimeout):
+            return None
+        if 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return ''
+        return extract_lead(response.text)
+
+    def fetch_leads(self, urls):
+        """{url: описание} для списка URL: сначала из кэша, остальное - параллельно"""
+        urls = list(dict.fromkeys(urls))
+        keys = {_cache_key(url): url for url in urls}
+        cached = self.cache.get_many(keys)
+        leads = {keys[key]: lead for key, lead in cached.items()}
+
+        todo = iter([url for url in urls if url not in leads])
+        window = self.max_workers * 4
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for url in todo:
+                pending[executor.submit(self.fetch_lead, url)] = url
+                if len(pending) < window:
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._store(leads, pending.pop(future), future.result())
+            for future in list(pending):
+                self._store(leads, pending.pop(future), future.result())
+        return leads
+
+    def _store(self, leads, url, lead):
+        if lead is None:
+            # Ошибка загрузки: кэшируем пустой результат на короткое время
+            self.cache.set(_cache_key(url), '', EMPTY_LEAD_TIMEOUT)
+            lead = ''
+        else:
+            self.cache.set(_cache_key(url), lead)
+        leads[url] = lead
+
+
+def enrich_descriptions(news_ids, extractor=None, chunk_size=900):
+    """Заполняет пустые описания новостей; возвращает число обновленных"""
+    news_ids = list(news_ids)
+    news_list = []
+    for start in range(0, len(news_ids), chunk_size):
+        news_list.extend(
+            News.objects.filter(id__in=news_ids[start:start + chunk_size], description='').only('id', 'url', 'title', 'description', 'fingerprint', 'updated_at')
+        )
+    if not news_list:
+        return 0
+
+    extractor = extractor or LeadExtractor()
+    leads = extractor.fetch_leads(news.url for news in news_list)
+
+    updated = []
+    now = timezone.now()
+    for news in news_list:
+        lead = leads.get(news.url)
+        if lead:
+            news.description = lead
+            # Отпечаток при вставке считался без описания - пересчитываем, чтобы склейка учитывала лид
+            news.fingerprint = simhash(news.title, lead)
+            # bulk_update не обновляет auto_now - а по updated_at страница новостей видит изменения
+            news.updated_at = now
+            updated.append(news)
+    if updated:
+        News.objects.bulk_update(updated, ['description', 'fingerprint', 'updated_at'], batch_size=500)
+        # Карточки рекомендуемых в кэше - еще с пустыми описаниями
+        invalidate_news_cache()
+    return len(updated)
@@ -0,0 +1,260 @@
+"""
+Сбор новостей с источников.
+
+У каждого NewsSource свой адаптер: RSS/Atom-лента, если она есть (для
+режима "авто" ссылка на ленту ищется на главной странице один раз и
+запоминается), иначе ссылки со страницы. Источники опрашиваются параллельно,
+у каждого свой таймаут на весь запрос целиком, поэтому медленный сайт не
+задерживает остальные. ETag и Last-Modified хранятся в источнике: если лента
+не менялась, сервер отвечает 304 без тела.
+"""
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from django.utils import timezone
+
+from .models import NewsSource
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/rdf+xml')
+DEFAULT_HTML_SELECTOR = 'article a[href], h2 a[href], h3 a[href]'
+MAX_RESPONSE_SIZE = 5 * 1024 * 1024
+MIN_TITLE_LENGTH = 15
+
+
+class FetchTimeout(Exception):
+    """Источник не ответил целиком за отведенное время"""
+
+
+class FetchResult:
+    """Результат опроса одного источника (сохраняется в базе главным потоком)"""
+
+    def __init__(self, source):
+        self.source = source
+        self.items = []
+        self.not_modified = False
+        self.error = ''
+        self.etag = source.etag
+        self.last_modified = source.last_modified
+        self.feed_url = source.feed_url
+
+    @property
+    def status(self):
+        if self.error:
+            return f'Ошибка: {self.error}'[:200]
+        if self.not_modified:
+            return 'Без изменений (304)'
+        return f'Найдено новостей: {len(self.items)}'
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _child_text(element, name):
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or '').strip()
+    return ''
+
+
+def _parse_feed_date(value):
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)  # RSS: RFC 822
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))  # Atom: RFC 3339
+        except ValueError:
+            return None
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def parse_feed(content, base_url=''):
+    """Новости из RSS 2.0, RSS 1.0 (RDF) или Atom"""
+    root = ET.fromstring(content)
+    items = []
+    for element in root.iter():
+        name = _local_name(element.tag)
+        if name not in ('item', 'entry'):
+            continue
+
+        link = _child_text(element, 'link')
+        if name == 'entry' or not link:
+            for child in element:
+                if _local_name(child.tag) == 'link' and child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                    break
+        title = _child_text(element, 'title')
+        if not link or not title:
+            continue
+
+        date = (
+            _child_text(element, 'pubDate') or _child_text(element, 'published')
+            or _child_text(element, 'updated') or _child_text(element, 'date')
+        )
+        description = _child_text(element, 'description') or _child_text(element, 'summary')
+        if '<' in description:
+            description = BeautifulSoup(description, 'html.parser').get_text(' ', strip=True)
+
+        items.append({
+            'title': ' '.join(title.split()),
+            'url': urljoin(base_url, link.strip()),
+            'date': _parse_feed_date(date),
+            'description': description[:1000],
+        })
+    return items
+
+
+def find_feed_url(html, base_url):
+    """Ссылка на RSS/Atom из <link rel="alternate"> страницы"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for link in soup.find_all('link', href=True):
+        rel = link.get('rel') or []
+        if 'alternate' in rel and (link.get('type') or '').lower() in FEED_TYPES:
+            return urljoin(base_url, link['href'])
+    return ''
+
+
+def parse_html_links(html, base_url, selector=''):
+    """Новости со страницы: ссылки по CSS-селектору на тот же сайт с осмысленным текстом"""
+    soup = BeautifulSoup(html, 'html.parser')
+    host = urlparse(base_url).netloc.lower().removeprefix('www.')
+    seen = set()
+    items = []
+    for anchor in soup.select(selector or DEFAULT_HTML_SELECTOR):
+        # Селектор вроде "article h2 a" может попасть и на ссылку без href
+        href = (anchor.get('href') or '').strip()
+        if not href:
+            continue
+        title = ' '.join(anchor.get_text(' ', strip=True).split())
+        url = urljoin(base_url, href).split('#')[0]
+        if len(title) < MIN_TITLE_LENGTH or url in seen:
+            continue
+        if urlparse(url).netloc.lower().removeprefix('www.') != host:
+            continue
+        seen.add(url)
+        items.append({'title': title, 'url': url, 'date': None, 'description': ''})
+    return items
+
+
+def fetch_with_deadline(session, url, timeout, headers=None):
+    """GET с ограничением на время всего ответа, а не только на ожидание сокета"""
+    deadline = time.monotonic() + timeout
+    response = session.get(url, headers=headers or {}, timeout=timeout, stream=True)
+    try:
+        # read1 отдает данные по мере поступления, поэтому срок проверяется и у "капающего" ответа
+        response.raw.decode_content = True
+        read = getattr(response.raw, 'read1', None) or response.raw.read
+        chunks = []
+        size = 0
+        while True:
+            chunk = read(64 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if time.monotonic() > deadline:
+                raise FetchTimeout(f'ответ не получен за {timeout} сек')
+            if size > MAX_RESPONSE_SIZE:
+                break
+        response._content = b''.join(chunks)
+    finally:
+        response.close()
+    return response
+
+
+def make_session(pool_size):
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class NewsFetcher:
+    """Параллельный опрос источников новостей"""
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.session = make_session(max_workers)
+
+    def _get(self, url, timeout, headers=None):
+        return fetch_with_deadline(self.session, url, timeout, headers)
+
+    def _conditional_get(self, url, result):
+        headers = {}
+        if result.etag:
+            headers['If-None-Match'] = result.etag
+        if result.last_modified:
+            headers['If-Modified-Since'] = result.last_modified
+
+        response = self._get(url, result.source.timeout, headers)
+        if response.status_code == 304:
+            result.not_modified = True
+            return None
+        response.raise_for_status()
+        result.etag = response.headers.get('ETag', '')
+        result.last_modified = response.headers.get('Last-Modified', '')
+        return response
+
+    def fetch_source(self, source):
+        """Опрос одного источника (выполняется в потоке пула, в базу не пишет)"""
+        result = FetchResult(source)
+        try:
+            if source.adapter == 'auto' and not source.feed_url:
+                # Ищем ленту на главной; если ее нет, берем ссылки с самой главной
+                response = self._conditional_get(source.url, result)
+                if response is None:
+                    return result
+                result.feed_url = find_feed_url(response.text, response.url)
+                if not result.feed_url:
+                    result.items = parse_html_links(response.text, response.url, source.html_selector)
+                    return result
+                # Валидаторы главной к ленте не относятся
+                result.etag = result.last_modified = ''
+
+            if source.adapter != 'html' and result.feed_url:
+                response = self._conditional_get(result.feed_url, result)
+                if response is not None:
+                    result.items = parse_feed(response.content, response.url)
+            else:
+                response = self._conditional_get(source.url, result)
+                if response is not None:
+                    result.items = parse_html_links(response.text, response.url, source.html_selector)
+        except FetchTimeout as e:
+            result.error = str(e)
+        except requests.exceptions.Timeout:
+            result.error = f'таймаут {source.timeout} сек'
+        except (requests.exceptions.RequestException, ET.ParseError) as e:
+            result.error = str(e)
+
+        for item in result.items:
+            item['source'] = source.name
+        return result
+
+    def fetch(self, sources):
+        """Генератор результатов по мере готовности источников"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self.fetch_source, source) for source in sources}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    @staticmethod
+    def save_state(result):
+        """Запоминает валидаторы, найденную ленту и итог опроса источника"""
+        fields = {'last_fetched_at': timezone.now(), 'last_status': result.status}
+        if not result.error:
+            fields.update(etag=result.etag[:255], last_modified=result.last_modified[:100], feed_url=result.feed_url)
+        NewsSource.objects.filter(pk=result.source.pk).update(**fields)
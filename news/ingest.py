@@ -0,0 +1,112 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_news_cache
+from .models import ArchivedNews, News, NewsSource
+from .clustering import simhash
+
+
+# Сколько значений передается в одном IN (...) - с запасом под лимит параметров SQLite
+LOOKUP_CHUNK_SIZE = 900
+
+
+def _chunks(values, size=LOOKUP_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def resolve_sources(names):
+    """Источники по названиям: существующие читаются одним запросом, недостающие создаются пачкой"""
+    names = set(names)
+    sources = {source.name: source for source in NewsSource.objects.filter(name__in=names)}
+
+    missing = names - set(sources)
+    if missing:
+        NewsSource.objects.bulk_create(
+            [NewsSource(name=name, url=f'https://{name}', is_active=True) for name in missing],
+            ignore_conflicts=True,
+        )
+        sources.update({source.name: source for source in NewsSource.objects.filter(name__in=missing)})
+    return sources
+
+
+def existing_keys(keys):
+    """Какие из пар (url, source_id) уже есть в базе - среди текущих новостей или в архиве"""
+    keys = set(keys)
+    found = set()
+    source_ids = {source_id for _, source_id in keys}
+    for urls in _chunks({url for url, _ in keys}):
+        for model in (News, ArchivedNews):
+            found.update(
+                model.objects.filter(url__in=urls, source_id__in=source_ids).values_list('url', 'source_id')
+            )
+    return found & keys
+
+
+def _published_date(value):
+    if isinstance(value, datetime):
+        return timezone.make_aware(value) if timezone.is_naive(value) else value
+    return timezone.now()
+
+
+def ingest_news(items, batch_size=500):
+    """
+    Сохраняет распарсенные новости пачкой.
+
+    items - словари с ключами title, url, source (название источника), date и
+    необязательным description. Источники разрешаются одним запросом, уже
+    сохраненные пары (url, источник) читаются заранее, новые строки вставляются
+    bulk_create(ignore_conflicts=True) в одной транзакции (unique_together
+    отсекает гонки с параллельным запуском). Отпечаток для склейки сюжетов
+    считается сразу при вставке. Возвращает число добавленных,
+    число найденных и id новых новостей.
+    """
+    items = [item for item in items if item.get('url') and item.get('title') and item.get('source')]
+    result = {'added': 0, 'total': len(items), 'new_ids': []}
+    if not items:
+        return result
+
+    with transaction.atomic():
+        sources = resolve_sources(item['source'] for item in items)
+        keys = {(item['url'], sources[item['source']].id) for item in items}
+        skip = existing_keys(keys)
+
+        new_news = []
+        for item in items:
+            key = (item['url'], sources[item['source']].id)
+            if key in skip:
+                continue
+            skip.add(key)  # дубликаты внутри самой пачки
+            title = item['title'][:500]
+            description = item.get('description') or ''
+            new_news.append(News(
+                title=title,
+                url=item['url'],
+                source=sources[item['source']],
+                published_date=_published_date(item.get('date')),
+                description=description,
+                fingerprint=simhash(title, description),
+            ))
+
+        if not new_news:
+            return result
+
+        News.objects.bulk_create(new_news, batch_size=batch_size, ignore_conflicts=True)
+
+        # ignore_conflicts не возвращает id - дочитываем их одним запросом на порцию
+        new_keys = {(news.url, news.source_id) for news in new_news}
+        new_ids = []
+        for urls in _chunks({url for url, _ in new_keys}):
+            rows = News.objects.filter(
+                url__in=urls, source_id__in={source_id for _, source_id in new_keys}
+            ).values_list('id', 'url', 'source_id')
+            new_ids.extend(news_id for news_id, url, source_id in rows if (url, source_id) in new_keys)
+
+    result['added'] = len(new_ids)
+    result['new_ids'] = new_ids
+    if new_ids:
+        invalidate_news_cache()
+    return result
@@ -0,0 +1,19 @@
+from scheduler.registry import register
+
+from .parser_service import NewsParserService
+
+
+@register('news.parse', cron='0 9 * * 0', jitter=300, lock_timeout=2 * 3600)
+def parse_news():
+    """Сбор новостей из всех активных источников (по воскресеньям в 9:00)"""
+    result = NewsParserService().parse_all_sources()
+    return (
+        f'Добавлено {result["added"]} из {result["total"]}, описаний: {result["enriched"]}, '
+        f'склеено: {result["clustered"]}'
+    )
+
+
+@register('news.cleanup', cron='30 9 * * 0', jitter=300)
+def cleanup_news():
+    """Перенос новостей старше 30 дней в сжатый архив"""
+    return f'Перенесено в архив: {NewsParserService().cleanup_old_news()}'
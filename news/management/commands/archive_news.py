@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from news.archive import ARCHIVE_BATCH_SIZE, RETENTION_DAYS, archive_old_news
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые новости в сжатый архив и оптимизирует базу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RETENTION_DAYS, help='Переносить новости старше N дней')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Сколько новостей переносить за раз')
+        parser.add_argument('--vacuum', action='store_true', help='Выполнить VACUUM независимо от объема')
+
+    def handle(self, *args, **options):
+        moved = archive_old_news(options['days'], options['batch_size'], vacuum=options['vacuum'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Перенесено в архив: {moved}'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from news.clustering import cluster_news
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Склеивает одинаковые истории из разных источников для новостей без отпечатка'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Сколько новостей обрабатывать за раз')
+
+    def handle(self, *args, **options):
+        # В хронологическом порядке, чтобы основной в сюжете оставалась самая ранняя новость
+        news_ids = list(
+            News.objects.filter(fingerprint__isnull=True).order_by('published_date').values_list('id', flat=True)
+        )
+        self.stdout.write(f'Новостей без отпечатка: {len(news_ids)}')
+
+        clustered = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(news_ids), batch_size):
+            clustered += cluster_news(news_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Готово! Склеено с другими источниками: {clustered}'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from news.enrichment import LeadExtractor, enrich_descriptions
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Загружает описания для новостей без описания со страниц статей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000, help='Сколько новостей обработать')
+        parser.add_argument('--workers', type=int, default=16, help='Количество параллельных запросов')
+        parser.add_argument('--per-host', type=int, default=2, help='Максимум одновременных запросов к одному сайту')
+
+    def handle(self, *args, **options):
+        news_ids = list(
+            News.objects.filter(description='', is_archived=False)
+            .order_by('-published_date')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+        self.stdout.write(f'Новостей без описания: {len(news_ids)}')
+
+        extractor = LeadExtractor(max_workers=options['workers'], per_host=options['per_host'])
+        updated = enrich_descriptions(news_ids, extractor=extractor)
+        self.stdout.write(self.style.SUCCESS(f'Описания загружены для {updated} новостей'))
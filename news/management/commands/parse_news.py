@@ -6,29 +6,44 @@ class Command(BaseCommand):
     help = 'Парсит новости из всех источников'
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Сколько источников опрашивать одновременно',
+        )
+        parser.add_argument(
+            '--skip-leads',
+            action='store_true',
+            help='Не загружать описания со страниц статей',
+        )
         parser.add_argument(
             '--cleanup',
             action='store_true',
-            help='Архивировать старые новости (старше 30 дней)',
+            help='Перенести старые новости (старше 30 дней) в архив',
         )
 
     def handle(self, *args, **options):
         self.stdout.write('Начинаем парсинг новостей...')
         
         try:
-            parser_service = NewsParserService()
+            parser_service = NewsParserService(max_workers=options['workers'], fetch_leads=not options['skip_leads'])
             result = parser_service.parse_all_sources()
             
+            for name, status in sorted(result['sources'].items()):
+                self.stdout.write(f'  {name}: {status}')
+            
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Парсинг завершен! Добавлено {result["added"]} новых новостей из {result["total"]} найденных.'
+                    f'Парсинг завершен! Добавлено {result["added"]} новых новостей из {result["total"]} найденных, '
+                    f'описаний загружено: {result["enriched"]}, склеено с другими источниками: {result["clustered"]}.'
                 )
             )
             
             if options['cleanup']:
                 archived_count = parser_service.cleanup_old_news()
                 self.stdout.write(
-                    self.style.SUCCESS(f'Архивировано {archived_count} старых новостей.')
+                    self.style.SUCCESS(f'Перенесено в архив {archived_count} старых новостей.')
                 )
                 
         except Exception as e:
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='adapter',
+            field=models.CharField(choices=[('auto', 'Авто (RSS, если найдена лента)'), ('rss', 'RSS/Atom'), ('html', 'HTML страница')], default='auto', max_length=10, verbose_name='Способ сбора'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='etag',
+            field=models.CharField(blank=True, max_length=255, verbose_name='ETag'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_url',
+            field=models.URLField(blank=True, verbose_name='RSS/Atom лента'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='html_selector',
+            field=models.CharField(blank=True, help_text='Для HTML-страниц, например: article h2 a', max_length=200, verbose_name='CSS-селектор ссылок'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='last_fetched_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний сбор'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='last_modified',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Last-Modified'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='last_status',
+            field=models.CharField(blank=True, max_length=200, verbose_name='Результат последнего сбора'),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='timeout',
+            field=models.PositiveSmallIntegerField(default=15, verbose_name='Таймаут, сек'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_newssource_fetch_settings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500, verbose_name='Заголовок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+            ],
+            options={
+                'verbose_name': 'Сюжет',
+                'verbose_name_plural': 'Сюжеты',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fingerprint',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Отпечаток (simhash)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='is_primary',
+            field=models.BooleanField(default=True, verbose_name='Основная в сюжете'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['published_date', 'fingerprint'], name='news_news_publish_d36791_idx'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='cluster',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='news', to='news.newscluster', verbose_name='Сюжет'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_clusters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True, verbose_name='ID в таблице новостей')),
+                ('url', models.URLField(verbose_name='Ссылка на новость')),
+                ('published_date', models.DateTimeField(verbose_name='Дата публикации')),
+                ('title_z', models.BinaryField(verbose_name='Заголовок (сжат)')),
+                ('description_z', models.BinaryField(verbose_name='Описание (сжато)')),
+                ('archived_at', models.DateTimeField(verbose_name='Архивирована')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_news', to='news.newssource', verbose_name='Источник')),
+            ],
+            options={
+                'verbose_name': 'Архивная новость',
+                'verbose_name_plural': 'Архив новостей',
+                'ordering': ['-published_date'],
+                'indexes': [models.Index(fields=['published_date'], name='news_archiv_publish_8d3d23_idx')],
+                'unique_together': {('url', 'source')},
+            },
+        ),
+    ]
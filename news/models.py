@@ -1,14 +1,37 @@
 from django.db import models
 from django.urls import reverse
 
+from .compression import decompress_text
+
 
 class NewsSource(models.Model):
     """Источник новостей"""
+    ADAPTER_CHOICES = [
+        ('auto', 'Авто (RSS, если найдена лента)'),
+        ('rss', 'RSS/Atom'),
+        ('html', 'HTML страница'),
+    ]
+    
     name = models.CharField(max_length=100, verbose_name="Название")
     url = models.URLField(verbose_name="URL")
     is_active = models.BooleanField(default=True, verbose_name="Активен")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
     
+    # Настройки сбора
+    adapter = models.CharField(max_length=10, choices=ADAPTER_CHOICES, default='auto', verbose_name="Способ сбора")
+    feed_url = models.URLField(blank=True, verbose_name="RSS/Atom лента")
+    html_selector = models.CharField(
+        max_length=200, blank=True, verbose_name="CSS-селектор ссылок",
+        help_text="Для HTML-страниц, например: article h2 a"
+    )
+    timeout = models.PositiveSmallIntegerField(default=15, verbose_name="Таймаут, сек")
+    
+    # Условный GET: при неизмененной ленте сервер отвечает 304
+    etag = models.CharField(max_length=255, blank=True, verbose_name="ETag")
+    last_modified = models.CharField(max_length=100, blank=True, verbose_name="Last-Modified")
+    last_fetched_at = models.DateTimeField(null=True, blank=True, verbose_name="Последний сбор")
+    last_status = models.CharField(max_length=200, blank=True, verbose_name="Результат последнего сбора")
+    
     class Meta:
         verbose_name = "Источник новостей"
         verbose_name_plural = "Источники новостей"
@@ -18,6 +41,20 @@ class NewsSource(models.Model):
         return self.name
 
 
+class NewsCluster(models.Model):
+    """Одна история, опубликованная несколькими источниками"""
+    title = models.CharField(max_length=500, verbose_name="Заголовок")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    
+    class Meta:
+        verbose_name = "Сюжет"
+        verbose_name_plural = "Сюжеты"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.title
+
+
 class News(models.Model):
     """Новость"""
     title = models.CharField(max_length=500, verbose_name="Заголовок")
@@ -30,11 +67,23 @@ class News(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Добавлена")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлена")
     
+    # Склейка одинаковых историй из разных источников
+    fingerprint = models.BigIntegerField(null=True, blank=True, verbose_name="Отпечаток (simhash)")
+    cluster = models.ForeignKey(
+        NewsCluster, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='news', verbose_name="Сюжет"
+    )
+    is_primary = models.BooleanField(default=True, verbose_name="Основная в сюжете")
+    
     class Meta:
         verbose_name = "Новость"
         verbose_name_plural = "Новости"
         ordering = ['-published_date']
         unique_together = ['url', 'source']  # Одна новость из одного источника
+        indexes = [
+            # Окно склейки по дате и постраничный вывод по курсору (published_date - префикс индекса)
+            models.Index(fields=['published_date', 'fingerprint']),
+        ]
     
     def __str__(self):
         return self.title
@@ -48,4 +97,38 @@ class News(models.Model):
         from datetime import timedelta
         from django.utils import timezone
         week_ago = timezone.now() - timedelta(days=7)
-        return self.published_date >= week_ago
\ No newline at end of file
+        return self.published_date >= week_ago
+
+
+class ArchivedNews(models.Model):
+    """
+    Новость в архиве: перенесена из горячей таблицы News при очистке,
+    заголовок и описание хранятся сжатыми (zlib)
+    """
+    original_id = models.BigIntegerField(unique=True, verbose_name="ID в таблице новостей")
+    url = models.URLField(verbose_name="Ссылка на новость")
+    source = models.ForeignKey(NewsSource, on_delete=models.CASCADE, related_name='archived_news', verbose_name="Источник")
+    published_date = models.DateTimeField(verbose_name="Дата публикации")
+    title_z = models.BinaryField(verbose_name="Заголовок (сжат)")
+    description_z = models.BinaryField(verbose_name="Описание (сжато)")
+    archived_at = models.DateTimeField(verbose_name="Архивирована")
+    
+    class Meta:
+        verbose_name = "Архивная новость"
+        verbose_name_plural = "Архив новостей"
+        ordering = ['-published_date']
+        unique_together = ['url', 'source']
+        indexes = [
+            models.Index(fields=['published_date']),
+        ]
+    
+    def __str__(self):
+        return self.title
+    
+    @property
+    def title(self):
+        return decompress_text(self.title_z)
+    
+    @property
+    def description(self):
+        return decompress_text(self.description_z)
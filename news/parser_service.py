@@ -1,20 +1,18 @@
-import sys
-import os
-from datetime import datetime, timedelta
-from django.utils import timezone
-
-# Добавляем корневую директорию в путь для импорта parser.py
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from parser import NewsParser
-from .models import News, NewsSource
+from .models import NewsSource
+from .ingest import ingest_news, resolve_sources
+from .fetchers import NewsFetcher
+from .clustering import cluster_news
+from .enrichment import enrich_descriptions
+from .archive import archive_old_news
 
 
 class NewsParserService:
     """Сервис для парсинга и сохранения новостей"""
     
-    def __init__(self):
-        self.parser = NewsParser()
+    def __init__(self, max_workers=8, fetch_leads=True):
+        self.fetcher = NewsFetcher(max_workers=max_workers)
+        self.fetch_leads = fetch_leads
+        # Источники по умолчанию: создаются, если их еще нет в базе
         self.sources_mapping = {
             'seonews.ru': 'seonews.ru',
             'vc.ru': 'vc.ru',
@@ -24,71 +22,33 @@ class NewsParserService:
             'tools.pixelplus.ru': 'tools.pixelplus.ru'
         }
     
-    def get_or_create_source(self, source_name):
-        """Получает или создает источник новостей"""
-        source, created = NewsSource.objects.get_or_create(
-            name=source_name,
-            defaults={
-                'url': f'https://{source_name}',
-                'is_active': True
-            }
-        )
-        return source
-    
     def parse_all_sources(self):
-        """Парсит все источники и сохраняет новости"""
-        # Получаем новости от парсера
-        parsed_news = self.parser.parse_all_sources()
+        """Опрашивает активные источники параллельно и сохраняет новые новости"""
+        resolve_sources(self.sources_mapping)
         
-        added_count = 0
-        total_count = len(parsed_news)
+        parsed_news = []
+        sources_status = {}
+        fetched = list(self.fetcher.fetch(NewsSource.objects.filter(is_active=True)))
+        for result in fetched:
+            sources_status[result.source.name] = result.status
+            parsed_news.extend(result.items)
         
-        for news_data in parsed_news:
-            try:
-                # Получаем источник
-                source_name = news_data.get('source', '')
-                source = self.get_or_create_source(source_name)
-                
-                # Проверяем, не существует ли уже такая новость
-                existing_news = News.objects.filter(
-                    url=news_data['url'],
-                    source=source
-                ).first()
-                
-                if existing_news:
-                    continue
-                
-                # Создаем новую новость
-                from django.utils import timezone
-                published_date = news_data['date']
-                if published_date.tzinfo is None:
-                    published_date = timezone.make_aware(published_date)
-                
-                News.objects.create(
-                    title=news_data['title'],
-                    url=news_data['url'],
-                    source=source,
-                    published_date=published_date,
-                    description=''  # Парсер не возвращает описание
-                )
-                added_count += 1
-                
-            except Exception as e:
-                print(f"Ошибка при сохранении новости: {e}")
-                continue
+        # Источники, проверка дублей и вставка - пачкой, за несколько запросов
+        result = ingest_news(parsed_news)
+        result['sources'] = sources_status
         
-        return {
-            'added': added_count,
-            'total': total_count
-        }
+        # ETag/Last-Modified - только после сохранения новостей: иначе при ошибке вставки
+        # следующий опрос получит 304 и эти новости не загрузятся уже никогда
+        for fetch_result in fetched:
+            NewsFetcher.save_state(fetch_result)
+        
+        # Описания для новостей, у которых их нет в ленте, - со страниц статей
+        result['enriched'] = enrich_descriptions(result['new_ids']) if self.fetch_leads else 0
+        
+        # Склеиваем новые новости с такими же историями из других источников
+        result['clustered'] = cluster_news(result['new_ids'])
+        return result
     
     def cleanup_old_news(self, days=30):
-        """Архивирует старые новости"""
-        cutoff_date = timezone.now() - timedelta(days=days)
-        old_news = News.objects.filter(
-            published_date__lt=cutoff_date,
-            is_archived=False
-        )
-        
-        archived_count = old_news.update(is_archived=True)
-        return archived_count
+        """Переносит старые новости в сжатый архив"""
+        return archive_old_news(days)
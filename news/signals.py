@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+
+from .cache import invalidate_news_cache
+from .models import News, NewsSource
+
+
+def connect_signals():
+    # Правка новости или источника (админка, list_editable) меняет агрегаты страницы новостей
+    for model in (News, NewsSource):
+        post_save.connect(invalidate_news_cache, sender=model, dispatch_uid=f'news_cache_save_{model.__name__}')
+        post_delete.connect(invalidate_news_cache, sender=model, dispatch_uid=f'news_cache_delete_{model.__name__}')
@@ -5,4 +5,5 @@ app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsListView.as_view(), name='news_list'),
+    path('archive/', views.ArchivedNewsListView.as_view(), name='news_archive'),
 ]
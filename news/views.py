@@ -1,22 +1,36 @@
 from django.views.generic import ListView
-from django.db.models import Q
-from .models import News, NewsSource
+from django.db.models import Q, Prefetch
+from .models import News
+from .cache import get_list_aggregates
+from .archive import search_archive
+from seo_agency.conditional import ConditionalViewMixin, make_validator, source_state
+from seo_agency.pagination import CursorPaginationMixin
 
 
-class NewsListView(ListView):
+class NewsListView(ConditionalViewMixin, CursorPaginationMixin, ListView):
     """Список всех новостей"""
     model = News
     template_name = 'news/news_list.html'
     context_object_name = 'news_list'
     paginate_by = 12
+    # Параметры, при которых список отличается от основного (одна карточка на сюжет)
+    filter_params = ('source', 'search', 'featured', 'recent')
     
     def get_queryset(self):
         queryset = News.objects.filter(is_archived=False).select_related('source')
         
-        # Фильтрация по источнику
+        # Фильтрация по источнику; без фильтра - одна карточка на сюжет
         source_id = self.request.GET.get('source')
         if source_id:
             queryset = queryset.filter(source_id=source_id)
+        else:
+            queryset = queryset.filter(is_primary=True).select_related('cluster').prefetch_related(
+                Prefetch(
+                    'cluster__news',
+                    queryset=News.objects.select_related('source').only('id', 'url', 'cluster_id', 'source__name').order_by('published_date'),
+                    to_attr='cluster_items'
+                )
+            )
         
         # Поиск
         search = self.request.GET.get('search')
@@ -47,21 +61,41 @@ class NewsListView(ListView):
         
         return queryset
     
+    def get_validator(self, request, *args, **kwargs):
+        # Время сборки кэша агрегатов - версия статистики и рекомендуемых; число новостей и
+        # последний updated_at - на случай записи, после которой кэш не сбросили (update(), SQL)
+        built_at = get_list_aggregates()['built_at']
+        [(count, last_updated)] = source_state([News.objects.filter(is_archived=False)])
+        last_modified = max(built_at, last_updated) if last_updated else built_at
+        return make_validator(request, (built_at.isoformat(), count, last_updated), last_modified)
+    
+    def get_cursor_count(self, queryset):
+        # Без фильтров число карточек уже посчитано в кэшированной статистике - COUNT не нужен
+        if not any(self.request.GET.get(param) for param in self.filter_params):
+            return get_list_aggregates()['stats']['primary_news']
+        return super().get_cursor_count(queryset)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['sources'] = NewsSource.objects.filter(is_active=True)
-        context['featured_news'] = News.objects.filter(is_featured=True, is_archived=False)[:6]
-        
-        # Статистика
-        from datetime import timedelta
-        from django.utils import timezone
-        week_ago = timezone.now() - timedelta(days=7)
-        
-        context['stats'] = {
-            'total_news': News.objects.filter(is_archived=False).count(),
-            'recent_news': News.objects.filter(published_date__gte=week_ago, is_archived=False).count(),
-            'featured_news': News.objects.filter(is_featured=True, is_archived=False).count(),
-        }
-        
+        # Статистика, источники и рекомендуемые - из кэша, пересчитываются после сбора и правок
+        context.update(get_list_aggregates())
         return context
 
+
+class ArchivedNewsListView(ListView):
+    """Поиск по архиву новостей"""
+    template_name = 'news/news_archive.html'
+    context_object_name = 'news_list'
+    paginate_by = 20
+    
+    def get_queryset(self):
+        queryset = search_archive(self.request.GET.get('search', '').strip())
+        source_id = self.request.GET.get('source')
+        if source_id:
+            queryset = queryset.filter(source_id=source_id)
+        return queryset
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['sources'] = get_list_aggregates()['sources']
+        return context
@@ -0,0 +1,172 @@
+"""
+Готовые архивы файлов проекта.
+
+Архив со всеми файлами и изображениями проекта собирается один раз в
+фоновом потоке после изменения ProjectContent и лежит в media
+(projects/archives/<id проекта>-<хэш>.zip). Хэш - от манифеста содержимого:
+имена файлов, размеры и время изменения, поэтому любое изменение файлов дает
+новое имя архива, а скачивание отдает готовый файл, только если он собран
+ровно по текущим файлам. Пока архива нет (сборка идет или файлы поменяли в
+обход моделей), архив отдается потоком, как раньше, и сборка запускается.
+
+Архив пишется во временный файл и переименовывается атомарно: скачивание
+никогда не увидит недописанный архив. Повторные изменения во время сборки
+одного проекта не запускают параллельные сборки - после текущей выполняется
+еще одна.
+"""
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from seo_agency.streaming import stream_zip
+
+from .models import Project
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = 'projects/archives'
+
+_lock = threading.Lock()
+_building = set()
+_pending = set()
+
+
+def archive_entries(project):
+    """Пары (путь, имя в архиве) для файлов и изображений проекта"""
+    contents = project.contents.filter(content_type__in=['file', 'image']).order_by('created_at', 'pk')
+    entries = []
+    for content in contents.iterator():
+        field = content.file if content.content_type == 'file' else content.image
+        if field:
+            entries.append((field.path, field.name))
+    return entries
+
+
+def content_manifest(entries):
+    """Имя, размер и время изменения каждого файла, который есть на диске"""
+    manifest = []
+    for path, name in entries:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        manifest.append((name, stat.st_size, stat.st_mtime_ns))
+    return manifest
+
+
+def manifest_hash(manifest):
+    return hashlib.sha256(repr(manifest).encode()).hexdigest()[:32]
+
+
+def _archive_dir():
+    return os.path.join(settings.MEDIA_ROOT, ARCHIVE_DIR)
+
+
+def archive_path(project_id, digest):
+    return os.path.join(_archive_dir(), f'{project_id}-{digest}.zip')
+
+
+def current_archive(project):
+    """(entries, хэш текущих файлов, путь к готовому архиву или None, если его еще нет)"""
+    entries = archive_entries(project)
+    digest = manifest_hash(content_manifest(entries))
+    path = archive_path(project.pk, digest)
+    return entries, digest, path if os.path.isfile(path) else None
+
+
+def remove_archives(project_id, keep=None):
+    for path in glob.glob(os.path.join(_archive_dir(), f'{project_id}-*.zip')):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def build_archive(project_id):
+    """Собирает архив проекта, если его нет для текущих файлов; старые архивы проекта удаляются"""
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        remove_archives(project_id)
+        return None
+
+    entries = archive_entries(project)
+    manifest = content_manifest(entries)
+    path = archive_path(project_id, manifest_hash(manifest))
+    if os.path.isfile(path):
+        remove_archives(project_id, keep=path)
+        return path
+    if not manifest:
+        remove_archives(project_id)
+        return None
+
+    os.makedirs(_archive_dir(), exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=_archive_dir())
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            for chunk in stream_zip(entries):
+                file.write(chunk)
+        # Файл поменяли во время сборки - архив не соответствует хэшу, его соберет следующий запуск
+        if content_manifest(entries) != manifest:
+            os.remove(temp_path)
+            return None
+        # mkstemp создает файл только для владельца, а media может отдавать и веб-сервер
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    remove_archives(project_id, keep=path)
+    return path
+
+
+def _build_in_thread(project_id):
+    try:
+        while True:
+            try:
+                build_archive(project_id)
+            except Exception:
+                logger.exception('Ошибка сборки архива проекта %s', project_id)
+            with _lock:
+                if project_id in _pending:
+                    _pending.discard(project_id)
+                    continue
+                _building.discard(project_id)
+                return
+    finally:
+        connection.close()
+
+
+def build_archive_in_background(project_id):
+    """Запускает сборку в фоновом потоке веб-процесса; если она уже идет - повторяет после нее"""
+    with _lock:
+        if project_id in _building:
+            _pending.add(project_id)
+            return None
+        _building.add(project_id)
+    thread = threading.Thread(target=_build_in_thread, args=(project_id,), name=f'project-archive-{project_id}', daemon=True)
+    thread.start()
+    return thread
+
+
+def schedule_archive_build(project_id):
+    """Сборка после фиксации транзакции - поток должен видеть сохраненный контент"""
+    transaction.on_commit(lambda: build_archive_in_background(project_id))
+
+
+def content_changed(sender, instance, **kwargs):
+    schedule_archive_build(instance.project_id)
+
+
+def project_deleted(sender, instance, **kwargs):
+    # После удаления у instance уже не будет pk
+    project_id = instance.pk
+    transaction.on_commit(lambda: remove_archives(project_id))
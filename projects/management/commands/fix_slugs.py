@@ -1,25 +1,49 @@
 from django.core.management.base import BaseCommand
-from django.utils.text import slugify
+from django.db import transaction
+from django.db.models import Q
 from projects.models import Project
+from projects.slugs import assign_slugs
 
 
 class Command(BaseCommand):
-    help = 'Исправляет пустые slug у проектов'
+    help = 'Исправляет пустые slug у проектов и slug, от которых осталось только "-N" (кириллица без транслита)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Пересоздать slug всех проектов из названий')
 
     def handle(self, *args, **options):
-        # Находим все проекты с пустыми slug
-        projects_with_empty_slug = Project.objects.filter(slug='')
-        
-        self.stdout.write(f'Найдено проектов с пустыми slug: {projects_with_empty_slug.count()}')
-        
-        for project in projects_with_empty_slug:
-            old_slug = project.slug
-            project.slug = slugify(project.name)
-            project.save()
+        if options['all']:
+            projects = Project.objects.all()
+        else:
+            # Находим проекты с пустыми slug или вида "-1", "-2"
+            projects = Project.objects.filter(Q(slug='') | Q(slug__startswith='-'))
+        # Старые проекты первыми: базовый slug остается у старейшего, суффиксы "-N" - у новых
+        projects = list(projects.order_by('created_at', 'pk'))
+
+        self.stdout.write(f'Найдено проектов для исправления: {len(projects)}')
+        if not projects:
+            return
+
+        old_slugs = {project.pk: project.slug for project in projects}
+        assign_slugs(projects)
+        changed = [project for project in projects if project.slug != old_slugs[project.pk]]
+
+        if changed:
+            new_slugs = {project.pk: project.slug for project in changed}
+            # В два прохода: если проекты меняются slug между собой, один UPDATE нарушил бы уникальность
+            with transaction.atomic():
+                for project in changed:
+                    project.slug = f'~{project.pk}'
+                Project.objects.bulk_update(changed, ['slug'], batch_size=500)
+                for project in changed:
+                    project.slug = new_slugs[project.pk]
+                Project.objects.bulk_update(changed, ['slug'], batch_size=500)
+
+        for project in changed:
             self.stdout.write(
                 self.style.SUCCESS(f'Исправлен проект: "{project.name}" -> slug: "{project.slug}"')
             )
-        
+
         self.stdout.write(
-            self.style.SUCCESS(f'Исправлено {projects_with_empty_slug.count()} проектов!')
+            self.style.SUCCESS(f'Исправлено {len(changed)} проектов!')
         )
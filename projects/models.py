@@ -1,6 +1,6 @@
 from django.db import models
-from django.utils.text import slugify
 from django.urls import reverse
+from .slugs import unique_slug
 
 
 class Project(models.Model):
@@ -29,15 +29,9 @@ class Project(models.Model):
         ordering = ['-created_at']
     
     def save(self, *args, **kwargs):
-        if not self.slug or self.slug == '':
-            base_slug = slugify(self.name)
-            self.slug = base_slug
-            
-            # Проверяем уникальность slug и добавляем число если нужно
-            counter = 1
-            while Project.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{base_slug}-{counter}"
-                counter += 1
+        if not self.slug:
+            # Транслит названия; занятые варианты читаются одним запросом
+            self.slug = unique_slug(self, self.name)
         
         super().save(*args, **kwargs)
     
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+
+from .archives import content_changed, project_deleted
+from .models import Project, ProjectContent
+
+
+def connect_signals():
+    # Готовый архив проекта пересобирается после любой правки его контента
+    post_save.connect(content_changed, sender=ProjectContent, dispatch_uid='project_archive_content_save')
+    post_delete.connect(content_changed, sender=ProjectContent, dispatch_uid='project_archive_content_delete')
+    post_delete.connect(project_deleted, sender=Project, dispatch_uid='project_archive_project_delete')
@@ -0,0 +1,90 @@
+"""
+Уникальные slug с транслитерацией кириллицы.
+
+Занятые slug читаются одним запросом, свободный суффикс (-1, -2, ...)
+подбирается в памяти, поэтому проверка уникальности не зависит от того,
+сколько похожих названий уже есть в базе.
+"""
+from django.db.models import Q
+
+from tools.translit_parser import TranslitParser
+
+
+SLUG_FALLBACK = 'project'
+# Место под суффикс вида "-12345"
+SUFFIX_RESERVE = 6
+# Оснований slug в одном запросе занятых вариантов
+PREFIX_BATCH_SIZE = 200
+
+_parser = TranslitParser('yandex')
+
+
+def make_base_slug(text, max_length=50, fallback=SLUG_FALLBACK):
+    """slug из названия: транслит, только латиница, цифры и тире"""
+    slug = _parser.slugify(text)[:max_length].strip('-')
+    return slug or fallback
+
+
+def next_free_slug(base, taken, max_length=50):
+    """Первый свободный вариант base, base-1, base-2, ... из множества занятых"""
+    if base not in taken:
+        return base
+    counter = 1
+    while True:
+        suffix = f'-{counter}'
+        candidate = base[:max_length - len(suffix)].rstrip('-') + suffix
+        if candidate not in taken:
+            return candidate
+        counter += 1
+
+
+def _slug_max_length(model, field):
+    return model._meta.get_field(field).max_length or 50
+
+
+def unique_slug(instance, text, field='slug', fallback=SLUG_FALLBACK):
+    """Уникальный slug для одного объекта (один запрос к базе)"""
+    model = type(instance)
+    max_length = _slug_max_length(model, field)
+    base = make_base_slug(text, max_length, fallback)
+
+    queryset = model._default_manager.filter(**{f'{field}__startswith': base[:max_length - SUFFIX_RESERVE]})
+    if instance.pk:
+        queryset = queryset.exclude(pk=instance.pk)
+    taken = set(queryset.values_list(field, flat=True))
+    return next_free_slug(base, taken, max_length)
+
+
+def assign_slugs(instances, source='name', field='slug', fallback=SLUG_FALLBACK):
+    """
+    Назначает уникальные slug списку объектов одной модели.
+
+    Занятые slug с теми же началами, что и у новых, читаются одним запросом
+    на порцию оснований, дальше уникальность проверяется в памяти. Объекты
+    после этого можно сохранить через bulk_create/bulk_update.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+
+    model = type(instances[0])
+    max_length = _slug_max_length(model, field)
+    bases = [
+        base[:max_length].strip('-') or fallback
+        for base in _parser.slugify_many([getattr(instance, source) for instance in instances])
+    ]
+
+    own_pks = [instance.pk for instance in instances if instance.pk]
+    prefixes = sorted({base[:max_length - SUFFIX_RESERVE] for base in bases})
+    taken = set()
+    for start in range(0, len(prefixes), PREFIX_BATCH_SIZE):
+        condition = Q()
+        for prefix in prefixes[start:start + PREFIX_BATCH_SIZE]:
+            condition |= Q(**{f'{field}__startswith': prefix})
+        taken.update(model._default_manager.filter(condition).exclude(pk__in=own_pks).order_by().values_list(field, flat=True))
+
+    for instance, base in zip(instances, bases):
+        slug = next_free_slug(base, taken, max_length)
+        setattr(instance, field, slug)
+        taken.add(slug)
+    return instances
@@ -1,22 +1,27 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, Http404, FileResponse
+from django.http import HttpResponse, Http404, FileResponse, StreamingHttpResponse
 from django.views.generic import ListView, DetailView
 from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.contrib import messages
 import os
-import zipfile
 from django.conf import settings
+from seo_agency.conditional import ConditionalViewMixin
+from seo_agency.streaming import ZIP_CONTENT_TYPE, ranged_file_response, stream_zip
+from .archives import build_archive_in_background, current_archive
 from .models import Project, ProjectContent
 from .forms import MultipleFileUploadForm
 
 
-class ProjectListView(ListView):
+class ProjectListView(ConditionalViewMixin, ListView):
     model = Project
     template_name = 'projects/project_list.html'
     context_object_name = 'projects'
     paginate_by = 10
     
+    def get_conditional_sources(self):
+        return [Project.objects.all()]
+    
     def get_queryset(self):
         queryset = Project.objects.all()
         
@@ -116,34 +121,22 @@ class ProjectDetailView(DetailView):
 
 
 def project_download_all(request, slug):
-    """Скачать все файлы проекта одним архивом"""
+    """Скачать все файлы проекта одним архивом: готовый архив из media или сборка на лету"""
     project = get_object_or_404(Project, slug=slug)
+    entries, digest, archive = current_archive(project)
+    filename = f'{project.slug}.zip'
     
-    # Создаем временный ZIP файл
-    import tempfile
-    import io
-    
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Добавляем файлы
-        for content in project.contents.filter(content_type='file'):
-            if content.file:
-                file_path = content.file.path
-                if os.path.exists(file_path):
-                    zip_file.write(file_path, content.file.name)
-        
-        # Добавляем изображения
-        for content in project.contents.filter(content_type='image'):
-            if content.image:
-                image_path = content.image.path
-                if os.path.exists(image_path):
-                    zip_file.write(image_path, content.image.name)
-    
-    zip_buffer.seek(0)
+    if archive:
+        try:
+            return ranged_file_response(request, archive, ZIP_CONTENT_TYPE, filename, digest)
+        except FileNotFoundError:
+            pass  # архив удалила параллельная пересборка
     
-    response = HttpResponse(zip_buffer.read(), content_type='application/zip')
-    response['Content-Disposition'] = f'attachment; filename="{project.slug}.zip"'
+    # Архива по текущим файлам нет - отдаем потоком и собираем его для следующих скачиваний
+    if entries:
+        build_archive_in_background(project.pk)
+    response = StreamingHttpResponse(stream_zip(entries), content_type=ZIP_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
     return response
 
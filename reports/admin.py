@@ -1,7 +1,11 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html
-from .models import WorkReport
-from .forms import WorkReportForm
+from .models import WorkReport, DailyProjectTime
+from .forms import WorkReportForm, WorkReportImportForm
+from .importer import import_reports
 
 
 @admin.register(WorkReport)
@@ -36,4 +40,47 @@ class WorkReportAdmin(admin.ModelAdmin):
     work_description_short.short_description = 'Описание работы'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related()
\ No newline at end of file
+        return super().get_queryset(request).select_related()
+    
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='reports_workreport_import'),
+        ]
+        return urls + super().get_urls()
+    
+    def import_view(self, request):
+        """Загрузка отчетов из CSV/XLSX с отчетом об ошибках по строкам"""
+        if not self.has_add_permission(request):
+            return redirect('admin:reports_workreport_changelist')
+        
+        result = None
+        form = WorkReportImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            result = import_reports(form.cleaned_data['file'])
+            if result.created:
+                messages.success(request, f'Импортировано отчетов: {result.created}')
+            if result.errors:
+                messages.warning(request, f'Строк с ошибками: {result.failed} - они не сохранены')
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Импорт отчетов из файла',
+            'form': form,
+            'result': result,
+            # Страницу с десятками тысяч ошибок не показываем целиком
+            'errors': result.errors[:500] if result else [],
+        }
+        return TemplateResponse(request, 'admin/reports/workreport/import.html', context)
+
+
+@admin.register(DailyProjectTime)
+class DailyProjectTimeAdmin(admin.ModelAdmin):
+    list_display = ('date', 'project_name', 'project', 'total_time', 'reports_count')
+    list_filter = ('date', 'project')
+    date_hierarchy = 'date'
+    ordering = ['-date', 'project_name']
+    readonly_fields = ('date', 'project', 'project_name', 'total_time', 'reports_count')
+    
+    def has_add_permission(self, request):
+        return False
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        from .signals import connect_signals
+
+        # Сводки времени по дням обновляются вместе с отчетами
+        connect_signals()
@@ -0,0 +1,134 @@
+from datetime import date, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+
+DATE_CHOICES = [
+    ('', 'Все даты'),
+    ('today', 'Сегодня'),
+    ('week', 'За неделю'),
+    ('month', 'За месяц'),
+    ('year', 'За год'),
+    ('custom', 'Выбрать период'),
+]
+
+PROJECT_STATUS_CHOICES = [
+    ('', 'Все статусы'),
+    ('in_progress', 'В работе'),
+    ('ready', 'Готов'),
+    ('archive', 'Архив'),
+]
+
+# Период "date" -> сколько дней назад он начинается
+DATE_PERIODS = {
+    'today': 0,
+    'week': 7,
+    'month': 30,
+    'year': 365,
+}
+
+
+class ReportFilter:
+    """
+    Фильтры списка отчетов из GET-параметров - общие для списка, экспорта и
+    табеля. Параметры разбираются один раз: неверные даты и id проекта не
+    попадают в запрос, а сообщения о них лежат в errors.
+
+    Применяется и к WorkReport, и к сводкам DailyProjectTime - у них
+    одинаковые поля даты и проекта; поиска по описанию работы у сводок нет.
+    Все условия по дате - диапазон date >= / <=: без проекта он идет по
+    индексам, начинающимся с date ((date, created_at), (date, project)), а с
+    проектом - по (project, date), где диапазон дат идет после равенства по
+    проекту.
+    """
+
+    def __init__(self, params):
+        self.errors = []
+        self.period = params.get('date', '') if params.get('date', '') in dict(DATE_CHOICES) else ''
+        self.date_from = self._parse_date(params.get('date_from', ''), 'Дата "от"')
+        self.date_to = self._parse_date(params.get('date_to', ''), 'Дата "до"')
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            self.errors.append('Дата "от" позже даты "до" - период не применен')
+            self.date_from = self.date_to = None
+        self.project_query = params.get('project', '').strip()
+        self.project_id = self._parse_id(params.get('project_select', ''))
+        self.project_status = params.get('project_status', '') if params.get('project_status', '') in dict(PROJECT_STATUS_CHOICES) else ''
+        self.search = params.get('search', '').strip()
+
+    def _parse_date(self, value, label):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            self.errors.append(f'{label}: неверный формат даты "{value}", ожидается ГГГГ-ММ-ДД')
+            return None
+
+    def _parse_id(self, value):
+        if not value:
+            return None
+        if not value.isdigit():
+            self.errors.append(f'Неверный проект: "{value}"')
+            return None
+        return int(value)
+
+    @property
+    def date_range(self):
+        """(начало, конец) по всем условиям на дату; None - без ограничения"""
+        start, end = self.date_from, self.date_to
+        if self.period in DATE_PERIODS:
+            today = timezone.now().date()
+            period_start = today - timedelta(days=DATE_PERIODS[self.period])
+            start = max(start, period_start) if start else period_start
+            if self.period == 'today':
+                end = min(end, today) if end else today
+        return start, end
+
+    def apply(self, queryset, search=True):
+        start, end = self.date_range
+        if start:
+            queryset = queryset.filter(date__gte=start)
+        if end:
+            queryset = queryset.filter(date__lte=end)
+
+        # Фильтр по проекту (старый способ для совместимости)
+        if self.project_query:
+            queryset = queryset.filter(
+                Q(project__name__icontains=self.project_query) |
+                Q(project_name__icontains=self.project_query)
+            )
+
+        if self.project_id:
+            queryset = queryset.filter(project_id=self.project_id)
+
+        if self.project_status:
+            queryset = queryset.filter(project__status=self.project_status)
+
+        # Поиск по названию проекта и описанию работы
+        if self.search and search:
+            queryset = queryset.filter(
+                Q(project__name__icontains=self.search) |
+                Q(project_name__icontains=self.search) |
+                Q(work_description__icontains=self.search)
+            )
+
+        return queryset
+
+    def context(self):
+        """Значения и варианты для формы фильтров (шаблон reports/report_filters.html)"""
+        from projects.models import Project
+
+        return {
+            'date_choices': DATE_CHOICES,
+            'current_date_filter': self.period,
+            'current_date_from': self.date_from.isoformat() if self.date_from else '',
+            'current_date_to': self.date_to.isoformat() if self.date_to else '',
+            'current_project_filter': self.project_query,
+            'current_search': self.search,
+            'selected_project': self.project_id,
+            'selected_project_status': self.project_status,
+            'projects': Project.objects.all().order_by('name'),
+            'project_status_choices': PROJECT_STATUS_CHOICES,
+            'filter_errors': self.errors,
+        }
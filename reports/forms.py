@@ -58,3 +58,17 @@ class WorkReportForm(forms.ModelForm):
         if commit:
             instance.save()
         return instance
+
+
+class WorkReportImportForm(forms.Form):
+    file = forms.FileField(
+        label='Файл CSV или XLSX',
+        help_text='Колонки: Дата, Проект, Ссылка, Описание работы, Время - как в выгрузке в Excel',
+    )
+    
+    def clean_file(self):
+        from .importer import IMPORT_EXTENSIONS
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(IMPORT_EXTENSIONS):
+            raise ValidationError('Поддерживаются только файлы CSV и XLSX')
+        return upload
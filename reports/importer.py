@@ -0,0 +1,251 @@
+"""
+Массовый импорт отчетов о работе из CSV и XLSX.
+
+Файл читается построчно (openpyxl в режиме read_only, CSV - потоковым
+reader), проекты сопоставляются по названию через один заранее загруженный
+словарь, строки проверяются порциями по batch_size. Каждая порция - один
+bulk_create в своей транзакции вместе с изменениями сводок DailyProjectTime
+за эту порцию: если импорт прервется (например, запрос убит по таймауту),
+сохраненные отчеты и сводки не разойдутся. Строки с ошибками не сохраняются
+и попадают в отчет с номером строки файла.
+
+Колонки - как в выгрузке отчетов в Excel: Дата, Проект, Ссылка, Описание
+работы, Время, поэтому выгруженный файл можно загрузить обратно.
+"""
+import csv
+import re
+from datetime import date, datetime, time, timedelta
+from io import TextIOWrapper
+from zipfile import BadZipFile
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+
+from projects.models import Project
+
+from .models import WorkReport
+from .rollups import apply_deltas, report_deltas
+
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+IMPORT_BATCH_SIZE = 5000
+
+# Колонка -> варианты заголовка (без учета регистра)
+IMPORT_COLUMNS = {
+    'date': ('дата', 'date'),
+    'project': ('проект', 'project'),
+    'url': ('ссылка', 'url', 'ссылка на проект'),
+    'description': ('описание работы', 'описание', 'description'),
+    'time': ('время', 'time', 'потрачено времени'),
+}
+REQUIRED_COLUMNS = ('date', 'project', 'description', 'time')
+
+DURATION_RE = re.compile(r'^(?:(\d+) days?, )?(\d+):(\d{1,2})(?::(\d{1,2}))?$')
+HOURS_RE = re.compile(r'^\d+(?:[.,]\d+)?$')
+HOURS_MINUTES_RE = re.compile(r'^(?:(\d+)\s*ч)?\s*(?:(\d+)\s*м)?$')
+
+_validate_url = URLValidator()
+
+
+class ImportResult:
+    """Итог импорта: сколько отчетов создано и ошибки по строкам [(номер строки, текст)]"""
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+
+def iter_upload_rows(upload, name=None):
+    """Строки файла (списки значений ячеек) по одной: XLSX - первый лист, CSV - с определением разделителя"""
+    name = (name or upload.name).lower()
+    file = getattr(upload, 'file', upload)
+
+    if name.endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+
+    lines = TextIOWrapper(file, encoding='utf-8-sig', errors='replace', newline='')
+    first = next(lines, '')
+    delimiter = max(',;\t', key=first.count) if any(d in first for d in ',;\t') else ','
+
+    def all_lines():
+        yield first
+        yield from lines
+
+    yield from csv.reader(all_lines(), delimiter=delimiter)
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = _text(value)
+    # ДД.ММ.ГГГГ разбирается вручную: strptime заметно медленнее на сотнях тысяч строк
+    parts = text.split('.')
+    try:
+        if len(parts) == 3 and len(parts[2]) == 4:
+            return date(int(parts[2]), int(parts[1]), int(parts[0]))
+        return date.fromisoformat(text)
+    except ValueError:
+        pass
+    raise ValueError(f'неверная дата "{text}", ожидается ДД.ММ.ГГГГ или ГГГГ-ММ-ДД')
+
+
+def parse_duration(value):
+    """Время работы: 1:30:00 (как в выгрузке), 1:30, 1,5 (часы), 1ч 30м или время/число из ячейки Excel"""
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, time):
+        return timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return timedelta(hours=value)
+
+    text = _text(value)
+    match = DURATION_RE.match(text)
+    if match:
+        days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+    if HOURS_RE.match(text):
+        return timedelta(hours=float(text.replace(',', '.')))
+    match = HOURS_MINUTES_RE.match(text)
+    if text and match:
+        return timedelta(hours=int(match.group(1) or 0), minutes=int(match.group(2) or 0))
+    raise ValueError(f'неверное время "{text}", ожидается Ч:ММ, часы числом или "1ч 30м"')
+
+
+def _column_positions(header):
+    names = [_text(value).lower() for value in header]
+    positions = {}
+    for column, aliases in IMPORT_COLUMNS.items():
+        for index, name in enumerate(names):
+            if name in aliases:
+                positions[column] = index
+                break
+    missing = [IMPORT_COLUMNS[column][0] for column in REQUIRED_COLUMNS if column not in positions]
+    if missing:
+        raise ValueError(f'В первой строке нет колонок: {", ".join(missing)}')
+    return positions
+
+
+class ReportImporter:
+    """Проверка строк и запись порциями; projects - {название в нижнем регистре: (id, ссылка)}"""
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.projects = {
+            name.strip().lower(): (project_id, project_url)
+            for project_id, name, project_url in Project.objects.values_list('id', 'name', 'project_url')
+        }
+        # Ссылки повторяются (ссылка проекта подставляется в каждую его строку) - проверяем каждую один раз
+        self.valid_urls = set()
+        self.name_length = WorkReport._meta.get_field('project_name').max_length
+        self.url_length = WorkReport._meta.get_field('project_url').max_length
+
+    def build_report(self, row, positions):
+        """WorkReport из строки файла или ValueError с текстом ошибки"""
+        def cell(column):
+            index = positions.get(column)
+            return row[index] if index is not None and index < len(row) else None
+
+        report_date = parse_date(cell('date'))
+        time_spent = parse_duration(cell('time'))
+        if time_spent <= timedelta():
+            raise ValueError('время должно быть больше нуля')
+        description = _text(cell('description'))
+        if not description:
+            raise ValueError('не заполнено описание работы')
+
+        project_title = _text(cell('project'))
+        if not project_title:
+            raise ValueError('не указан проект')
+        project_id, project_url = self.projects.get(project_title.lower(), (None, ''))
+        if project_id is None and len(project_title) > self.name_length:
+            raise ValueError(f'название проекта длиннее {self.name_length} символов')
+
+        url = _text(cell('url')) or project_url or ''
+        if url and url not in self.valid_urls:
+            try:
+                _validate_url(url)
+            except ValidationError:
+                raise ValueError(f'неверная ссылка "{url}"')
+            if len(url) > self.url_length:
+                raise ValueError(f'ссылка длиннее {self.url_length} символов')
+            self.valid_urls.add(url)
+
+        return WorkReport(
+            project_id=project_id,
+            project_name='' if project_id else project_title,
+            project_url=url,
+            work_description=description,
+            time_spent=time_spent,
+            date=report_date,
+        )
+
+    def save_batch(self, reports):
+        if self.dry_run or not reports:
+            return
+        with transaction.atomic():
+            WorkReport.objects.bulk_create(reports)
+            apply_deltas(report_deltas(reports))
+
+    def run(self, rows):
+        result = ImportResult()
+        rows = iter(rows)
+        try:
+            header = next(rows, None)
+            if header is None:
+                result.errors.append((1, 'Файл пустой'))
+                return result
+            try:
+                positions = _column_positions(header)
+            except ValueError as error:
+                result.errors.append((1, str(error)))
+                return result
+            self.save_rows(rows, positions, result)
+        except (BadZipFile, InvalidFileException) as error:
+            # Поврежденный или переименованный XLSX - openpyxl не может его открыть
+            result.errors.append((1, f'Файл не читается как XLSX: {error}'))
+        return result
+
+    def save_rows(self, rows, positions, result):
+        batch = []
+        for line, row in enumerate(rows, start=2):
+            if not any(_text(value) for value in row):
+                continue
+            # Строка итогов из выгрузки
+            if _text(row[0]).upper().startswith('ИТОГО'):
+                continue
+            try:
+                batch.append(self.build_report(row, positions))
+            except (ValueError, OverflowError) as error:
+                result.errors.append((line, str(error)))
+                continue
+            if len(batch) >= self.batch_size:
+                self.save_batch(batch)
+                result.created += len(batch)
+                batch = []
+
+        self.save_batch(batch)
+        result.created += len(batch)
+
+
+def import_reports(upload, name=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Импорт отчетов из загруженного или открытого (в двоичном режиме) файла CSV/XLSX"""
+    return ReportImporter(batch_size=batch_size, dry_run=dry_run).run(iter_upload_rows(upload, name))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from reports.importer import IMPORT_BATCH_SIZE, IMPORT_EXTENSIONS, import_reports
+
+
+class Command(BaseCommand):
+    help = 'Импортирует отчеты о работе из файла CSV или XLSX (колонки как в выгрузке в Excel)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу .csv или .xlsx')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Строк в одной транзакции')
+        parser.add_argument('--dry-run', action='store_true', help='Только проверить строки, ничего не сохранять')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path.lower().endswith(IMPORT_EXTENSIONS):
+            raise CommandError('Поддерживаются только файлы CSV и XLSX')
+        try:
+            with open(path, 'rb') as file:
+                result = import_reports(file, name=path, batch_size=options['batch_size'], dry_run=options['dry_run'])
+        except OSError as error:
+            raise CommandError(f'Не удалось прочитать файл: {error}')
+
+        for line, message in result.errors:
+            self.stderr.write(f'Строка {line}: {message}')
+        verb = 'Проверено без ошибок' if options['dry_run'] else 'Импортировано'
+        self.stdout.write(self.style.SUCCESS(f'Готово! {verb}: {result.created}, строк с ошибками: {result.failed}'))
@@ -0,0 +1,16 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from reports.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сводки времени по проектам за день из отчетов о работе'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help='Начало периода (ГГГГ-ММ-ДД)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help='Конец периода (ГГГГ-ММ-ДД)')
+
+    def handle(self, *args, **options):
+        created = rebuild_rollups(options['date_from'], options['date_to'])
+        self.stdout.write(self.style.SUCCESS(f'Готово! Строк сводки: {created}'))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:31
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_rollups(apps, schema_editor):
+    """Сводки по уже существующим отчетам"""
+    WorkReport = apps.get_model('reports', 'WorkReport')
+    DailyProjectTime = apps.get_model('reports', 'DailyProjectTime')
+    rows = (
+        WorkReport.objects.order_by()
+        .values('date', 'project_id', 'project_name')
+        .annotate(total_time=models.Sum('time_spent'), reports_count=models.Count('id'))
+    )
+    DailyProjectTime.objects.bulk_create([DailyProjectTime(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_projectcontent_file_and_more'),
+        ('reports', '0002_workreport_project_alter_workreport_project_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProjectTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('project_name', models.CharField(blank=True, max_length=200, verbose_name='Название проекта')),
+                ('total_time', models.DurationField(default=datetime.timedelta, verbose_name='Всего времени')),
+                ('reports_count', models.PositiveIntegerField(default=0, verbose_name='Отчетов')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='projects.project', verbose_name='Проект')),
+            ],
+            options={
+                'verbose_name': 'Время по проекту за день',
+                'verbose_name_plural': 'Время по проектам за день',
+                'ordering': ['-date', 'project_name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyprojecttime',
+            constraint=models.UniqueConstraint(fields=('date', 'project', 'project_name'), name='reports_daily_project_time_unique'),
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_daily_project_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workreport',
+            index=models.Index(fields=['date', 'project'], name='reports_date_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workreport',
+            index=models.Index(fields=['project', 'date'], name='reports_project_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workreport',
+            index=models.Index(fields=['created_at'], name='reports_created_at_idx'),
+        ),
+    ]
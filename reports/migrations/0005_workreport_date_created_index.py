@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_workreport_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workreport',
+            index=models.Index(fields=['date', 'created_at'], name='reports_date_created_idx'),
+        ),
+    ]
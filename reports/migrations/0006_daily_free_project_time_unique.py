@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:12
+
+from django.db import migrations, models
+
+
+def merge_duplicates(apps, schema_editor):
+    """Склеивает повторяющиеся сводки отчетов без проекта - иначе ограничение не создать"""
+    DailyProjectTime = apps.get_model('reports', 'DailyProjectTime')
+    duplicates = (
+        DailyProjectTime.objects.filter(project__isnull=True).order_by()
+        .values('date', 'project_name')
+        .annotate(rows=models.Count('id'), total=models.Sum('total_time'), count=models.Sum('reports_count'), keep=models.Min('id'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        same = DailyProjectTime.objects.filter(project__isnull=True, date=row['date'], project_name=row['project_name'])
+        same.exclude(id=row['keep']).delete()
+        same.filter(id=row['keep']).update(total_time=row['total'], reports_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_workreport_date_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailyprojecttime',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('date', 'project_name'), name='reports_daily_free_project_time_unique'),
+        ),
+    ]
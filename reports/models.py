@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
+from datetime import timedelta
 
 
 class WorkReport(models.Model):
@@ -15,11 +17,28 @@ class WorkReport(models.Model):
         verbose_name = 'Отчет о работе'
         verbose_name_plural = 'Отчеты о работе'
         ordering = ['-date', '-created_at']
+        indexes = [
+            # Фильтры списка и экспорта: период по всем проектам и период по одному проекту
+            models.Index(fields=['date', 'project'], name='reports_date_project_idx'),
+            models.Index(fields=['project', 'date'], name='reports_project_date_idx'),
+            models.Index(fields=['created_at'], name='reports_created_at_idx'),
+            # Постраничный вывод по курсору в порядке списка (-date, -created_at)
+            models.Index(fields=['date', 'created_at'], name='reports_date_created_idx'),
+        ]
     
     def __str__(self):
         project_name = self.get_project_name()
         return f"{self.date} - {project_name} ({self.time_spent})"
     
+    def save(self, *args, **kwargs):
+        # Отчет и сводка времени за день (обновляется сигналами) меняются в одной транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
     def get_project_name(self):
         """Возвращает название проекта"""
         if self.project:
@@ -35,4 +54,29 @@ class WorkReport(models.Model):
         if hours > 0:
             return f"{hours}ч {minutes}м"
         else:
-            return f"{minutes}м"
\ No newline at end of file
+            return f"{minutes}м"
+
+
+class DailyProjectTime(models.Model):
+    """Сводка времени за день по проекту: поддерживается сигналами WorkReport"""
+    date = models.DateField(verbose_name='Дата')
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, null=True, blank=True, verbose_name='Проект')
+    project_name = models.CharField(max_length=200, blank=True, verbose_name='Название проекта')
+    total_time = models.DurationField(default=timedelta, verbose_name='Всего времени')
+    reports_count = models.PositiveIntegerField(default=0, verbose_name='Отчетов')
+    
+    class Meta:
+        verbose_name = 'Время по проекту за день'
+        verbose_name_plural = 'Время по проектам за день'
+        ordering = ['-date', 'project_name']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'project', 'project_name'], name='reports_daily_project_time_unique'),
+            # NULL в project не равен другому NULL - для отчетов без проекта нужно отдельное условие
+            models.UniqueConstraint(
+                fields=['date', 'project_name'], condition=Q(project__isnull=True),
+                name='reports_daily_free_project_time_unique',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.project_name} ({self.total_time})"
@@ -0,0 +1,118 @@
+"""
+Сводки времени DailyProjectTime.
+
+Каждая строка - сумма времени и число отчетов за день по проекту. Сигналы
+WorkReport прибавляют и вычитают изменения в той же транзакции, что и само
+сохранение отчета; пакетные операции (bulk_create, update, delete по
+queryset) сигналов не посылают, поэтому после них вызывается
+rollup_reports() или rebuild_rollups() за затронутый период.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.dispatch import Signal
+
+from .models import DailyProjectTime, WorkReport
+
+
+# Сводки изменены пакетно, в обход сигналов моделей (импорт, пересчет)
+rollups_changed = Signal()
+
+
+def rollup_key(report):
+    return (report.date, report.project_id, report.project_name or '')
+
+
+def apply_delta(key, duration, count):
+    """Прибавляет к сводке дня duration и count (отрицательные - вычитает)"""
+    report_date, project_id, project_name = key
+    rollups = DailyProjectTime.objects.filter(date=report_date, project_id=project_id, project_name=project_name)
+    with transaction.atomic():
+        # UPDATE первым: он же берет блокировку на запись, поэтому create ниже не гоняется с другим процессом
+        updated = rollups.update(total_time=F('total_time') + duration, reports_count=F('reports_count') + count)
+        if not updated and count > 0:
+            DailyProjectTime.objects.create(
+                date=report_date, project_id=project_id, project_name=project_name,
+                total_time=duration, reports_count=count,
+            )
+        elif updated and count < 0:
+            rollups.filter(reports_count__lte=0).delete()
+
+
+def apply_deltas(deltas, batch_size=900):
+    """
+    Пачка изменений {ключ: (время, число)} за несколько запросов, а не по
+    запросу на ключ: сводки за затронутые дни читаются с блокировкой,
+    измененные удаляются и вставляются заново одним bulk_create вместе с
+    новыми - это быстрее, чем bulk_update с CASE на каждую строку.
+    """
+    dates = sorted({key[0] for key in deltas})
+    with transaction.atomic():
+        existing = {}
+        for start in range(0, len(dates), batch_size):
+            for rollup in DailyProjectTime.objects.select_for_update().filter(date__in=dates[start:start + batch_size]):
+                existing[(rollup.date, rollup.project_id, rollup.project_name)] = rollup
+
+        replaced, created = [], []
+        for key, (duration, count) in deltas.items():
+            rollup = existing.get(key)
+            if rollup is not None:
+                replaced.append(rollup.id)
+                duration += rollup.total_time
+                count += rollup.reports_count
+            if count > 0:
+                report_date, project_id, project_name = key
+                created.append(DailyProjectTime(
+                    date=report_date, project_id=project_id, project_name=project_name,
+                    total_time=duration, reports_count=count,
+                ))
+
+        for start in range(0, len(replaced), batch_size):
+            DailyProjectTime.objects.filter(id__in=replaced[start:start + batch_size]).delete()
+        DailyProjectTime.objects.bulk_create(created, batch_size=batch_size)
+    rollups_changed.send(sender=DailyProjectTime)
+
+
+def report_deltas(reports, sign=1, deltas=None):
+    """Изменения сводок {ключ: [время, число]} от пачки отчетов; deltas - накопить к уже собранным"""
+    if deltas is None:
+        deltas = defaultdict(lambda: [timedelta(), 0])
+    for report in reports:
+        delta = deltas[rollup_key(report)]
+        delta[0] += report.time_spent * sign
+        delta[1] += sign
+    return deltas
+
+
+def rollup_reports(reports, sign=1):
+    """Добавляет в сводки (sign=-1 - убирает) пачку отчетов; вызывать в транзакции записи самих отчетов"""
+    deltas = report_deltas(reports, sign)
+    if deltas:
+        apply_deltas(deltas)
+
+
+def rebuild_rollups(date_from=None, date_to=None, batch_size=1000):
+    """Пересчитывает сводки за период (по умолчанию - за все время) одним GROUP BY; возвращает число строк"""
+    reports = WorkReport.objects.all()
+    rollups = DailyProjectTime.objects.all()
+    if date_from:
+        reports = reports.filter(date__gte=date_from)
+        rollups = rollups.filter(date__gte=date_from)
+    if date_to:
+        reports = reports.filter(date__lte=date_to)
+        rollups = rollups.filter(date__lte=date_to)
+
+    rows = (
+        reports.order_by()
+        .values('date', 'project_id', 'project_name')
+        .annotate(total_time=Sum('time_spent'), reports_count=Count('id'))
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = DailyProjectTime.objects.bulk_create(
+            [DailyProjectTime(**row) for row in rows], batch_size=batch_size,
+        )
+    rollups_changed.send(sender=DailyProjectTime)
+    return len(created)
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import WorkReport
+from .rollups import apply_delta, rollup_key
+
+
+def remember_previous(sender, instance, raw=False, **kwargs):
+    """Перед изменением отчета запоминаем, в какую сводку он входил"""
+    instance._rollup_previous = None
+    if raw or instance.pk is None:
+        return
+    previous = WorkReport.objects.filter(pk=instance.pk).only('date', 'project_id', 'project_name', 'time_spent').first()
+    if previous is not None:
+        instance._rollup_previous = (rollup_key(previous), previous.time_spent)
+
+
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    key = rollup_key(instance)
+    if previous is None:
+        apply_delta(key, instance.time_spent, 1)
+    elif previous[0] == key:
+        if previous[1] != instance.time_spent:
+            apply_delta(key, instance.time_spent - previous[1], 0)
+    else:
+        # Отчет перенесен на другой день или проект
+        apply_delta(previous[0], -previous[1], -1)
+        apply_delta(key, instance.time_spent, 1)
+    instance._rollup_previous = (key, instance.time_spent)
+
+
+def update_rollup_on_delete(sender, instance, **kwargs):
+    apply_delta(rollup_key(instance), -instance.time_spent, -1)
+
+
+def connect_signals():
+    pre_save.connect(remember_previous, sender=WorkReport, dispatch_uid='reports_rollup_pre_save')
+    post_save.connect(update_rollup_on_save, sender=WorkReport, dispatch_uid='reports_rollup_post_save')
+    post_delete.connect(update_rollup_on_delete, sender=WorkReport, dispatch_uid='reports_rollup_post_delete')
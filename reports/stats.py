@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import DailyProjectTime
+
+
+def time_stats(today=None):
+    """
+    Время за сегодня, неделю и месяц, число отчетов и проектов - из сводок по
+    дням: стоимость зависит от числа дней и проектов, а не от числа отчетов
+    """
+    today = today or timezone.now().date()
+    totals = DailyProjectTime.objects.aggregate(
+        today_time=Sum('total_time', filter=Q(date=today)),
+        week_time=Sum('total_time', filter=Q(date__gte=today - timedelta(days=7))),
+        month_time=Sum('total_time', filter=Q(date__gte=today - timedelta(days=30))),
+        total_reports=Sum('reports_count'),
+        projects_count=Count('project_name', distinct=True),
+    )
+    return {
+        'today_time': totals['today_time'] or timedelta(),
+        'week_time': totals['week_time'] or timedelta(),
+        'month_time': totals['month_time'] or timedelta(),
+        'total_reports': totals['total_reports'] or 0,
+        'projects_count': totals['projects_count'],
+    }
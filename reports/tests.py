@@ -1,3 +1,67 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+
+from projects.models import Project
+
+from .filters import ReportFilter
+from .models import WorkReport
+
+
+class ReportFilterTests(TestCase):
+    def test_dates_are_parsed(self):
+        report_filter = ReportFilter({'date_from': '2024-01-01', 'date_to': '2024-01-31'})
+        self.assertEqual(report_filter.date_range, (date(2024, 1, 1), date(2024, 1, 31)))
+        self.assertEqual(report_filter.errors, [])
+
+    def test_invalid_values_are_ignored(self):
+        report_filter = ReportFilter({'date_from': '31.01.2024', 'project_select': 'abc'})
+        self.assertEqual(report_filter.date_range, (None, None))
+        self.assertIsNone(report_filter.project_id)
+        self.assertEqual(len(report_filter.errors), 2)
+
+    def test_reversed_range_is_ignored(self):
+        report_filter = ReportFilter({'date_from': '2024-02-01', 'date_to': '2024-01-01'})
+        self.assertEqual(report_filter.date_range, (None, None))
+        self.assertEqual(len(report_filter.errors), 1)
+
+
+@skipUnlessDBFeature('supports_explaining_query_execution')
+class ReportFilterIndexTests(TestCase):
+    """Запросы списка отчетов идут по составным индексам WorkReport (EXPLAIN QUERY PLAN)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(name='Проект', slug='proekt')
+        start = date(2024, 1, 1)
+        WorkReport.objects.bulk_create([
+            WorkReport(
+                project=cls.project if i % 2 else None, project_name='' if i % 2 else 'Без проекта',
+                work_description='Работа', time_spent=timedelta(hours=1), date=start + timedelta(days=i % 60),
+            )
+            for i in range(200)
+        ])
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor != 'sqlite':
+            self.skipTest('План запроса проверяется только в SQLite')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_date_range_uses_date_created_index(self):
+        # Список в своем порядке (-date, -created_at) - по индексу без сортировки
+        queryset = ReportFilter({'date_from': '2024-01-10', 'date_to': '2024-01-20'}).apply(WorkReport.objects.all())
+        self.assertUsesIndex(queryset, 'reports_date_created_idx')
+
+    def test_date_range_grouping_uses_date_project_index(self):
+        queryset = ReportFilter({'date_from': '2024-01-10', 'date_to': '2024-01-20'}).apply(
+            WorkReport.objects.order_by()
+        ).values('project_id').distinct()
+        self.assertUsesIndex(queryset, 'reports_date_project_idx')
+
+    def test_project_and_dates_use_project_date_index(self):
+        queryset = ReportFilter({
+            'project_select': str(self.project.id), 'date_from': '2024-01-10', 'date_to': '2024-01-20',
+        }).apply(WorkReport.objects.all())
+        self.assertUsesIndex(queryset, 'reports_project_date_idx')
@@ -0,0 +1,161 @@
+"""
+Табель: проекты по строкам, дни/недели/месяцы по столбцам.
+
+Матрица строится одним GROUP BY (проект, период) - из сводок
+DailyProjectTime, а если задан поиск по описанию работы, то из самих
+отчетов; названия проектов читаются вторым запросом по id. Сводка в
+матрицу и итоги по строкам и столбцам считаются в Python по уже
+сгруппированным строкам: их число не больше проектов x периодов.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db.models import DateField, F, Func, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from projects.models import Project
+
+from .models import DailyProjectTime, WorkReport
+
+
+GRANULARITY_CHOICES = [
+    ('day', 'По дням'),
+    ('week', 'По неделям'),
+    ('month', 'По месяцам'),
+]
+
+MONTHS = ['янв', 'фев', 'мар', 'апр', 'май', 'июн', 'июл', 'авг', 'сен', 'окт', 'ноя', 'дек']
+
+
+class PeriodStart(Func):
+    """
+    Начало недели (понедельник) или месяца. В SQLite - встроенной date() с
+    модификаторами: Trunc* там вызывает Python-функцию на каждую строку
+    """
+    output_field = DateField()
+    SQLITE_MODIFIERS = {
+        'week': "'-6 days', 'weekday 1'",
+        'month': "'start of month'",
+    }
+
+    def __init__(self, expression, granularity):
+        self.granularity = granularity
+        super().__init__(expression)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        trunc = TruncWeek if self.granularity == 'week' else TruncMonth
+        return compiler.compile(trunc(*self.get_source_expressions()))
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        template = f"date(%(expressions)s, {self.SQLITE_MODIFIERS[self.granularity]})"
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+
+def _period_expression(granularity):
+    if granularity == 'day':
+        return F('date')
+    return PeriodStart('date', granularity)
+
+
+def _next_period(period, granularity):
+    if granularity == 'week':
+        return period + timedelta(days=7)
+    if granularity == 'month':
+        return date(period.year + period.month // 12, period.month % 12 + 1, 1)
+    return period + timedelta(days=1)
+
+
+def period_label(period, granularity):
+    if granularity == 'week':
+        return f"{period:%d.%m}-{period + timedelta(days=6):%d.%m}"
+    if granularity == 'month':
+        return f"{MONTHS[period.month - 1]} {period.year}"
+    return f"{period:%d.%m}"
+
+
+def hours(duration):
+    return round(duration.total_seconds() / 3600, 2)
+
+
+def hours_label(value):
+    """Часы для HTML: готовая строка, без локализации числа в шаблоне на каждую ячейку"""
+    if not value:
+        return ''
+    return f'{value:.2f}'.rstrip('0').rstrip('.').replace('.', ',')
+
+
+def timesheet_labels(sheet):
+    """Тот же табель, но со строками вместо чисел - для вывода в шаблоне"""
+    return dict(
+        sheet,
+        rows=[
+            {'name': row['name'], 'cells': [hours_label(value) for value in row['cells']], 'total': hours_label(row['total'])}
+            for row in sheet['rows']
+        ],
+        column_totals=[hours_label(value) for value in sheet['column_totals']],
+        total=hours_label(sheet['total']),
+    )
+
+
+def build_timesheet(report_filter, granularity='week'):
+    """
+    Табель по тем же фильтрам (ReportFilter), что и список отчетов. Возвращает
+    словарь: periods (подписи столбцов), rows (название проекта, часы по
+    периодам, итог), column_totals и total - все значения в часах.
+    """
+    if granularity not in dict(GRANULARITY_CHOICES):
+        granularity = 'week'
+
+    if report_filter.search:
+        queryset, time_field = report_filter.apply(WorkReport.objects.all()), 'time_spent'
+    else:
+        queryset, time_field = report_filter.apply(DailyProjectTime.objects.all(), search=False), 'total_time'
+
+    grouped = (
+        queryset.order_by()
+        .annotate(period=_period_expression(granularity))
+        .values_list('period', 'project_id', 'project_name')
+        .annotate(total=Sum(time_field))
+    )
+
+    # Проект из справочника - по id, без проекта - по введенному названию
+    cells = defaultdict(lambda: defaultdict(timedelta))
+    for period, project_id, project_name, total in grouped:
+        key = ('project', project_id) if project_id else ('name', project_name or 'Без проекта')
+        cells[key][period] += total
+
+    # Названия проектов - отдельным запросом по id, без JOIN в группировке
+    project_names = dict(
+        Project.objects.filter(id__in=[value for kind, value in cells if kind == 'project']).values_list('id', 'name')
+    )
+    names = {key: project_names.get(key[1], '') if key[0] == 'project' else key[1] for key in cells}
+
+    periods = []
+    if cells:
+        first = min(min(row) for row in cells.values())
+        last = max(max(row) for row in cells.values())
+        period = first
+        while period <= last:
+            periods.append(period)
+            period = _next_period(period, granularity)
+
+    column_totals = defaultdict(timedelta)
+    rows = []
+    for key in sorted(cells, key=lambda key: names[key].lower()):
+        row_cells = cells[key]
+        total = sum(row_cells.values(), timedelta())
+        for period, duration in row_cells.items():
+            column_totals[period] += duration
+        rows.append({
+            'name': names[key],
+            'cells': [hours(row_cells[period]) if period in row_cells else None for period in periods],
+            'total': hours(total),
+        })
+
+    return {
+        'granularity': granularity,
+        'periods': [period_label(period, granularity) for period in periods],
+        'rows': rows,
+        'column_totals': [hours(column_totals[period]) for period in periods],
+        'total': hours(sum(column_totals.values(), timedelta())),
+    }
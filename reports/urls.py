@@ -6,4 +6,6 @@ app_name = 'reports'
 urlpatterns = [
     path('', views.ReportListView.as_view(), name='report_list'),
     path('export/', views.export_to_excel, name='export_reports'),
+    path('timesheet/', views.timesheet, name='timesheet'),
+    path('timesheet/export/', views.export_timesheet, name='export_timesheet'),
 ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0002_alter_category_color'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['created_at'], name='resources_r_created_215cda_idx'),
+        ),
+    ]
@@ -56,6 +56,9 @@ class Resource(models.Model):
         verbose_name = "Ресурс"
         verbose_name_plural = "Ресурсы"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return self.title
@@ -1,16 +1,21 @@
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView
 from django.db.models import Q
+from seo_agency.conditional import ConditionalViewMixin
+from seo_agency.pagination import CursorPaginationMixin
 from .models import Category, Resource
 
 
-class ResourceListView(ListView):
+class ResourceListView(ConditionalViewMixin, CursorPaginationMixin, ListView):
     """Список всех ресурсов"""
     model = Resource
     template_name = 'resources/resource_list.html'
     context_object_name = 'resources'
     paginate_by = 12
     
+    def get_conditional_sources(self):
+        return [Resource.objects.all(), Category.objects.all()]
+    
     def get_queryset(self):
         queryset = Resource.objects.filter(is_public=True).select_related('category')
         
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import JobLock, JobRun
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'started_at', 'duration', 'owner']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'message']
+    readonly_fields = ['name', 'status', 'owner', 'started_at', 'finished_at', 'duration', 'message']
+    date_hierarchy = 'started_at'
+    ordering = ['-started_at']
+
+
+@admin.register(JobLock)
+class JobLockAdmin(admin.ModelAdmin):
+    list_display = ['name', 'owner', 'acquired_at', 'locked_until']
+    ordering = ['name']
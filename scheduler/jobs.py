@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import JobRun
+from .registry import register
+
+
+HISTORY_DAYS = 30
+
+
+@register('scheduler.prune_history', cron='30 3 * * *', jitter=600)
+def prune_history():
+    """Очистка истории запусков старше 30 дней"""
+    deleted, _ = JobRun.objects.filter(started_at__lt=timezone.now() - timedelta(days=HISTORY_DAYS)).delete()
+    return f'Удалено записей истории: {deleted}'
@@ -0,0 +1,53 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from scheduler.registry import autodiscover
+from scheduler.runner import Scheduler, run_job
+
+
+class Command(BaseCommand):
+    help = 'Планировщик периодических задач (долгоживущий процесс вместо cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Сколько задач может выполняться одновременно')
+        parser.add_argument('--list', action='store_true', help='Показать задачи и время следующего запуска')
+        parser.add_argument('--run', metavar='NAME', help='Выполнить задачу сейчас (с блокировкой) и выйти')
+        parser.add_argument('--once', action='store_true', help='Выполнить созревшие задачи по очереди и выйти')
+
+    def log(self, message):
+        self.stdout.write(f'[{timezone.localtime():%Y-%m-%d %H:%M:%S}] {message}')
+
+    def handle(self, *args, **options):
+        jobs = autodiscover()
+        scheduler = Scheduler(jobs, max_workers=options['workers'], log=self.log)
+
+        if options['list']:
+            for name, moment in sorted(scheduler.plan().items()):
+                self.stdout.write(f'{jobs[name]}: {timezone.localtime(moment):%d.%m.%Y %H:%M:%S} - {jobs[name].description}')
+            return
+
+        if options['run']:
+            if options['run'] not in jobs:
+                raise CommandError(f'Задача {options["run"]} не найдена. Доступные: {", ".join(sorted(jobs))}')
+            run = run_job(jobs[options['run']])
+            self.stdout.write(f'{run.get_status_display()} за {run.duration:.1f} сек')
+            if run.message:
+                self.stdout.write(run.message)
+            return
+
+        if options['once']:
+            scheduler.plan()
+            scheduler.run_pending()
+            return
+
+        def stop(signum, frame):
+            scheduler.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.log(f'Планировщик запущен, задач: {len(jobs)}')
+        scheduler.run_forever()
+        self.log('Планировщик остановлен')
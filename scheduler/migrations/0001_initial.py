@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Задача')),
+                ('owner', models.CharField(blank=True, max_length=200, verbose_name='Владелец')),
+                ('acquired_at', models.DateTimeField(blank=True, null=True, verbose_name='Захвачена')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занята до')),
+            ],
+            options={
+                'verbose_name': 'Блокировка задачи',
+                'verbose_name_plural': 'Блокировки задач',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Задача')),
+                ('status', models.CharField(choices=[('running', 'Выполняется'), ('success', 'Успешно'), ('failed', 'Ошибка'), ('skipped', 'Пропущен (уже выполняется)')], default='running', max_length=20, verbose_name='Статус')),
+                ('owner', models.CharField(blank=True, max_length=200, verbose_name='Процесс')),
+                ('started_at', models.DateTimeField(verbose_name='Начало')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Окончание')),
+                ('duration', models.FloatField(blank=True, null=True, verbose_name='Длительность (сек)')),
+                ('message', models.TextField(blank=True, verbose_name='Результат')),
+            ],
+            options={
+                'verbose_name': 'Запуск задачи',
+                'verbose_name_plural': 'Запуски задач',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['name', 'started_at'], name='scheduler_j_name_74f8b3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class JobLock(models.Model):
+    """Блокировка периодической задачи: пока locked_until в будущем, второй запуск пропускается"""
+    name = models.CharField(max_length=100, unique=True, verbose_name="Задача")
+    owner = models.CharField(max_length=200, blank=True, verbose_name="Владелец")
+    acquired_at = models.DateTimeField(null=True, blank=True, verbose_name="Захвачена")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занята до")
+
+    class Meta:
+        verbose_name = "Блокировка задачи"
+        verbose_name_plural = "Блокировки задач"
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class JobRun(models.Model):
+    """Запуск периодической задачи"""
+    STATUS_CHOICES = [
+        ('running', 'Выполняется'),
+        ('success', 'Успешно'),
+        ('failed', 'Ошибка'),
+        ('skipped', 'Пропущен (уже выполняется)'),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name="Задача")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running', verbose_name="Статус")
+    owner = models.CharField(max_length=200, blank=True, verbose_name="Процесс")
+    started_at = models.DateTimeField(verbose_name="Начало")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Окончание")
+    duration = models.FloatField(null=True, blank=True, verbose_name="Длительность (сек)")
+    message = models.TextField(blank=True, verbose_name="Результат")
+
+    class Meta:
+        verbose_name = "Запуск задачи"
+        verbose_name_plural = "Запуски задач"
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['name', 'started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.started_at:%d.%m.%Y %H:%M})"
@@ -0,0 +1,170 @@
+"""
+Реестр периодических задач.
+
+Приложения регистрируют задачи в своих модулях jobs.py (они подключаются
+автоматически при старте планировщика):
+
+    @register('news.parse', cron='0 9 * * 0', jitter=300)
+    def parse_news():
+        ...
+        return 'Добавлено 12 новостей'
+
+Расписание задается интервалом (every - секунды или timedelta) или
+cron-выражением из пяти полей (минута, час, день месяца, месяц, день недели)
+в местном времени. jitter - случайная задержка до N секунд, чтобы задачи с
+одинаковым расписанием не стартовали одновременно. lock_timeout - на сколько
+секунд задача занимает блокировку: если процесс упал, через это время
+задачу снова можно запустить.
+"""
+import random
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+
+class Interval:
+    """Запуск каждые every секунд после начала предыдущего запуска"""
+
+    def __init__(self, every):
+        self.every = every if isinstance(every, timedelta) else timedelta(seconds=every)
+        if self.every <= timedelta(0):
+            raise ValueError('Интервал должен быть больше нуля')
+
+    def next_after(self, moment):
+        return moment + self.every
+
+    def __str__(self):
+        return f'каждые {int(self.every.total_seconds())} сек'
+
+
+class Cron:
+    """Cron-выражение: *, числа, списки (1,15), диапазоны (1-5) и шаги (*/10, 0-30/5)"""
+
+    FIELDS = [
+        ('minute', 0, 59),
+        ('hour', 0, 23),
+        ('day', 1, 31),
+        ('month', 1, 12),
+        ('weekday', 0, 7),  # 0 и 7 - воскресенье
+    ]
+
+    def __init__(self, expression):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != len(self.FIELDS):
+            raise ValueError(f'Cron-выражение должно состоять из 5 полей: {expression!r}')
+
+        values = {}
+        for part, (name, low, high) in zip(parts, self.FIELDS):
+            values[name] = self._parse_field(part, low, high)
+        self.minutes = values['minute']
+        self.hours = values['hour']
+        self.days = values['day']
+        self.months = values['month']
+        self.weekdays = {day % 7 for day in values['weekday']}
+        # Как в cron: если заданы и день месяца, и день недели, подходит любой из них
+        self.days_restricted = parts[2] != '*'
+        self.weekdays_restricted = parts[4] != '*'
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for item in field.split(','):
+            step = 1
+            if '/' in item:
+                item, step = item.split('/', 1)
+                step = int(step)
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(value) for value in item.split('-', 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f'Недопустимое значение в cron-поле: {field!r}')
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, moment):
+        """Ближайший подходящий момент строго после moment"""
+        local = timezone.localtime(moment).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        limit = local + timedelta(days=366 * 5)
+        # Неподходящие месяц, день и час пропускаются целиком, а не поминутно
+        while local < limit:
+            if local.month not in self.months:
+                year, month = divmod(local.month, 12)
+                local = datetime(local.year + year, month + 1, 1)
+            elif not self._day_matches(local):
+                local = (local + timedelta(days=1)).replace(hour=0, minute=0)
+            elif local.hour not in self.hours:
+                local = (local + timedelta(hours=1)).replace(minute=0)
+            elif local.minute not in self.minutes:
+                local += timedelta(minutes=1)
+            else:
+                return timezone.make_aware(local)
+        raise ValueError(f'Cron-выражение никогда не срабатывает: {self.expression!r}')
+
+    def __str__(self):
+        return f'cron "{self.expression}"'
+
+
+class Job:
+    """Периодическая задача: функция без аргументов и ее расписание"""
+
+    def __init__(self, name, func, schedule, jitter=0, lock_timeout=3600, description=''):
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.jitter = jitter
+        self.lock_timeout = lock_timeout
+        self.description = description or (func.__doc__ or '').strip()
+
+    def next_run(self, last_started=None, now=None):
+        """
+        Время следующего запуска. Без истории интервальная задача запускается
+        сразу, cron-задача - в ближайший момент по расписанию; пропущенный
+        (пока планировщик не работал) запуск выполняется один раз при старте.
+        """
+        now = now or timezone.now()
+        if last_started is None:
+            base = now if isinstance(self.schedule, Interval) else self.schedule.next_after(now)
+        else:
+            base = self.schedule.next_after(last_started)
+        return base + timedelta(seconds=random.uniform(0, self.jitter))
+
+    def __call__(self):
+        return self.func()
+
+    def __str__(self):
+        return f'{self.name} ({self.schedule})'
+
+
+registry = {}
+
+
+def register(name, func=None, *, every=None, cron=None, jitter=0, lock_timeout=3600, description=''):
+    """Регистрирует задачу; можно использовать как декоратор"""
+    if (every is None) == (cron is None):
+        raise ValueError(f'Для задачи {name} нужно указать ровно одно из every и cron')
+    schedule = Interval(every) if every is not None else Cron(cron)
+
+    def decorator(func):
+        registry[name] = Job(name, func, schedule, jitter, lock_timeout, description)
+        return func
+
+    return decorator(func) if func is not None else decorator
+
+
+def autodiscover():
+    """Импортирует jobs.py всех установленных приложений"""
+    autodiscover_modules('jobs')
+    return registry
@@ -0,0 +1,157 @@
+"""
+Выполнение периодических задач.
+
+Один долгоживущий процесс держит прогретый Django и запускает задачи по
+расписанию в пуле потоков, поэтому долгая задача не задерживает остальные.
+Перекрытие запусков (в том числе из разных процессов и ручных запусков через
+run_scheduler --run) исключается блокировкой в базе: захват - один UPDATE с
+условием на locked_until. Каждый запуск записывается в JobRun с длительностью
+и результатом.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections, connections
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import JobLock, JobRun
+from .registry import autodiscover
+
+
+# Дольше этого планировщик не спит, даже если ближайшая задача не скоро
+MAX_SLEEP = 30
+
+
+def default_owner():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def acquire_lock(name, owner, timeout):
+    """Захватывает блокировку задачи на timeout секунд; False, если она занята"""
+    now = timezone.now()
+    JobLock.objects.bulk_create([JobLock(name=name)], ignore_conflicts=True)
+    return bool(
+        JobLock.objects
+        .filter(name=name)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+        .update(owner=owner, acquired_at=now, locked_until=now + timedelta(seconds=timeout))
+    )
+
+
+def release_lock(name, owner):
+    JobLock.objects.filter(name=name, owner=owner).update(locked_until=None)
+
+
+def run_job(job, owner=None):
+    """Выполняет задачу под блокировкой и записывает запуск в историю"""
+    owner = owner or default_owner()
+    started = timezone.now()
+    if not acquire_lock(job.name, owner, job.lock_timeout):
+        return JobRun.objects.create(
+            name=job.name, status='skipped', owner=owner, started_at=started, finished_at=started, duration=0,
+        )
+
+    run = JobRun.objects.create(name=job.name, owner=owner, started_at=started)
+    clock = time.monotonic()
+    try:
+        message = job()
+        run.status = 'success'
+        run.message = '' if message is None else str(message)
+    except Exception:
+        run.status = 'failed'
+        run.message = traceback.format_exc()
+    finally:
+        run.finished_at = timezone.now()
+        run.duration = round(time.monotonic() - clock, 3)
+        run.save(update_fields=['status', 'message', 'finished_at', 'duration'])
+        release_lock(job.name, owner)
+    return run
+
+
+def _run_in_thread(job, owner):
+    try:
+        return run_job(job, owner)
+    finally:
+        # У каждого потока пула свое соединение - закрываем, чтобы не копились
+        connections.close_all()
+
+
+class Scheduler:
+    """Цикл планировщика: следит за расписанием и отдает созревшие задачи в пул"""
+
+    def __init__(self, jobs=None, max_workers=4, owner=None, log=None):
+        self.jobs = jobs if jobs is not None else autodiscover()
+        self.max_workers = max_workers
+        self.owner = owner or default_owner()
+        self.log = log or (lambda message: None)
+        self.stop_event = threading.Event()
+        self.next_runs = {}
+        self.running = {}
+
+    def last_started(self):
+        """Начало последнего выполненного запуска каждой задачи - одним запросом"""
+        rows = (
+            JobRun.objects
+            .filter(name__in=list(self.jobs))
+            .exclude(status='skipped')
+            .values('name')
+            .annotate(last=Max('started_at'))
+        )
+        return {row['name']: row['last'] for row in rows}
+
+    def plan(self):
+        last = self.last_started()
+        now = timezone.now()
+        self.next_runs = {name: job.next_run(last.get(name), now) for name, job in self.jobs.items()}
+        return self.next_runs
+
+    def due_jobs(self, now=None):
+        now = now or timezone.now()
+        return [self.jobs[name] for name, moment in sorted(self.next_runs.items(), key=lambda item: item[1]) if moment <= now]
+
+    def run_pending(self, executor=None):
+        """Запускает созревшие задачи; без пула - по очереди в текущем потоке"""
+        self.running = {name: future for name, future in self.running.items() if not future.done()}
+        for job in self.due_jobs():
+            if job.name in self.running:
+                # Предыдущий запуск в этом процессе еще идет - не ставим задачу в пул повторно
+                continue
+            # Следующий запуск планируется от начала текущего, как в cron
+            self.next_runs[job.name] = job.next_run(timezone.now())
+            self.log(f'Запуск {job.name}')
+            if executor is None:
+                self._report(run_job(job, self.owner))
+            else:
+                future = executor.submit(_run_in_thread, job, self.owner)
+                future.add_done_callback(self._report_future)
+                self.running[job.name] = future
+
+    def _report_future(self, future):
+        if future.exception() is None:
+            self._report(future.result())
+        else:
+            self.log(f'Ошибка планировщика: {future.exception()}')
+
+    def _report(self, run):
+        self.log(f'{run.name}: {run.get_status_display()}, {run.duration or 0:.1f} сек')
+
+    def run_forever(self):
+        self.plan()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                self.run_pending(executor)
+
+                now = timezone.now()
+                delay = (min(self.next_runs.values(), default=now) - now).total_seconds() if self.next_runs else MAX_SLEEP
+                self.stop_event.wait(min(max(delay, 1), MAX_SLEEP))
+            self.log('Остановка: ждем завершения выполняющихся задач...')
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,85 @@
+"""
+Условные ответы (ETag / Last-Modified) для страниц только для чтения.
+
+Перед рендерингом считается дешевый валидатор: по каждому источнику данных
+страницы (queryset) - число строк и последнее изменение (Max по полю
+updated_at) одним запросом на источник, плюс GET-параметры и пользователь.
+Если браузер прислал тот же ETag (If-None-Match) или страница не менялась с
+If-Modified-Since, отвечаем 304 без запросов за списком и без шаблона.
+Число строк нужно, чтобы заметить удаление - у удаленной строки нет
+updated_at. Проверку заголовков и 304 делает django.views.decorators.http.condition.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+
+def source_state(sources):
+    """[(число строк, последнее изменение)] по источникам: queryset или (queryset, поле даты изменения)"""
+    states = []
+    for source in sources:
+        queryset, field = source if isinstance(source, tuple) else (source, 'updated_at')
+        state = queryset.order_by().aggregate(count=Count('pk'), last=Max(field))
+        states.append((state['count'], state['last']))
+    return states
+
+
+def make_validator(request, parts, last_modified=None):
+    """(etag, last_modified) для страницы: parts - любые значения, от которых зависит ее содержимое"""
+    user = getattr(request, 'user', None)
+    key = repr((
+        request.path,
+        sorted(request.GET.lists()),
+        user.pk if user is not None and user.is_authenticated else None,
+        parts,
+    ))
+    return hashlib.md5(key.encode()).hexdigest(), last_modified
+
+
+def validator_from_sources(request, sources):
+    states = source_state(sources)
+    changed = [last for _, last in states if last is not None]
+    return make_validator(request, states, max(changed) if changed else None)
+
+
+def _conditional(view, get_validator):
+    """Оборачивает view в condition(); валидатор считается один раз на запрос"""
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        etag, last_modified = get_validator(request, *args, **kwargs)
+        return condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: last_modified,
+        )(view)(request, *args, **kwargs)
+    return wrapped
+
+
+def conditional_view(get_validator):
+    """
+    Декоратор для функций-view: get_validator(request, *args, **kwargs)
+    возвращает (etag, last_modified) - например, через make_validator()
+    """
+    def decorator(view):
+        return _conditional(view, get_validator)
+    return decorator
+
+
+class ConditionalViewMixin:
+    """
+    Для CBV: источники данных страницы - в get_conditional_sources(); если
+    у страницы есть свой дешевый признак изменений, можно переопределить
+    get_validator() целиком.
+    """
+
+    def get_conditional_sources(self):
+        return []
+
+    def get_validator(self, request, *args, **kwargs):
+        return validator_from_sources(request, self.get_conditional_sources())
+
+    def dispatch(self, request, *args, **kwargs):
+        return _conditional(super().dispatch, self.get_validator)(request, *args, **kwargs)
@@ -0,0 +1,230 @@
+"""
+Постраничный вывод по курсору (keyset) для больших списков.
+
+Вместо OFFSET n и COUNT(*) страница выбирается условием "после последней
+строки предыдущей страницы" по полям сортировки (плюс id, чтобы порядок был
+однозначным): WHERE (date, created_at, id) < (...) ORDER BY ... LIMIT
+per_page + 1. При индексе по полям сортировки любая страница стоит столько
+же, сколько первая.
+
+Курсор непрозрачен: значения полей последней строки подписаны
+django.core.signing, поэтому подделанный или устаревший курсор (например,
+после смены сортировки) просто открывает первую страницу. Точное число
+записей считается лениво - только если к paginator.count обратились.
+"""
+from datetime import date, datetime
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+
+CURSOR_SALT = 'seo_agency.pagination'
+
+# Направления курсора: следующая страница, предыдущая, последняя
+NEXT, PREVIOUS, LAST = 'n', 'p', 'l'
+
+
+class CursorPaginator:
+    """Минимальная замена Paginator для шаблонов: число записей - по запросу"""
+
+    def __init__(self, count_func, per_page):
+        self._count_func = count_func
+        self.per_page = per_page
+
+    @cached_property
+    def count(self):
+        return self._count_func()
+
+    @property
+    def num_pages(self):
+        return max(1, -(-self.count // self.per_page))
+
+
+class CursorPage:
+    """Страница списка: object_list и готовые строки запроса для ссылок"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous, next_query, previous_query, first_query, last_query):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_query = next_query
+        self.previous_query = previous_query
+        self.first_query = first_query
+        self.last_query = last_query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+def parse_ordering(queryset):
+    """
+    Сортировка queryset как [(поле, по убыванию)], с id в конце; None, если
+    ее нельзя использовать для курсора (выражения, поля связанных моделей)
+    """
+    ordering = queryset.query.order_by or (queryset.model._meta.ordering if queryset.query.default_ordering else ())
+    opts = queryset.model._meta
+    parsed = []
+    for item in ordering:
+        if not isinstance(item, str) or '__' in item or item.lstrip('-') == '?':
+            return None
+        name = item.lstrip('-')
+        name = opts.pk.name if name == 'pk' else name
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        parsed.append((field.attname, item.startswith('-')))
+    if opts.pk.attname not in [name for name, _ in parsed]:
+        parsed.append((opts.pk.attname, parsed[-1][1] if parsed else False))
+    return parsed
+
+
+def _order_by(ordering, model):
+    # NULL - в начале при сортировке по возрастанию и в конце по убыванию, на всех СУБД одинаково
+    expressions = []
+    for name, descending in ordering:
+        if model._meta.get_field(name).null:
+            expressions.append(F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_first=True))
+        else:
+            expressions.append(F(name).desc() if descending else F(name).asc())
+    return expressions
+
+
+def _after(field, descending, value):
+    """(строго после value, равно value) для одного поля с учетом NULL"""
+    if value is None:
+        equal = Q(**{f'{field.attname}__isnull': True})
+        # NULL - последние при убывании: после них ничего; первые при возрастании: после них все не-NULL
+        after = Q(pk__in=[]) if descending else Q(**{f'{field.attname}__isnull': False})
+        return after, equal
+    after = Q(**{f'{field.attname}__lt' if descending else f'{field.attname}__gt': value})
+    if descending and field.null:
+        after |= Q(**{f'{field.attname}__isnull': True})
+    return after, Q(**{field.attname: value})
+
+
+def keyset_filter(ordering, values, model):
+    """Условие "строка идет после values" для сортировки ordering"""
+    fields = [model._meta.get_field(name) for name, _ in ordering]
+    condition = Q(pk__in=[])
+    equal_prefix = Q()
+    for field, (name, descending), value in zip(fields, ordering, values):
+        after, equal = _after(field, descending, value)
+        condition |= equal_prefix & after
+        equal_prefix &= equal
+    # Диапазон по первому полю отдельно - чтобы СУБД начала с поиска по индексу
+    first_field, (_, first_descending), first_value = fields[0], ordering[0], values[0]
+    if first_value is not None and not first_field.null:
+        lookup = 'lte' if first_descending else 'gte'
+        condition &= Q(**{f'{first_field.attname}__{lookup}': first_value})
+    return condition
+
+
+def _dump_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+class CursorPaginationMixin:
+    """
+    Для ListView: постраничный вывод по курсору в GET-параметре cursor.
+    В шаблоне - page_obj.has_next/has_previous и page_obj.next_query,
+    previous_query, first_query, last_query для ссылок вида "?{{ ... }}".
+    Сортировка берется из queryset (order_by или Meta.ordering модели);
+    если по ней курсор не построить, используется cursor_ordering.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-pk',)
+
+    def get_cursor_count(self, queryset):
+        """Точное число записей; вызывается, только если шаблону нужен paginator.count"""
+        return queryset.count()
+
+    def get_cursor_ordering(self, queryset):
+        ordering = parse_ordering(queryset)
+        if ordering is None:
+            ordering = parse_ordering(queryset.order_by(*self.cursor_ordering))
+        return ordering
+
+    def encode_cursor(self, ordering, direction, obj=None):
+        values = [_dump_value(getattr(obj, name)) for name, _ in ordering] if obj is not None else None
+        return signing.dumps({'o': [list(item) for item in ordering], 'd': direction, 'v': values}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, ordering, model):
+        """(направление, значения) из GET-параметра; (None, None) - первая страница"""
+        token = self.request.GET.get(self.cursor_query_param)
+        if not token:
+            return None, None
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            return None, None
+        if data.get('o') != [list(item) for item in ordering] or data.get('d') not in (NEXT, PREVIOUS, LAST):
+            return None, None
+        if data['d'] == LAST:
+            return LAST, None
+        try:
+            values = [
+                None if value is None else model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(ordering, data['v'])
+            ]
+        except ValidationError:
+            return None, None
+        return data['d'], values
+
+    def cursor_query(self, cursor=None):
+        params = self.request.GET.copy()
+        params.pop(self.cursor_query_param, None)
+        params.pop(self.page_kwarg, None)
+        if cursor:
+            params[self.cursor_query_param] = cursor
+        return params.urlencode()
+
+    def paginate_queryset(self, queryset, page_size):
+        model = queryset.model
+        ordering = self.get_cursor_ordering(queryset)
+        direction, values = self.decode_cursor(ordering, model)
+        backwards = direction in (PREVIOUS, LAST)
+
+        query_ordering = [(name, not descending) for name, descending in ordering] if backwards else ordering
+        page_queryset = queryset.order_by(*_order_by(query_ordering, model))
+        if values is not None:
+            page_queryset = page_queryset.filter(keyset_filter(query_ordering, values, model))
+
+        rows = list(page_queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            has_previous, has_next = has_more, direction == PREVIOUS
+        else:
+            has_previous, has_next = direction == NEXT, has_more
+
+        paginator = CursorPaginator(lambda: self.get_cursor_count(queryset), page_size)
+        page = CursorPage(
+            rows, paginator, has_next, has_previous,
+            next_query=self.cursor_query(self.encode_cursor(ordering, NEXT, rows[-1])) if has_next and rows else '',
+            previous_query=self.cursor_query(self.encode_cursor(ordering, PREVIOUS, rows[0])) if has_previous and rows else '',
+            first_query=self.cursor_query(),
+            last_query=self.cursor_query(self.encode_cursor(ordering, LAST)),
+        )
+        return paginator, page, rows, page.has_other_pages()
@@ -44,6 +44,8 @@ INSTALLED_APPS = [
     'resources',
     'news',
     'tools',
+    'monitoring',
+    'scheduler',
 ]
 
 MIDDLEWARE = [
@@ -87,6 +89,35 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Описания статей для новостей: на диске, чтобы повторный сбор не скачивал страницы заново
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'pages',
+        'TIMEOUT': 7 * 24 * 3600,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Агрегаты страницы новостей: общий для веб-процессов и планировщика, который их сбрасывает
+    'news': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'news',
+        'TIMEOUT': 3600,
+    },
+    # Фрагменты главной страницы: сбрасываются сигналами, в том числе из команд импорта
+    'dashboard': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'dashboard',
+        'TIMEOUT': 24 * 3600,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,323 @@
+"""
+Потоковая выдача больших файлов (CSV, XLSX, ZIP) без сборки целиком в памяти.
+
+Генераторы из этого модуля отдаются прямо в StreamingHttpResponse:
+первые байты уходят клиенту сразу, память не растет с числом строк.
+Готовые файлы с диска отдает ranged_file_response - с поддержкой Range,
+чтобы прерванную загрузку можно было продолжить.
+"""
+import csv
+import os
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, quote_etag
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+ZIP_CONTENT_TYPE = 'application/zip'
+
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+# Уже сжатые форматы: повторное сжатие только тратит процессор
+ZIP_STORED_EXTENSIONS = frozenset((
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif',
+    '.zip', '.rar', '.7z', '.gz', '.bz2', '.xz',
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods',
+    '.mp3', '.mp4', '.mov', '.avi', '.webm',
+))
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Символы, недопустимые в XML 1.0
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class StreamBuffer:
+    """Файлоподобный приемник: копит записанные байты до следующего drain()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class _Echo:
+    """Приемник для csv.writer, который просто возвращает строку"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, headers=None):
+    """Генератор CSV (UTF-8 с BOM, чтобы Excel корректно открыл кириллицу)"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff'
+    if headers:
+        yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def column_letter(index):
+    """Номер колонки (с 1) -> буквенное обозначение: 1 -> A, 27 -> AA"""
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_cell(ref, value, style=0):
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value == '':
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        value = value.strftime('%d.%m.%Y %H:%M')
+    elif isinstance(value, date):
+        value = value.strftime('%d.%m.%Y')
+    elif isinstance(value, timedelta):
+        value = str(value)
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(row_number, values, style=0):
+    cells = ''.join(
+        _xlsx_cell(f'{column_letter(col)}{row_number}', value, style)
+        for col, value in enumerate(values, 1)
+    )
+    return f'<row r="{row_number}">{cells}</row>'
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # Стиль 0 - обычный, стиль 1 - жирный по центру (заголовки и итоги)
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+        '<alignment horizontal="center"/></xf></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+XLSX_BOLD = 1
+
+
+def stream_xlsx(rows, headers=None, sheet_title='Sheet1', column_widths=None, footer_rows=None, chunk_rows=500):
+    """
+    Генератор XLSX-файла: строки пишутся в sheet1.xml по мере поступления.
+
+    rows - итерируемое списков значений; footer_rows - функция без аргументов,
+    которая вызывается после всех строк и возвращает итоговые строки (жирным).
+    Ширины колонок задаются заранее: в XLSX они записываются до данных.
+    """
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_title[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            ).encode('utf-8'))
+            if column_widths:
+                cols = ''.join(
+                    f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+                    for index, width in enumerate(column_widths, 1) if width
+                )
+                sheet.write(f'<cols>{cols}</cols>'.encode('utf-8'))
+            sheet.write(b'<sheetData>')
+
+            row_number = 0
+            if headers:
+                row_number += 1
+                sheet.write(_xlsx_row(row_number, headers, XLSX_BOLD).encode('utf-8'))
+
+            pending = []
+            for values in rows:
+                row_number += 1
+                pending.append(_xlsx_row(row_number, values))
+                if len(pending) >= chunk_rows:
+                    sheet.write(''.join(pending).encode('utf-8'))
+                    pending = []
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            if pending:
+                sheet.write(''.join(pending).encode('utf-8'))
+
+            if footer_rows:
+                row_number += 1  # пустая строка перед итогами
+                for values in footer_rows():
+                    row_number += 1
+                    sheet.write(_xlsx_row(row_number, values, XLSX_BOLD).encode('utf-8'))
+
+            sheet.write(b'</sheetData></worksheet>')
+        yield buffer.drain()
+    yield buffer.drain()
+
+
+def zip_compression(name):
+    """ZIP_STORED для уже сжатых форматов, ZIP_DEFLATED для остальных"""
+    extension = os.path.splitext(name)[1].lower()
+    return zipfile.ZIP_STORED if extension in ZIP_STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def stream_zip(entries, chunk_size=ZIP_CHUNK_SIZE):
+    """
+    Генератор ZIP-архива из файлов на диске: entries - пары (путь, имя в архиве).
+
+    Файлы читаются кусками по chunk_size, сжатые данные уходят клиенту после
+    каждого куска, поэтому память не зависит от размера файлов. Размеры и CRC
+    пишутся после данных файла (data descriptor) - приемник не умеет seek.
+    Отсутствующие на диске файлы и повторы имен пропускаются.
+    """
+    buffer = StreamBuffer()
+    names = set()
+    with zipfile.ZipFile(buffer, 'w', allowZip64=True) as archive:
+        for path, arcname in entries:
+            if arcname in names or not os.path.isfile(path):
+                continue
+            names.add(arcname)
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = zip_compression(arcname)
+            with open(path, 'rb') as source, archive.open(info, 'w', force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as target:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def parse_range(header, size):
+    """
+    (начало, конец включительно) из заголовка Range для файла размера size;
+    None - заголовка нет или он не поддерживается (отдается весь файл),
+    ValueError - диапазон за пределами файла (ответ 416)
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-500 - последние 500 байт
+        length = int(last)
+        if not length or not size:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(path, start, length, chunk_size):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(request, path, content_type, filename, etag, chunk_size=ZIP_CHUNK_SIZE):
+    """
+    Файл с диска целиком (200) или одним диапазоном из Range (206).
+    Диапазон применяется, только если If-Range (если он есть) совпадает с
+    etag - иначе файл сменился и клиент получает его заново целиком.
+    """
+    stat = os.stat(path)
+    etag = quote_etag(etag)
+    if_range = request.headers.get('If-Range')
+    byte_range = None
+    try:
+        if not if_range or if_range == etag:
+            byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type, as_attachment=True, filename=filename)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end - start + 1, chunk_size), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
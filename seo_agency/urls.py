@@ -28,6 +28,7 @@ urlpatterns = [
     path('resources/', include('resources.urls')),
     path('news/', include('news.urls')),
     path('tools/', include('tools.urls')),
+    path('monitoring/', include('monitoring.urls')),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Website, BasicAnalysis, SEOIssue, TranslitResult
+from .models import Website, BasicAnalysis, SEOIssue, TranslitResult, DiagnosticsRun, DiagnosticsBatch
 
 
 @admin.register(Website)
@@ -76,3 +76,21 @@ class TranslitResultAdmin(admin.ModelAdmin):
         return obj.translit_text[:50] + '...' if len(obj.translit_text) > 50 else obj.translit_text
     translit_text_short.short_description = 'Транслит'
 
+
+@admin.register(DiagnosticsRun)
+class DiagnosticsRunAdmin(admin.ModelAdmin):
+    list_display = ['url', 'http_status', 'response_time', 'ssl_days_left', 'whois_registrar', 'created_at']
+    list_filter = ['http_status', 'ssl_valid', 'created_at']
+    search_fields = ['url', 'final_url', 'whois_registrar']
+    readonly_fields = ['created_at']
+    exclude = ['details']
+    raw_id_fields = ['batch']
+    ordering = ['-created_at']
+
+
+@admin.register(DiagnosticsBatch)
+class DiagnosticsBatchAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'status', 'processed', 'total', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['name', 'domains']
+    readonly_fields = ['created_at', 'finished_at', 'processed', 'total', 'error']
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ToolsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tools'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .functions import register_sqlite_functions
+
+        # Транслитерация как SQL-функции в каждом новом соединении SQLite
+        connection_created.connect(register_sqlite_functions, dispatch_uid='tools_sqlite_functions')
@@ -0,0 +1,247 @@
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from urllib.parse import urlparse
+
+import dns.resolver
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .diagnostics_parser import SiteDiagnostics
+from .models import DiagnosticsBatch, DiagnosticsRun
+
+
+logger = logging.getLogger(__name__)
+
+PROBES = ['ping', 'http', 'ssl', 'dns', 'whois']
+
+EXPORT_HEADERS = [
+    'Домен', 'Ping (мс)', 'HTTP статус', 'Финальный URL', 'Редиректов', 'Время ответа (сек)',
+    'SSL валиден', 'Дней до истечения SSL', 'Регистратор', 'Возраст домена (дней)',
+    'A записи', 'NS записи', 'MX записи', 'Дата проверки',
+]
+
+
+def normalize_domain(value):
+    """example.com из 'https://www.Example.com/page' или 'example.com:443'"""
+    value = value.strip()
+    if value.startswith(('http://', 'https://')):
+        value = urlparse(value).netloc
+    return value.split('/')[0].split(':')[0].strip('.').lower()
+
+
+def parse_domains(lines):
+    """Уникальные домены в исходном порядке (берется первое значение строки CSV/TXT)"""
+    domains = {}
+    for line in lines:
+        first = re.split(r'[\s,;]+', line.strip(), maxsplit=1)[0] if line.strip() else ''
+        domain = normalize_domain(first)
+        if '.' in domain:
+            domains.setdefault(domain, None)
+    return list(domains)
+
+
+# Публичные домены второго уровня: в них регистрируются домены третьего уровня (site.spb.ru)
+SECOND_LEVEL_SUFFIXES = frozenset((
+    'com.ru', 'net.ru', 'org.ru', 'pp.ru', 'msk.ru', 'spb.ru', 'msk.su', 'spb.su',
+    'nov.ru', 'nsk.ru', 'ekb.ru', 'kazan.ru', 'perm.ru', 'samara.ru', 'krasnodar.ru',
+    'com.ua', 'kiev.ua', 'org.ua', 'com.by', 'com.kz', 'org.kz',
+    'co.uk', 'org.uk', 'me.uk', 'ac.uk', 'co.il', 'com.tr', 'com.au', 'com.br', 'co.jp', 'com.cn',
+))
+
+
+def registered_domain(domain):
+    """Зарегистрированный домен, для которого запрашивается WHOIS: example.com, site.spb.ru"""
+    domain = normalize_domain(domain)
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    labels = domain.split('.')
+    size = 3 if '.'.join(labels[-2:]) in SECOND_LEVEL_SUFFIXES else 2
+    return '.'.join(labels[-size:])
+
+
+class SharedLookups:
+    """Общие запросы пакета: одинаковый запрос выполняется один раз, даже если нужен нескольким потокам сразу"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def get(self, key, func):
+        with self._lock:
+            future = self._futures.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._futures[key] = future
+        if is_owner:
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+
+class BatchSiteDiagnostics(SiteDiagnostics):
+    """SiteDiagnostics для пакетной проверки: общий DNS-кэш и дедупликация WHOIS и NS"""
+
+    def __init__(self, lookups=None):
+        resolver = dns.resolver.Resolver()
+        resolver.cache = dns.resolver.LRUCache(50000)
+        super().__init__(resolver=resolver)
+        self.lookups = lookups or SharedLookups()
+
+    def get_whois_info(self, domain):
+        domain = registered_domain(domain)
+        parent = super()
+        return self.lookups.get(('whois', domain), lambda: parent.get_whois_info(domain))
+
+    def _resolve_addresses(self, host):
+        try:
+            return [str(record) for record in self.resolver.resolve(host, 'A')]
+        except Exception:
+            return []
+
+    def get_dns_info(self, domain):
+        result = super().get_dns_info(domain)
+        if result.get('status') == 'success':
+            # Адреса NS-серверов: у портфеля доменов они обычно общие и резолвятся один раз
+            result['ns_addresses'] = {
+                host: self.lookups.get(('ns', host), lambda host=host: self._resolve_addresses(host))
+                for host in result['records'].get('NS', [])
+                if not host.startswith('Error:')
+            }
+        return result
+
+
+def claim_batch(batch, statuses=('pending',)):
+    """
+    Атомарно переводит пакет в "Выполняется", если он в одном из statuses.
+    Пакет из очереди может одновременно взять поток веб-формы и планировщик -
+    выполнит его только тот, чей UPDATE сработал.
+    """
+    return bool(DiagnosticsBatch.objects.filter(pk=batch.pk, status__in=statuses).update(status='running'))
+
+
+class BatchDiagnosticsRunner:
+    """
+    Пакетная диагностика доменов.
+
+    Каждая проверка (ping, HTTP, SSL, DNS, WHOIS) каждого домена - отдельная
+    задача пула, поэтому время на домен равно самой долгой проверке, а не их
+    сумме. Результат домена сохраняется сразу после завершения всех его проверок,
+    так что после сбоя пакет продолжается с необработанных доменов.
+    """
+
+    def __init__(self, max_workers=32):
+        self.max_workers = max_workers
+
+    def _probe(self, diagnostics, probe, domain):
+        try:
+            if probe == 'ping':
+                return diagnostics.ping_site(domain)
+            if probe == 'http':
+                return diagnostics.check_http_status(domain)
+            if probe == 'ssl':
+                return diagnostics.check_ssl_certificate(domain)
+            if probe == 'dns':
+                return diagnostics.get_dns_info(domain)
+            return diagnostics.get_whois_info(domain)
+        except Exception as e:
+            return {'status': 'error', 'domain': domain, 'error': str(e)}
+
+    def run(self, batch, statuses=('pending',)):
+        """Выполняет пакет, если удалось его занять (см. claim_batch); иначе None"""
+        if not claim_batch(batch, statuses):
+            return None
+        domains = batch.domain_list
+        finished = set(batch.runs.values_list('url', flat=True))
+        todo = iter([domain for domain in domains if domain not in finished])
+
+        batch.status = 'running'
+        batch.total = len(domains)
+        batch.processed = len(finished)
+        batch.error = ''
+        batch.save(update_fields=['total', 'processed', 'error'])
+
+        diagnostics = BatchSiteDiagnostics()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                in_flight = {}
+                partial = {}
+
+                def submit_next():
+                    domain = next(todo, None)
+                    if domain is None:
+                        return False
+                    partial[domain] = {'url': domain, 'timestamp': datetime.now().isoformat()}
+                    for probe in PROBES:
+                        in_flight[executor.submit(self._probe, diagnostics, probe, domain)] = (domain, probe)
+                    return True
+
+                # Одновременно в работе не больше max_workers доменов
+                while len(partial) < self.max_workers and submit_next():
+                    pass
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        domain, probe = in_flight.pop(future)
+                        partial[domain][probe] = future.result()
+                        if all(name in partial[domain] for name in PROBES):
+                            DiagnosticsRun.create_from_results(partial.pop(domain), batch=batch)
+                            DiagnosticsBatch.objects.filter(pk=batch.pk).update(processed=F('processed') + 1)
+                            submit_next()
+        except Exception as e:
+            DiagnosticsBatch.objects.filter(pk=batch.pk).update(status='failed', error=str(e))
+            raise
+
+        DiagnosticsBatch.objects.filter(pk=batch.pk).update(status='done', finished_at=timezone.now())
+        batch.refresh_from_db()
+        return batch
+
+
+def run_batch_in_background(batch_id, max_workers=32):
+    """Запускает пакет в фоновом потоке веб-процесса"""
+    def target():
+        try:
+            batch = DiagnosticsBatch.objects.get(pk=batch_id)
+            BatchDiagnosticsRunner(max_workers=max_workers).run(batch)
+        except Exception:
+            logger.exception('Ошибка пакетной диагностики %s', batch_id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=target, name=f'diagnostics-batch-{batch_id}', daemon=True)
+    thread.start()
+    return thread
+
+
+def export_rows(batch):
+    """Строки итоговой таблицы пакета (читает сводные колонки и details, без сырых данных)"""
+    runs = batch.runs.order_by('url').iterator(chunk_size=500)
+    for run in runs:
+        records = (run.details.get('dns') or {}).get('records') or {}
+        mx = [
+            f"{record['priority']} {record['exchange']}" if isinstance(record, dict) else str(record)
+            for record in records.get('MX', [])
+        ]
+        yield [
+            run.url,
+            run.ping_avg_ms,
+            run.http_status,
+            run.final_url,
+            run.redirects_count,
+            run.response_time,
+            {True: 'Да', False: 'Нет'}.get(run.ssl_valid, ''),
+            run.ssl_days_left,
+            run.whois_registrar,
+            run.domain_age_days,
+            ', '.join(records.get('A', [])),
+            ', '.join(records.get('NS', [])),
+            ', '.join(mx),
+            timezone.localtime(run.created_at),
+        ]
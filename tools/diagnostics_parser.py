@@ -6,7 +6,7 @@ import platform
 import re
 import dns.resolver
 import dns.exception
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urljoin
 from datetime import datetime, timedelta
 import json
 
@@ -14,7 +14,9 @@ import json
 class SiteDiagnostics:
     """Класс для диагностики сайтов"""
     
-    def __init__(self):
+    def __init__(self, resolver=None):
+        # DNS-резолвер можно передать свой (например, с общим кэшем для пакетной проверки)
+        self.resolver = resolver or dns.resolver
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -75,7 +77,7 @@ class SiteDiagnostics:
                 'error': str(e)
             }
     
-    def check_http_status(self, url):
+    def check_http_status(self, url, max_redirects=10):
         """Проверка HTTP статуса и редиректов"""
         try:
             # Нормализуем URL
@@ -86,20 +88,31 @@ class SiteDiagnostics:
             
             redirects = []
             current_url = url
+            visited = {url}
+            redirect_error = ''
             
-            # Отслеживаем редиректы
+            # Отслеживаем редиректы (с ограничением длины цепочки и поиском циклов)
             while response.status_code in [301, 302, 303, 307, 308]:
+                location = response.headers.get('Location', '')
+                next_url = urljoin(current_url, location) if location else ''
                 redirects.append({
                     'from': current_url,
-                    'to': response.headers.get('Location', ''),
+                    'to': next_url,
                     'status': response.status_code,
                     'reason': response.reason
                 })
                 
-                if not response.headers.get('Location'):
+                if not location:
+                    break
+                if next_url in visited:
+                    redirect_error = 'loop'
+                    break
+                if len(redirects) >= max_redirects:
+                    redirect_error = 'too_many_hops'
                     break
                     
-                current_url = response.headers['Location']
+                current_url = next_url
+                visited.add(current_url)
                 response = self.session.get(current_url, allow_redirects=False, timeout=10)
             
             return {
@@ -108,6 +121,7 @@ class SiteDiagnostics:
                 'final_status': response.status_code,
                 'final_reason': response.reason,
                 'redirects': redirects,
+                'redirect_error': redirect_error,
                 'headers': dict(response.headers),
                 'response_time': response.elapsed.total_seconds()
             }
@@ -189,7 +203,7 @@ class SiteDiagnostics:
             
             # A записи (IPv4)
             try:
-                a_records = dns.resolver.resolve(domain, 'A')
+                a_records = self.resolver.resolve(domain, 'A')
                 dns_info['A'] = [str(record) for record in a_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['A'] = []
@@ -198,7 +212,7 @@ class SiteDiagnostics:
             
             # AAAA записи (IPv6)
             try:
-                aaaa_records = dns.resolver.resolve(domain, 'AAAA')
+                aaaa_records = self.resolver.resolve(domain, 'AAAA')
                 dns_info['AAAA'] = [str(record) for record in aaaa_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['AAAA'] = []
@@ -207,7 +221,7 @@ class SiteDiagnostics:
             
             # MX записи (почтовые серверы)
             try:
-                mx_records = dns.resolver.resolve(domain, 'MX')
+                mx_records = self.resolver.resolve(domain, 'MX')
                 dns_info['MX'] = [{'priority': record.preference, 'exchange': str(record.exchange)} for record in mx_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['MX'] = []
@@ -216,7 +230,7 @@ class SiteDiagnostics:
             
             # CNAME записи
             try:
-                cname_records = dns.resolver.resolve(domain, 'CNAME')
+                cname_records = self.resolver.resolve(domain, 'CNAME')
                 dns_info['CNAME'] = [str(record) for record in cname_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['CNAME'] = []
@@ -225,7 +239,7 @@ class SiteDiagnostics:
             
             # TXT записи
             try:
-                txt_records = dns.resolver.resolve(domain, 'TXT')
+                txt_records = self.resolver.resolve(domain, 'TXT')
                 dns_info['TXT'] = [str(record).strip('"') for record in txt_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['TXT'] = []
@@ -234,7 +248,7 @@ class SiteDiagnostics:
             
             # NS записи (серверы имен)
             try:
-                ns_records = dns.resolver.resolve(domain, 'NS')
+                ns_records = self.resolver.resolve(domain, 'NS')
                 dns_info['NS'] = [str(record) for record in ns_records]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
                 dns_info['NS'] = []
@@ -0,0 +1,92 @@
+"""
+Транслитерация как SQL-функции SQLite.
+
+При открытии соединения регистрируются детерминированные функции
+TRANSLIT(text[, scheme]) и TRANSLIT_SLUG(text[, scheme]), поэтому массовые
+обновления и выборки выполняются одним запросом внутри базы:
+
+    TranslitResult.objects.update(translit_text=Translit('original_text'))
+    Project.objects.filter(name__translit_slug='proekt-romashka')
+
+На других СУБД выражения вызывают NotSupportedError.
+"""
+from functools import lru_cache
+
+from django.db import NotSupportedError
+from django.db.models import CharField, Func, TextField, Transform, Value
+
+from .translit_parser import TranslitParser, get_scheme
+
+
+@lru_cache(maxsize=None)
+def _get_parser(scheme):
+    return TranslitParser(scheme)
+
+
+def _translit(text, scheme='default'):
+    if text is None:
+        return None
+    return _get_parser(scheme).transliterate_text(str(text))
+
+
+def _translit_slug(text, scheme='yandex'):
+    if text is None:
+        return None
+    return _get_parser(scheme).slugify(str(text))
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """Обработчик connection_created: регистрирует функции в новом соединении SQLite"""
+    if connection.vendor != 'sqlite':
+        return
+    for name, func in [('TRANSLIT', _translit), ('TRANSLIT_SLUG', _translit_slug)]:
+        connection.connection.create_function(name, 1, func, deterministic=True)
+        connection.connection.create_function(name, 2, func, deterministic=True)
+
+
+class SQLiteFunctionMixin:
+    """Функция есть только в SQLite (зарегистрирована из Python)"""
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f'{self.function} доступна только в SQLite')
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class Translit(SQLiteFunctionMixin, Func):
+    """Транслитерация значения выражения в базе: Translit('name', scheme='gost_b')"""
+    function = 'TRANSLIT'
+    output_field = TextField()
+
+    def __init__(self, expression, scheme='default', **extra):
+        get_scheme(scheme)
+        super().__init__(expression, Value(scheme), **extra)
+
+
+class TranslitSlug(SQLiteFunctionMixin, Func):
+    """Слаг из значения выражения в базе (без проверки уникальности)"""
+    function = 'TRANSLIT_SLUG'
+    output_field = CharField()
+
+    def __init__(self, expression, scheme='yandex', **extra):
+        get_scheme(scheme)
+        super().__init__(expression, Value(scheme), **extra)
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TranslitTransform(SQLiteFunctionMixin, Transform):
+    """Поиск по транслиту: name__translit='proekt romashka'"""
+    lookup_name = 'translit'
+    function = 'TRANSLIT'
+    output_field = TextField()
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TranslitSlugTransform(SQLiteFunctionMixin, Transform):
+    """Поиск по слагу: name__translit_slug='proekt-romashka'"""
+    lookup_name = 'translit_slug'
+    function = 'TRANSLIT_SLUG'
+    output_field = CharField()
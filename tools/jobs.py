@@ -0,0 +1,17 @@
+from scheduler.registry import register
+
+from .batch_diagnostics import BatchDiagnosticsRunner
+from .models import DiagnosticsBatch
+
+
+@register('tools.diagnostics_batches', every=60, jitter=10, lock_timeout=6 * 3600)
+def run_diagnostics_batches():
+    """Выполнение пакетных диагностик из очереди"""
+    runner = BatchDiagnosticsRunner()
+    processed = 0
+    for batch in DiagnosticsBatch.objects.filter(status='pending').order_by('created_at'):
+        # Пакет мог уже взять поток веб-формы - тогда run() его пропустит
+        batch = runner.run(batch)
+        if batch is not None:
+            processed += batch.processed
+    return f'Проверено доменов: {processed}'
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from seo_agency.streaming import stream_csv, stream_xlsx
+from tools.redirect_mapper import RedirectMapper, RESULT_HEADERS, parse_redirect_rows
+
+
+class Command(BaseCommand):
+    help = 'Проверяет цепочки редиректов для списка URL или CSV-карты "старый URL,ожидаемый URL"'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Файл со списком URL или CSV-картой редиректов')
+        parser.add_argument('--output', required=True, help='Куда сохранить отчет (.csv или .xlsx)')
+        parser.add_argument('--workers', type=int, default=32, help='Количество параллельных запросов')
+        parser.add_argument('--per-host', type=int, default=8, help='Максимум одновременных запросов к одному хосту')
+        parser.add_argument('--max-hops', type=int, default=10, help='Максимальная длина цепочки редиректов')
+
+    def handle(self, *args, **options):
+        mapper = RedirectMapper(
+            max_hops=options['max_hops'],
+            max_workers=options['workers'],
+            per_host=options['per_host'],
+        )
+        
+        try:
+            source = open(options['input'], encoding='utf-8-sig', errors='replace')
+        except OSError as e:
+            raise CommandError(f'Не удалось открыть файл: {e}')
+        
+        checked = 0
+        mismatches = 0
+        
+        def rows():
+            nonlocal checked, mismatches
+            for result in mapper.map_urls(parse_redirect_rows(source)):
+                checked += 1
+                if result['match'] is False:
+                    mismatches += 1
+                if checked % 1000 == 0:
+                    self.stdout.write(f'Проверено {checked} URL...')
+                yield RedirectMapper.as_row(result)
+        
+        with source:
+            if options['output'].endswith('.xlsx'):
+                with open(options['output'], 'wb') as output:
+                    for chunk in stream_xlsx(rows(), RESULT_HEADERS, sheet_title='Редиректы'):
+                        output.write(chunk)
+            else:
+                with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                    for chunk in stream_csv(rows(), RESULT_HEADERS):
+                        output.write(chunk)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Готово! Проверено {checked} URL, несовпадений с ожидаемым адресом: {mismatches}.')
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from tools.batch_diagnostics import BatchDiagnosticsRunner
+from tools.models import DiagnosticsBatch
+
+
+class Command(BaseCommand):
+    help = 'Выполняет пакетные диагностики в очереди и продолжает прерванные'
+
+    def add_arguments(self, parser):
+        parser.add_argument('batch_ids', nargs='*', type=int, help='id пакетов (по умолчанию - все в очереди)')
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить пакеты в статусе "Выполняется" (например, после падения сервера)',
+        )
+        parser.add_argument('--workers', type=int, default=32, help='Количество параллельных проверок')
+
+    def handle(self, *args, **options):
+        if options['batch_ids']:
+            statuses = [status for status, _ in DiagnosticsBatch.STATUS_CHOICES]
+            batches = DiagnosticsBatch.objects.filter(pk__in=options['batch_ids'])
+        else:
+            statuses = ['pending', 'running'] if options['resume'] else ['pending']
+            batches = DiagnosticsBatch.objects.filter(status__in=statuses)
+        
+        runner = BatchDiagnosticsRunner(max_workers=options['workers'])
+        for batch in batches.order_by('created_at'):
+            self.stdout.write(f'Пакет #{batch.pk}: {batch.total} доменов...')
+            result = runner.run(batch, statuses=statuses)
+            if result is None:
+                self.stdout.write(self.style.WARNING(f'Пакет #{batch.pk} уже выполняется, пропущен.'))
+                continue
+            batch = result
+            self.stdout.write(
+                self.style.SUCCESS(f'Пакет #{batch.pk} завершен: обработано {batch.processed} из {batch.total}.')
+            )
@@ -0,0 +1,71 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from tools.translit_parser import TranslitParser, SCHEMES, DEFAULT_LETTERS
+
+
+WORDS = [
+    'пластиковые', 'окна', 'установка', 'пвх', 'купить', 'недорого', 'москва', 'цена',
+    'Щебень', 'доставка', 'цемент', 'Ёлочные', 'игрушки', 'съёмная', 'квартира', 'подъезд',
+    'шкаф-купе', 'Юридические', 'услуги', 'Цифровой', 'фотоаппарат', 'чехол', 'для',
+    'iphone', '15', 'pro', 'Жилой', 'комплекс', 'хвойный', 'лес', 'Эко_товары', 'оптом,',
+]
+
+
+def legacy_transliterate(text):
+    """Прежняя реализация: посимвольная сборка строки (для сравнения)"""
+    text = text.lower()
+    result = ""
+    for char in text:
+        if char in DEFAULT_LETTERS:
+            result += DEFAULT_LETTERS[char]
+        else:
+            result += char
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Замер скорости транслитерации на синтетическом корпусе строк'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=1_000_000, help='Количество строк в корпусе')
+        parser.add_argument('--scheme', action='append', choices=list(SCHEMES), help='Схема (можно указать несколько)')
+        parser.add_argument('--legacy', action='store_true', help='Замерить также прежнюю посимвольную реализацию')
+        parser.add_argument('--seed', type=int, default=42, help='Зерно генератора корпуса')
+
+    def _report(self, label, elapsed, lines, chars):
+        self.stdout.write(
+            f'{label:<28} {elapsed:8.2f} сек  {lines / elapsed:12,.0f} строк/сек  {chars / elapsed / 1e6:8.1f} млн симв/сек'
+        )
+
+    def handle(self, *args, **options):
+        if options['lines'] <= 0:
+            raise CommandError('Количество строк должно быть больше нуля')
+
+        rng = random.Random(options['seed'])
+        corpus = [' '.join(rng.choices(WORDS, k=rng.randint(2, 6))) for _ in range(options['lines'])]
+        chars = sum(len(line) for line in corpus)
+        self.stdout.write(f'Корпус: {len(corpus):,} строк, {chars:,} символов')
+
+        if options['legacy']:
+            started = time.perf_counter()
+            for line in corpus:
+                legacy_transliterate(line)
+            self._report('legacy (посимвольно)', time.perf_counter() - started, len(corpus), chars)
+
+        for name in options['scheme'] or list(SCHEMES):
+            parser = TranslitParser(name)
+
+            started = time.perf_counter()
+            for line in corpus:
+                parser.transliterate_text(line)
+            self._report(f'{name}: по строке', time.perf_counter() - started, len(corpus), chars)
+
+            started = time.perf_counter()
+            parser.transliterate_many(corpus)
+            self._report(f'{name}: пакетом', time.perf_counter() - started, len(corpus), chars)
+
+            started = time.perf_counter()
+            parser.slugify_many(corpus)
+            self._report(f'{name}: слаги', time.perf_counter() - started, len(corpus), chars)
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0008_translitresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiagnosticsRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, verbose_name='URL')),
+                ('ping_status', models.CharField(blank=True, max_length=20, verbose_name='Ping статус')),
+                ('ping_avg_ms', models.FloatField(blank=True, null=True, verbose_name='Ping (мс)')),
+                ('http_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='HTTP статус')),
+                ('final_url', models.TextField(blank=True, verbose_name='Финальный URL')),
+                ('redirects_count', models.PositiveSmallIntegerField(default=0, verbose_name='Редиректов')),
+                ('response_time', models.FloatField(blank=True, null=True, verbose_name='Время ответа (сек)')),
+                ('ssl_valid', models.BooleanField(blank=True, null=True, verbose_name='SSL валиден')),
+                ('ssl_days_left', models.IntegerField(blank=True, null=True, verbose_name='Дней до истечения SSL')),
+                ('whois_registrar', models.CharField(blank=True, max_length=200, verbose_name='Регистратор')),
+                ('domain_age_days', models.IntegerField(blank=True, null=True, verbose_name='Возраст домена (дней)')),
+                ('details', models.JSONField(default=dict, verbose_name='Результаты без сырых данных')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+            ],
+            options={
+                'verbose_name': 'Диагностика сайта',
+                'verbose_name_plural': 'Диагностики сайтов',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DiagnosticsPayload',
+            fields=[
+                ('run', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payload', serialize=False, to='tools.diagnosticsrun', verbose_name='Диагностика')),
+                ('data', models.BinaryField(verbose_name='Данные (zlib + JSON)')),
+            ],
+            options={
+                'verbose_name': 'Сырые данные диагностики',
+                'verbose_name_plural': 'Сырые данные диагностики',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0009_diagnosticsrun_diagnosticspayload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiagnosticsBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=200, verbose_name='Название')),
+                ('domains', models.TextField(verbose_name='Домены (по одному на строку)')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершена'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего доменов')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Обработано')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершена')),
+            ],
+            options={
+                'verbose_name': 'Пакетная диагностика',
+                'verbose_name_plural': 'Пакетные диагностики',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='diagnosticsrun',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='tools.diagnosticsbatch', verbose_name='Пакет'),
+        ),
+    ]
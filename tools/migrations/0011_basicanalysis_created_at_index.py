@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0010_diagnosticsbatch_diagnosticsrun_batch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='basicanalysis',
+            index=models.Index(fields=['created_at'], name='tools_basic_created_775ab4_idx'),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import json
+import zlib
+
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
@@ -86,6 +89,9 @@ class BasicAnalysis(models.Model):
         verbose_name = "Базовый анализ"
         verbose_name_plural = "Базовые анализы"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"{self.website.name} - {self.page_url}"
@@ -165,4 +171,142 @@ class TranslitResult(models.Model):
         return f"Транслит: {self.original_text[:50]}..."
 
 
+class DiagnosticsBatch(models.Model):
+    """Пакетная диагностика списка доменов"""
+    STATUS_CHOICES = [
+        ('pending', 'В очереди'),
+        ('running', 'Выполняется'),
+        ('done', 'Завершена'),
+        ('failed', 'Ошибка'),
+    ]
+    
+    name = models.CharField(max_length=200, blank=True, verbose_name="Название")
+    domains = models.TextField(verbose_name="Домены (по одному на строку)")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус")
+    total = models.PositiveIntegerField(default=0, verbose_name="Всего доменов")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Обработано")
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создана")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершена")
+    
+    class Meta:
+        verbose_name = "Пакетная диагностика"
+        verbose_name_plural = "Пакетные диагностики"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.name or f"Пакет #{self.pk} ({self.total} доменов)"
+    
+    def get_absolute_url(self):
+        return reverse('tools:diagnostics_batch_detail', kwargs={'pk': self.pk})
+    
+    @property
+    def domain_list(self):
+        return [line.strip() for line in self.domains.splitlines() if line.strip()]
+    
+    @property
+    def progress_percent(self):
+        if not self.total:
+            return 0
+        return round(100 * self.processed / self.total)
+
 
+class DiagnosticsRun(models.Model):
+    """Запуск диагностики сайта (сводка в колонках, сырые данные - в DiagnosticsPayload)"""
+    # Поля с сырыми данными, которые выносятся в сжатую таблицу
+    RAW_FIELDS = {
+        'ping': ['raw_output'],
+        'http': ['headers'],
+        'whois': ['raw_data'],
+    }
+    
+    url = models.CharField(max_length=500, verbose_name="URL")
+    ping_status = models.CharField(max_length=20, blank=True, verbose_name="Ping статус")
+    ping_avg_ms = models.FloatField(null=True, blank=True, verbose_name="Ping (мс)")
+    http_status = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="HTTP статус")
+    final_url = models.TextField(blank=True, verbose_name="Финальный URL")
+    redirects_count = models.PositiveSmallIntegerField(default=0, verbose_name="Редиректов")
+    response_time = models.FloatField(null=True, blank=True, verbose_name="Время ответа (сек)")
+    ssl_valid = models.BooleanField(null=True, blank=True, verbose_name="SSL валиден")
+    ssl_days_left = models.IntegerField(null=True, blank=True, verbose_name="Дней до истечения SSL")
+    whois_registrar = models.CharField(max_length=200, blank=True, verbose_name="Регистратор")
+    domain_age_days = models.IntegerField(null=True, blank=True, verbose_name="Возраст домена (дней)")
+    details = models.JSONField(default=dict, verbose_name="Результаты без сырых данных")
+    batch = models.ForeignKey(DiagnosticsBatch, on_delete=models.CASCADE, null=True, blank=True, related_name='runs', verbose_name="Пакет")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    
+    class Meta:
+        verbose_name = "Диагностика сайта"
+        verbose_name_plural = "Диагностики сайтов"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.url} ({self.created_at:%d.%m.%Y %H:%M})" if self.created_at else self.url
+    
+    @classmethod
+    def create_from_results(cls, results, batch=None):
+        """Сохраняет результат run_full_diagnostics: сводку и сжатые сырые данные"""
+        details = {}
+        raw = {}
+        for section, value in results.items():
+            if isinstance(value, dict) and section in cls.RAW_FIELDS:
+                details[section] = {k: v for k, v in value.items() if k not in cls.RAW_FIELDS[section]}
+                raw[section] = {k: value[k] for k in cls.RAW_FIELDS[section] if k in value}
+            else:
+                details[section] = value
+        
+        ping = results.get('ping') or {}
+        http = results.get('http') or {}
+        ssl_info = results.get('ssl') or {}
+        whois_info = (results.get('whois') or {}).get('info') or {}
+        
+        run = cls.objects.create(
+            url=results.get('url', '')[:500],
+            ping_status=ping.get('status', ''),
+            ping_avg_ms=ping.get('avg_time'),
+            http_status=http.get('final_status'),
+            final_url=http.get('final_url', ''),
+            redirects_count=len(http.get('redirects', [])),
+            response_time=http.get('response_time'),
+            ssl_valid=ssl_info.get('is_valid'),
+            ssl_days_left=ssl_info.get('days_until_expiry'),
+            whois_registrar=whois_info.get('registrar', '')[:200],
+            domain_age_days=whois_info.get('age_days'),
+            details=details,
+            batch=batch,
+        )
+        DiagnosticsPayload.objects.create(run=run, data=DiagnosticsPayload.pack(raw))
+        return run
+    
+    @property
+    def full_results(self):
+        """Полный результат диагностики (подгружает сжатые сырые данные)"""
+        results = {section: dict(value) if isinstance(value, dict) else value for section, value in self.details.items()}
+        try:
+            raw = self.payload.unpack()
+        except DiagnosticsPayload.DoesNotExist:
+            raw = {}
+        for section, values in raw.items():
+            if isinstance(results.get(section), dict):
+                results[section].update(values)
+        return results
+
+
+class DiagnosticsPayload(models.Model):
+    """Сжатые сырые данные диагностики (вывод ping, заголовки, WHOIS)"""
+    run = models.OneToOneField(DiagnosticsRun, on_delete=models.CASCADE, primary_key=True, related_name='payload', verbose_name="Диагностика")
+    data = models.BinaryField(verbose_name="Данные (zlib + JSON)")
+    
+    class Meta:
+        verbose_name = "Сырые данные диагностики"
+        verbose_name_plural = "Сырые данные диагностики"
+    
+    def __str__(self):
+        return f"Сырые данные: {self.run_id}"
+    
+    @staticmethod
+    def pack(data):
+        return zlib.compress(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'), 6)
+    
+    def unpack(self):
+        return json.loads(zlib.decompress(bytes(self.data)).decode('utf-8'))
@@ -0,0 +1,205 @@
+import csv
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+DEFAULT_MAX_HOPS = 10
+MAX_HOPS_LIMIT = 20
+
+RESULT_HEADERS = [
+    'Исходный URL', 'Ожидаемый URL', 'Финальный URL', 'Статус',
+    'Редиректов', 'Совпадает', 'Ошибка', 'Цепочка',
+]
+
+ERROR_LABELS = {
+    'loop': 'Циклический редирект',
+    'too_many_hops': 'Слишком много редиректов',
+    'timeout': 'Таймаут',
+    'connection_error': 'Ошибка соединения',
+    'error': 'Ошибка запроса',
+}
+
+
+def normalize_url(url):
+    """Добавляет схему, если URL указан без нее"""
+    url = url.strip()
+    if url and not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+def comparable_url(url):
+    """Ключ для сравнения URL: без учета регистра хоста и завершающего слэша"""
+    parsed = urlparse(url)
+    return (parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip('/') or '/', parsed.query)
+
+
+def parse_redirect_rows(lines):
+    """
+    Разбирает список URL или CSV-карту "старый URL,ожидаемый URL".
+
+    Разделитель (запятая, точка с запятой или табуляция) определяется по первой
+    строке; строка заголовков пропускается. Возвращает генератор пар (url, expected).
+    """
+    lines = iter(lines)
+    first = ''
+    for line in lines:
+        if line.strip():
+            first = line
+            break
+    if not first:
+        return
+
+    delimiter = max(',;\t', key=first.count) if any(d in first for d in ',;\t') else ','
+
+    def rows():
+        yield first
+        yield from lines
+
+    for row in csv.reader(rows(), delimiter=delimiter):
+        if not row or not row[0].strip():
+            continue
+        source = row[0].strip()
+        if '.' not in source and not source.startswith(('http://', 'https://')):
+            continue  # заголовок
+        expected = row[1].strip() if len(row) > 1 else ''
+        yield source, expected
+
+
+def parse_max_hops(value):
+    """Макс. число редиректов из формы: по умолчанию при неверном вводе, не больше MAX_HOPS_LIMIT"""
+    try:
+        hops = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_HOPS
+    return max(1, min(hops, MAX_HOPS_LIMIT))
+
+
+class RedirectMapper:
+    """Массовая проверка цепочек редиректов (для переездов сайтов)"""
+
+    def __init__(self, max_hops=DEFAULT_MAX_HOPS, timeout=10, max_workers=32, per_host=8):
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Не больше per_host одновременных запросов к одному хосту
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            return self._host_limits[host]
+
+    def _fetch(self, url):
+        with self._host_semaphore(url):
+            response = self.session.get(url, allow_redirects=False, timeout=self.timeout, stream=True)
+            response.close()
+        return response
+
+    def resolve(self, url, expected=''):
+        """Проходит цепочку редиректов одного URL с ограничением длины и поиском циклов"""
+        url = normalize_url(url)
+        if expected.startswith('/'):
+            expected = urljoin(url, expected)
+        elif expected:
+            expected = normalize_url(expected)
+
+        current = url
+        chain = []
+        seen = {url}
+        final_status = None
+        error = ''
+
+        try:
+            while True:
+                response = self._fetch(current)
+                final_status = response.status_code
+                location = response.headers.get('Location')
+                if final_status not in REDIRECT_STATUSES or not location:
+                    break
+                if len(chain) >= self.max_hops:
+                    error = 'too_many_hops'
+                    break
+
+                next_url = urljoin(current, location)
+                chain.append({'status': final_status, 'from': current, 'to': next_url})
+                current = next_url
+                if next_url in seen:
+                    error = 'loop'
+                    break
+                seen.add(next_url)
+        except requests.exceptions.Timeout:
+            error = 'timeout'
+        except requests.exceptions.ConnectionError:
+            error = 'connection_error'
+        except requests.exceptions.RequestException:
+            error = 'error'
+
+        match = None
+        if expected:
+            match = not error and comparable_url(current) == comparable_url(expected)
+
+        return {
+            'url': url,
+            'expected': expected,
+            'final_url': current,
+            'final_status': final_status,
+            'hops': len(chain),
+            'chain': chain,
+            'error': error,
+            'match': match,
+        }
+
+    def map_urls(self, pairs):
+        """
+        Проверяет пары (url, ожидаемый url) параллельно.
+
+        В работе одновременно не больше max_workers * 4 задач, поэтому входной
+        список может быть сколь угодно длинным; результаты отдаются по мере готовности.
+        """
+        window = self.max_workers * 4
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for url, expected in pairs:
+                pending.add(executor.submit(self.resolve, url, expected))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    @staticmethod
+    def as_row(result):
+        """Строка отчета для CSV/XLSX"""
+        if result['match'] is None:
+            match = ''
+        else:
+            match = 'Да' if result['match'] else 'Нет'
+        chain = ' → '.join([result['url']] + [hop['to'] for hop in result['chain']]) if result['chain'] else ''
+        return [
+            result['url'],
+            result['expected'],
+            result['final_url'],
+            result['final_status'] or '',
+            result['hops'],
+            match,
+            ERROR_LABELS.get(result['error'], result['error']),
+            chain,
+        ]
@@ -0,0 +1,80 @@
+import csv
+from io import TextIOWrapper
+
+import openpyxl
+
+from .models import TranslitResult
+
+
+TRANSLIT_FILE_HEADERS = ['Исходный текст', 'Транслит']
+TRANSLIT_FILE_EXTENSIONS = ('.txt', '.csv', '.xlsx')
+
+# Сколько результатов сохраняется одним bulk_create
+SAVE_BATCH_SIZE = 1000
+
+
+def _first_value(values):
+    """Первое непустое значение строки таблицы"""
+    for value in values:
+        if value is not None and str(value).strip():
+            return str(value)
+    return None
+
+
+def iter_upload_lines(upload):
+    """
+    Строки загруженного файла по одной, без чтения файла целиком.
+
+    TXT - каждая строка; CSV - первая непустая колонка (разделитель , ; или
+    табуляция определяется по первой строке); XLSX - первая непустая ячейка
+    каждой строки первого листа (openpyxl в режиме read_only).
+    """
+    name = upload.name.lower()
+
+    if name.endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(upload.file, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                value = _first_value(row)
+                if value is not None:
+                    yield value
+        finally:
+            workbook.close()
+        return
+
+    lines = TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace', newline='')
+    if not name.endswith('.csv'):
+        yield from lines
+        return
+
+    first = next(lines, '')
+    delimiter = max(',;\t', key=first.count) if any(d in first for d in ',;\t') else ','
+
+    def all_lines():
+        yield first
+        yield from lines
+
+    for row in csv.reader(all_lines(), delimiter=delimiter):
+        value = _first_value(row)
+        if value is not None:
+            yield value
+
+
+def translit_rows(pairs, is_url=False, save=False, batch_size=SAVE_BATCH_SIZE):
+    """
+    Строки CSV-отчета из пар (исходный текст, транслит).
+
+    При save=True результаты сохраняются в TranslitResult порциями по batch_size
+    по мере выдачи отчета.
+    """
+    batch = []
+    for original, translit in pairs:
+        if save:
+            batch.append(TranslitResult(original_text=original, translit_text=translit, is_url=is_url))
+            if len(batch) >= batch_size:
+                TranslitResult.objects.bulk_create(batch)
+                batch = []
+        yield [original, translit]
+
+    if batch:
+        TranslitResult.objects.bulk_create(batch)
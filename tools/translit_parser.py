@@ -1,128 +1,286 @@
 import re
+import unicodedata
 import urllib.parse
 from urllib.parse import urlparse
 
 
+# Базовая таблица (исторически используется для ЧПУ в инструментах)
+DEFAULT_LETTERS = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+
+# ГОСТ 7.79-2000, система Б (латиница без диакритики)
+GOST_B_LETTERS = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'j', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'cz', 'ч': 'ch', 'ш': 'sh', 'щ': 'shh',
+    'ъ': '``', 'ы': "y'", 'ь': '`', 'э': "e'", 'ю': 'yu', 'я': 'ya',
+}
+
+# ISO 9:1995 (ГОСТ 7.79-2000, система А) - одна буква на букву, с диакритикой
+ISO9_LETTERS = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'ë',
+    'ж': 'ž', 'з': 'z', 'и': 'i', 'й': 'j', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'č', 'ш': 'š', 'щ': 'ŝ',
+    'ъ': 'ʺ', 'ы': 'y', 'ь': 'ʹ', 'э': 'è', 'ю': 'û', 'я': 'â',
+}
+
+# Транслит в стиле Яндекса для ЧПУ
+YANDEX_LETTERS = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'j', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'h', 'ц': 'c', 'ч': 'ch', 'ш': 'sh', 'щ': 'shh',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+
+# Пробелы, _ и запятые (вместе с уже стоящими тире) схлопываются в одно тире
+SEPARATORS_RE = re.compile(r'[\s_,-]+')
+# Для слагов: все байты, кроме латиницы, цифр и перевода строки (разделителя записей пакета), - в пробел
+SLUG_KEEP_BYTES = b'\n0123456789abcdefghijklmnopqrstuvwxyz'
+SLUG_BYTES_TABLE = bytes(code if code in SLUG_KEEP_BYTES else 32 for code in range(256))
+
+# Однобайтовая кодировка, в которой пакетная транслитерация идет по байтам
+BULK_ENCODING = 'cp1251'
+# Сколько строк склеивается для одного прохода пакетной транслитерации
+BULK_CHUNK_LINES = 10000
+
+
+class TranslitScheme:
+    """
+    Схема транслитерации, заранее скомпилированная в таблицы.
+
+    Одиночные строки переводятся через str.translate. Пакеты строк склеиваются
+    и переводятся по байтам cp1251: многобуквенные замены (ж -> zh) - через
+    bytes.replace, остальные буквы - одним bytes.translate по таблице на 256 байт.
+    """
+
+    def __init__(self, name, title, letters, lowercase=False, context_rules=()):
+        self.name = name
+        self.title = title
+        self.lowercase = lowercase
+
+        mapping = {}
+        for cyrillic, latin in letters.items():
+            mapping[cyrillic] = latin
+            if not lowercase:
+                mapping.setdefault(cyrillic.upper(), latin[:1].upper() + latin[1:])
+        self.table = str.maketrans(mapping)
+
+        # Правила, зависящие от соседних букв: один проход регулярного выражения на правило
+        self.context_rules = [(re.compile(pattern), replacement) for pattern, replacement in context_rules]
+
+        self.byte_table = None
+        self.byte_delete = b''
+        self.byte_replacements = []
+        if all(latin.isascii() for latin in mapping.values()):
+            single = {}
+            for cyrillic, latin in mapping.items():
+                code = cyrillic.encode(BULK_ENCODING)
+                if not latin:
+                    self.byte_delete += code
+                elif len(latin) == 1:
+                    single[code[0]] = ord(latin)
+                else:
+                    self.byte_replacements.append((code, latin.encode('ascii')))
+            self.byte_table = bytes(single.get(i, i) for i in range(256))
+
+    def _prepare(self, text):
+        if self.lowercase:
+            text = text.lower()
+        for pattern, replacement in self.context_rules:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def apply(self, text):
+        return self._prepare(text).translate(self.table)
+
+    def apply_bulk(self, text):
+        """Транслитерация большого текста (склеенных строк) за несколько проходов по байтам"""
+        text = self._prepare(text)
+        if self.byte_table is None:
+            return text.translate(self.table)
+        try:
+            data = text.encode(BULK_ENCODING)
+        except UnicodeEncodeError:
+            # Символы вне cp1251 (эмодзи, диакритика) - общий путь через str.translate
+            return text.translate(self.table)
+        for source, target in self.byte_replacements:
+            if source in data:
+                data = data.replace(source, target)
+        return data.translate(self.byte_table, self.byte_delete).decode(BULK_ENCODING)
+
+    def apply_many(self, texts):
+        """Транслитерация списка строк: склеивает их порциями и переводит пакетно"""
+        texts = list(texts)
+        results = []
+        for start in range(0, len(texts), BULK_CHUNK_LINES):
+            chunk = texts[start:start + BULK_CHUNK_LINES]
+            translated = self.apply_bulk('\n'.join(chunk)).split('\n')
+            if len(translated) != len(chunk):
+                # В самих строках были переводы строки - переводим по одной
+                translated = [self.apply(text) for text in chunk]
+            results.extend(translated)
+        return results
+
+
+SCHEMES = {
+    scheme.name: scheme for scheme in [
+        TranslitScheme('default', 'Стандартная (ЧПУ)', DEFAULT_LETTERS, lowercase=True),
+        TranslitScheme(
+            'gost_b', 'ГОСТ 7.79-2000 (система Б)', GOST_B_LETTERS,
+            # ц перед е, и, ы, й передается как c, в остальных случаях - cz
+            context_rules=[('ц(?=[еиыйЕИЫЙ])', 'c'), ('Ц(?=[еиыйЕИЫЙ])', 'C')],
+        ),
+        TranslitScheme('iso9', 'ISO 9 (система А)', ISO9_LETTERS),
+        TranslitScheme('yandex', 'Яндекс (ЧПУ)', YANDEX_LETTERS, lowercase=True),
+    ]
+}
+
+SCHEME_CHOICES = [(scheme.name, scheme.title) for scheme in SCHEMES.values()]
+
+
+def get_scheme(name):
+    try:
+        return SCHEMES[name or 'default']
+    except KeyError:
+        raise ValueError(f'Неизвестная схема транслитерации: {name}')
+
+
 class TranslitParser:
     """Парсер для транслитерации кириллицы в латиницу"""
-    
-    def __init__(self):
+
+    def __init__(self, scheme='default'):
+        self.scheme = get_scheme(scheme)
         # Таблица транслитерации кириллица -> латиница
-        self.translit_table = {
-            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
-            'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
-            'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
-            'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
-            'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
-            'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D', 'Е': 'E', 'Ё': 'Yo',
-            'Ж': 'Zh', 'З': 'Z', 'И': 'I', 'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M',
-            'Н': 'N', 'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
-            'Ф': 'F', 'Х': 'H', 'Ц': 'Ts', 'Ч': 'Ch', 'Ш': 'Sh', 'Щ': 'Sch',
-            'Ъ': '', 'Ы': 'Y', 'Ь': '', 'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya'
-        }
-    
+        self.translit_table = self.scheme.table
+
     def transliterate_text(self, text):
         """Транслитерация текста"""
         if not text:
             return ""
-        
-        # Переводим в строчные буквы
-        text = text.lower()
-        
-        # Транслитерация
-        result = ""
-        for char in text:
-            if char in self.translit_table:
-                result += self.translit_table[char]
-            else:
-                result += char
-        
-        return result
-    
+
+        return self.scheme.apply(text)
+
+    def transliterate_many(self, texts):
+        """Транслитерация списка строк (быстрее, чем по одной)"""
+        return self.scheme.apply_many(text or "" for text in texts)
+
+    def _slug_words(self, text):
+        """Латиница в нижнем регистре, где все, кроме букв и цифр, заменено пробелами"""
+        if text.isascii():
+            data = text.encode('ascii')
+        else:
+            # Диакритика (ISO 9) и прочие символы приводятся к ASCII
+            data = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore')
+        return data.lower().translate(SLUG_BYTES_TABLE).decode('ascii')
+
+    def slugify(self, text):
+        """Слаг для URL: только латиница в нижнем регистре, цифры и тире"""
+        if not text:
+            return ""
+
+        return '-'.join(self._slug_words(self.scheme.apply(text)).split())
+
+    def slugify_many(self, texts):
+        """Слаги для списка строк (массовая генерация для каталогов)"""
+        texts = [(text or "").replace('\n', ' ') for text in texts]
+        results = []
+        for start in range(0, len(texts), BULK_CHUNK_LINES):
+            # Порция переводится и чистится целиком, по строкам идет только сборка слагов
+            words = self._slug_words(self.scheme.apply_bulk('\n'.join(texts[start:start + BULK_CHUNK_LINES])))
+            results.extend('-'.join(line.split()) for line in words.split('\n'))
+        return results
+
     def process_url(self, url):
         """Обработка URL - только path, не затрагивая другие компоненты"""
         if not url:
             return ""
-        
+
         try:
             parsed = urlparse(url)
+            if not parsed.scheme or not parsed.netloc:
+                # Если не URL, обрабатываем как обычный текст
+                return self.process_text(url)
             path = parsed.path
-            
+
             # Транслитерируем только path
             translit_path = self.transliterate_text(path)
-            
-            # Заменяем пробелы, _ и , на тире
-            translit_path = re.sub(r'[\s_,]+', '-', translit_path)
-            
-            # Удаляем повторяющиеся тире
-            translit_path = re.sub(r'-+', '-', translit_path)
-            
-            # Убираем тире в начале и конце
-            translit_path = translit_path.strip('-')
-            
+
+            # Заменяем пробелы, _ и , на тире, убираем повторы и тире по краям
+            translit_path = SEPARATORS_RE.sub('-', translit_path).strip('-')
+
             # Собираем URL обратно
             result = f"{parsed.scheme}://{parsed.netloc}{translit_path}"
             if parsed.query:
                 result += f"?{parsed.query}"
             if parsed.fragment:
                 result += f"#{parsed.fragment}"
-            
+
             return result
-            
+
         except Exception:
             # Если не URL, обрабатываем как обычный текст
             return self.process_text(url)
-    
+
+    def _finish_text(self, result):
+        # Заменяем пробелы, _ и , на тире, убираем повторы и тире по краям
+        result = SEPARATORS_RE.sub('-', result).strip('-')
+
+        # Добавляем слэши в начале и конце
+        if result:
+            result = f"/{result}/"
+
+        return result
+
     def process_text(self, text):
         """Обработка обычного текста"""
         if not text:
             return ""
-        
+
         # Декодируем %## символы
-        try:
+        if '%' in text:
             text = urllib.parse.unquote(text)
-        except:
-            pass
-        
-        # Транслитерация
-        result = self.transliterate_text(text)
-        
-        # Заменяем пробелы, _ и , на тире
-        result = re.sub(r'[\s_,]+', '-', result)
-        
-        # Удаляем повторяющиеся тире
-        result = re.sub(r'-+', '-', result)
-        
-        # Убираем тире в начале и конце
-        result = result.strip('-')
-        
-        # Добавляем слэши в начале и конце
-        if result:
-            result = f"/{result}/"
-        
-        return result
-    
+
+        return self._finish_text(self.transliterate_text(text))
+
+    def process_lines(self, lines, is_url=False, chunk_size=1000):
+        """
+        Генератор пар (исходная строка, транслит) для потока строк любой длины.
+
+        Строки читаются порциями по chunk_size: тексты порции транслитерируются
+        пакетно, в памяти одновременно держится только одна порция.
+        """
+        chunk = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield from self._process_chunk(chunk, is_url)
+                chunk = []
+        if chunk:
+            yield from self._process_chunk(chunk, is_url)
+
+    def _process_chunk(self, chunk, is_url):
+        if is_url:
+            return zip(chunk, [self.process_url(line) for line in chunk])
+
+        texts = [urllib.parse.unquote(line) if '%' in line else line for line in chunk]
+        return zip(chunk, [self._finish_text(text) for text in self.transliterate_many(texts)])
+
     def process_multiple_lines(self, text, is_url=False):
         """Обработка нескольких строк"""
         if not text:
             return []
-        
-        lines = text.strip().split('\n')
-        results = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if is_url:
-                processed = self.process_url(line)
-            else:
-                processed = self.process_text(line)
-            
-            results.append({
-                'original': line,
-                'translit': processed
-            })
-        
-        return results
+
+        return [
+            {'original': original, 'translit': translit}
+            for original, translit in self.process_lines(text.strip().split('\n'), is_url)
+        ]
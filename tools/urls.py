@@ -18,7 +18,15 @@ urlpatterns = [
     # Транслит
     path('translit/', views.TranslitListView.as_view(), name='translit_list'),
     path('translit/process/', views.translit_form, name='translit_form'),
+    path('translit/file/', views.translit_file, name='translit_file'),
     
     # Диагностика сайтов
     path('diagnostics/process/', views.diagnostics_form, name='diagnostics_form'),
+    path('diagnostics/<int:run_id>/raw.json', views.download_diagnostics_raw, name='diagnostics_raw'),
+    path('diagnostics/batch/', views.diagnostics_batch_create, name='diagnostics_batch_create'),
+    path('diagnostics/batch/<int:pk>/', views.DiagnosticsBatchDetailView.as_view(), name='diagnostics_batch_detail'),
+    path('diagnostics/batch/<int:pk>/export/', views.diagnostics_batch_export, name='diagnostics_batch_export'),
+    
+    # Карта редиректов
+    path('redirects/', views.redirect_map, name='redirect_map'),
 ]
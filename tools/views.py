@@ -1,18 +1,24 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.db.models import Q
 from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
 from datetime import datetime
-from .models import Website, BasicAnalysis, SEOIssue, TranslitResult
+from .models import Website, BasicAnalysis, SEOIssue, TranslitResult, DiagnosticsRun, DiagnosticsBatch
 from .seo_parser import SEOParser
-from .translit_parser import TranslitParser
+from .translit_parser import TranslitParser, SCHEME_CHOICES
+from .translit_files import TRANSLIT_FILE_EXTENSIONS, TRANSLIT_FILE_HEADERS, SAVE_BATCH_SIZE, iter_upload_lines, translit_rows
 from .diagnostics_parser import SiteDiagnostics
+from .redirect_mapper import RedirectMapper, RESULT_HEADERS, parse_max_hops, parse_redirect_rows
+from .batch_diagnostics import EXPORT_HEADERS, export_rows, parse_domains, run_batch_in_background
+from seo_agency.conditional import ConditionalViewMixin
+from seo_agency.pagination import CursorPaginationMixin
+from seo_agency.streaming import stream_csv, stream_xlsx, CSV_CONTENT_TYPE, XLSX_CONTENT_TYPE
 
 
 class WebsiteListView(ListView):
@@ -73,7 +79,7 @@ class WebsiteDetailView(DetailView):
         return context
 
 
-class BasicAnalysisListView(ListView):
+class BasicAnalysisListView(CursorPaginationMixin, ListView):
     """Список всех базовых анализов"""
     model = BasicAnalysis
     template_name = 'tools/analysis_list.html'
@@ -126,9 +132,13 @@ class BasicAnalysisListView(ListView):
         
         # Добавляем результаты транслита из сессии
         context['translit_results'] = self.request.session.get('translit_results')
+        context['translit_schemes'] = SCHEME_CHOICES
         
-        # Добавляем результаты диагностики из сессии
-        context['diagnostics_results'] = self.request.session.get('diagnostics_results')
+        # Добавляем результаты диагностики: в сессии хранится только id запуска
+        run_id = self.request.session.get('diagnostics_run_id')
+        run = DiagnosticsRun.objects.filter(pk=run_id).first() if run_id else None
+        context['diagnostics_run'] = run
+        context['diagnostics_results'] = run.details if run else None
         
         
         # Очищаем результаты транслита если запрошено
@@ -138,18 +148,23 @@ class BasicAnalysisListView(ListView):
         
         # Очищаем результаты диагностики если запрошено
         if self.request.GET.get('clear_diagnostics'):
-            if 'diagnostics_results' in self.request.session:
-                del self.request.session['diagnostics_results']
+            if 'diagnostics_run_id' in self.request.session:
+                del self.request.session['diagnostics_run_id']
         
         
         return context
 
 
-class BasicAnalysisDetailView(DetailView):
+class BasicAnalysisDetailView(ConditionalViewMixin, DetailView):
     """Детальная страница анализа"""
     model = BasicAnalysis
     template_name = 'tools/analysis_detail.html'
     context_object_name = 'analysis'
+    
+    def get_conditional_sources(self):
+        # Анализ и его сайт (название и признак конкурента выводятся на странице)
+        pk = self.kwargs['pk']
+        return [BasicAnalysis.objects.filter(pk=pk), Website.objects.filter(analyses__pk=pk)]
 
 
 def analyze_website(request):
@@ -406,7 +421,7 @@ def translit_form(request):
             return redirect('tools:analysis_list')
         
         try:
-            parser = TranslitParser()
+            parser = TranslitParser(request.POST.get('scheme') or 'default')
             # Всегда обрабатываем как обычный текст (не URL)
             results = parser.process_multiple_lines(text, False)
             
@@ -418,6 +433,12 @@ def translit_form(request):
                 if clean_translit:  # Добавляем только непустые результаты
                     all_translits.append(clean_translit)
             
+            if request.POST.get('save'):
+                TranslitResult.objects.bulk_create([
+                    TranslitResult(original_text=result['original'], translit_text=result['translit'])
+                    for result in results
+                ], batch_size=SAVE_BATCH_SIZE)
+            
             # Сохраняем результаты в сессии для отображения
             request.session['translit_results'] = {
                 'original_text': text.strip(),
@@ -435,6 +456,32 @@ def translit_form(request):
     return redirect('tools:analysis_list')
 
 
+def translit_file(request):
+    """Транслитерация загруженного файла (TXT/CSV/XLSX) с потоковой выдачей CSV"""
+    if request.method != 'POST':
+        return redirect('tools:analysis_list')
+    
+    upload = request.FILES.get('file')
+    if not upload or not upload.name.lower().endswith(TRANSLIT_FILE_EXTENSIONS):
+        messages.error(request, 'Загрузите файл в формате TXT, CSV или XLSX')
+        return redirect('tools:analysis_list')
+    
+    try:
+        parser = TranslitParser(request.POST.get('scheme') or 'default')
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('tools:analysis_list')
+    
+    is_url = bool(request.POST.get('is_url'))
+    pairs = parser.process_lines(iter_upload_lines(upload), is_url)
+    rows = translit_rows(pairs, is_url=is_url, save=bool(request.POST.get('save')))
+    
+    response = StreamingHttpResponse(stream_csv(rows, TRANSLIT_FILE_HEADERS), content_type=CSV_CONTENT_TYPE)
+    filename = f"translit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 # ===== ДИАГНОСТИКА САЙТОВ =====
 
 def diagnostics_form(request):
@@ -450,8 +497,9 @@ def diagnostics_form(request):
             diagnostics = SiteDiagnostics()
             results = diagnostics.run_full_diagnostics(url)
             
-            # Сохраняем результаты в сессии
-            request.session['diagnostics_results'] = results
+            # Сохраняем результаты в базе, в сессии - только id запуска
+            run = DiagnosticsRun.create_from_results(results)
+            request.session['diagnostics_run_id'] = run.pk
             
             messages.success(request, f'Диагностика сайта {url} завершена!')
             return redirect('tools:analysis_list')
@@ -462,3 +510,109 @@ def diagnostics_form(request):
     
     return redirect('tools:analysis_list')
 
+
+def diagnostics_batch_create(request):
+    """Запуск пакетной диагностики списка доменов"""
+    if request.method != 'POST':
+        return redirect('tools:analysis_list')
+    
+    upload = request.FILES.get('file')
+    if upload:
+        lines = TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace')
+    else:
+        lines = request.POST.get('domains', '').splitlines()
+    domains = parse_domains(lines)
+    
+    if not domains:
+        messages.error(request, 'Введите домены или загрузите файл со списком доменов')
+        return redirect('tools:analysis_list')
+    
+    batch = DiagnosticsBatch.objects.create(
+        name=request.POST.get('name', '').strip(),
+        domains='\n'.join(domains),
+        total=len(domains),
+    )
+    run_batch_in_background(batch.pk)
+    
+    messages.success(request, f'Пакетная диагностика запущена: {len(domains)} доменов.')
+    return redirect(batch.get_absolute_url())
+
+
+class DiagnosticsBatchDetailView(DetailView):
+    """Ход и результаты пакетной диагностики"""
+    model = DiagnosticsBatch
+    template_name = 'tools/diagnostics_batch_detail.html'
+    context_object_name = 'batch'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['runs'] = self.object.runs.defer('details').order_by('url')
+        return context
+
+
+def diagnostics_batch_export(request, pk):
+    """Экспорт результатов пакетной диагностики в одну таблицу Excel"""
+    batch = get_object_or_404(DiagnosticsBatch, pk=pk)
+    
+    response = StreamingHttpResponse(
+        stream_xlsx(
+            export_rows(batch), EXPORT_HEADERS, sheet_title='Диагностика',
+            column_widths=[30, 10, 10, 40, 10, 12, 10, 12, 30, 12, 30, 40, 40, 18],
+        ),
+        content_type=XLSX_CONTENT_TYPE
+    )
+    response['Content-Disposition'] = f'attachment; filename="diagnostics_batch_{batch.pk}_{batch.created_at.strftime("%Y%m%d_%H%M%S")}.xlsx"'
+    
+    return response
+
+
+def download_diagnostics_raw(request, run_id):
+    """Скачивание полного результата диагностики с сырыми данными"""
+    run = get_object_or_404(DiagnosticsRun, pk=run_id)
+    
+    response = JsonResponse(run.full_results, json_dumps_params={'ensure_ascii': False, 'indent': 2})
+    response['Content-Disposition'] = f'attachment; filename="diagnostics_{run.pk}.json"'
+    
+    return response
+
+
+# ===== КАРТА РЕДИРЕКТОВ =====
+
+def redirect_map(request):
+    """Массовая проверка редиректов: список URL или CSV "старый,ожидаемый" -> CSV/XLSX отчет"""
+    if request.method != 'POST':
+        return redirect('tools:analysis_list')
+    
+    upload = request.FILES.get('file')
+    if upload:
+        lines = TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace')
+    else:
+        lines = request.POST.get('urls', '').splitlines()
+    
+    pairs = parse_redirect_rows(lines)
+    try:
+        first = next(pairs)
+    except StopIteration:
+        messages.error(request, 'Загрузите файл или введите URL для проверки редиректов')
+        return redirect('tools:analysis_list')
+    
+    def all_pairs():
+        yield first
+        yield from pairs
+    
+    mapper = RedirectMapper(max_hops=parse_max_hops(request.POST.get('max_hops')))
+    rows = (RedirectMapper.as_row(result) for result in mapper.map_urls(all_pairs()))
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    if request.POST.get('format') == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(rows, RESULT_HEADERS, sheet_title='Редиректы', column_widths=[50, 50, 50, 8, 10, 10, 25, 80]),
+            content_type=XLSX_CONTENT_TYPE
+        )
+        filename = f"redirects_{timestamp}.xlsx"
+    else:
+        response = StreamingHttpResponse(stream_csv(rows, RESULT_HEADERS), content_type=CSV_CONTENT_TYPE)
+        filename = f"redirects_{timestamp}.csv"
+    
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response